@@ -0,0 +1,5 @@
+"""Offline CPU benchmarks for `warpdrive`.
+
+Run ``python -m benchmarks --help`` from the repository root; see
+`benchmarks.run` for what is measured and the JSON format of the results.
+"""
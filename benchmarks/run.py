@@ -0,0 +1,363 @@
+"""Time SDF construction, compilation, sampling, meshing and plotting.
+
+Every benchmark runs *repeat* times and the fastest wall-clock time is kept,
+the least noisy estimate on a shared machine.  One further run under
+`tracemalloc` records the peak of traced allocations (NumPy reports its
+buffers there too); it is kept out of the timed runs because tracing slows
+them down.  The SymPy cache is cleared before every construction run and
+all `warpdrive` caches are bypassed, so each run does the full work.
+
+Results are written as JSON::
+
+    {"version": 1,
+     "environment": {"python": ..., "numpy": ..., "sympy": ..., ...},
+     "results": {"sample/composite/64": {"seconds": ...,
+                                         "peak_bytes": ...,
+                                         "points_per_second": ...},
+                 ...}}
+
+``--compare baseline.json`` prints the ratio of every time to the baseline
+and exits with status 1 if any benchmark got slower by more than
+``--threshold``::
+
+    python -m benchmarks --quick -o baseline.json
+    python -m benchmarks --quick --compare baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from math import pi
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import sympy as sp
+from sympy.core.cache import clear_cache
+
+from warpdrive.sdf import (
+    box,
+    box_frame,
+    compile_sdf,
+    cylinder,
+    rotate,
+    round_box,
+    sample_grid,
+    sphere,
+    subtraction,
+    translate,
+    union,
+    x,
+    y,
+    z,
+)
+from warpdrive.sdf.bounds import bounding_box
+from warpdrive.sdf.marching_cubes import sdf_to_mesh
+from warpdrive.sdf.mesh import decimate, weld
+from warpdrive.sdf.surface_nets import sdf_to_surface_net
+
+__all__ = ["Benchmark", "compare", "main", "run", "suite"]
+
+FORMAT_VERSION = 1
+
+SAMPLING_RESOLUTIONS = (32, 64, 128)
+QUICK_SAMPLING_RESOLUTIONS = (16, 32)
+MESHING_RESOLUTION = 96
+QUICK_MESHING_RESOLUTION = 24
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """One timed callable; *points* turns its time into a throughput."""
+
+    name: str
+    func: Callable[[], object]
+    points: Optional[int] = None
+    clear_sympy_cache: bool = False
+
+
+def _primitives() -> Dict[str, Callable[[], sp.Expr]]:
+    return {
+        "sphere": lambda: sphere(0.5, (0.1, 0.2, 0.3)),
+        "box": lambda: box((0.3, 0.4, 0.5)),
+        "round_box": lambda: round_box((0.3, 0.4, 0.5), 0.05),
+        "box_frame": lambda: box_frame((0.3, 0.4, 0.5), 0.05),
+        "cylinder": lambda: cylinder(0.3, 0.5),
+    }
+
+
+def _composite() -> sp.Expr:
+    """Small part exercising every primitive and operation."""
+    frame = rotate(box_frame((0.4, 0.3, 0.2), 0.05), (0.3, 0.1, 0.7))
+    rounded = translate(round_box((0.3, 0.3, 0.3), 0.1), (0.2, 0.0, 0.0))
+    body = subtraction(
+        union(sphere(0.5), frame), rotate(cylinder(0.2, 0.6), (pi / 2, 0.0, 0.0))
+    )
+    return union(union(body, rounded), box((0.6, 0.05, 0.05)))
+
+
+def _circular_rlc():
+    from warpdrive.geometry.circuit import CircularRLC
+
+    return CircularRLC()
+
+
+def _bbox(expr) -> tuple:
+    bbox = bounding_box(expr)
+    if bbox is None:
+        return ((-1.0, 1.0),) * 3
+    return tuple((lo - 0.05 * (hi - lo), hi + 0.05 * (hi - lo)) for lo, hi in bbox)
+
+
+def _plot(expr, bbox, resolution: int, max_faces: Optional[int]) -> None:
+    """`plot_sdf` and one draw of the figure on the Agg backend."""
+    import matplotlib.pyplot as plt
+
+    from warpdrive.sdf import plot_sdf
+
+    plot_sdf(expr, bbox=bbox, resolution=resolution, max_faces=max_faces)
+    plt.gcf().canvas.draw()
+    plt.close("all")
+
+
+def suite(quick: bool = False) -> List[Benchmark]:
+    """All benchmarks; *quick* drops `CircularRLC` and the large grids."""
+
+    benchmarks = [
+        Benchmark(f"construct/{name}", make, clear_sympy_cache=True)
+        for name, make in _primitives().items()
+    ]
+    benchmarks.append(
+        Benchmark("construct/composite", _composite, clear_sympy_cache=True)
+    )
+    plots = importlib.util.find_spec("matplotlib") is not None
+    if plots:
+        import matplotlib
+
+        matplotlib.use("Agg")
+    exprs = {"composite": _composite()}
+    if not quick:
+        benchmarks.append(
+            Benchmark("construct/circular_rlc", _circular_rlc, clear_sympy_cache=True)
+        )
+        # the conductor is by far the largest solid
+        exprs["circular_rlc"] = max(_circular_rlc().solids.values(), key=sp.count_ops)
+
+    for label, expr in exprs.items():
+        benchmarks.append(
+            Benchmark(f"compile/{label}", lambda e=expr: compile_sdf(e, cache=False))
+        )
+        benchmarks.append(
+            Benchmark(
+                f"lambdify/{label}", lambda e=expr: sp.lambdify((x, y, z), e, "numpy")
+            )
+        )
+
+    for label, expr in exprs.items():
+        bbox = _bbox(expr)
+        compile_sdf(expr)  # sampling is timed without compilation
+        for n in QUICK_SAMPLING_RESOLUTIONS if quick else SAMPLING_RESOLUTIONS:
+            benchmarks.append(
+                Benchmark(
+                    f"sample/{label}/{n}",
+                    lambda e=expr, b=bbox, n=n: sample_grid(e, b, n),
+                    points=n**3,
+                )
+            )
+        n = QUICK_MESHING_RESOLUTION if quick else MESHING_RESOLUTION
+        benchmarks.append(
+            Benchmark(
+                f"mesh/{label}/{n}",
+                lambda e=expr, b=bbox, n=n: sdf_to_mesh(e, b, n, cache=False),
+                points=n**3,
+            )
+        )
+        benchmarks.append(
+            Benchmark(
+                f"surface_net/{label}/{n}",
+                lambda e=expr, b=bbox, n=n: sdf_to_surface_net(e, b, n, cache=False),
+                points=n**3,
+            )
+        )
+        verts, faces = weld(*sdf_to_mesh(expr, bbox, n, cache=False))
+        benchmarks.append(
+            Benchmark(
+                f"decimate/{label}/{n}",
+                lambda v=verts, f=faces: decimate(v, f, len(f) // 4),
+            )
+        )
+        if plots:
+            # decimating has to beat drawing the extra triangles to pay off
+            for suffix, max_faces in (("", None), ("_decimated", len(faces) // 4)):
+                benchmarks.append(
+                    Benchmark(
+                        f"plot{suffix}/{label}/{n}",
+                        lambda e=expr, b=bbox, n=n, m=max_faces: _plot(e, b, n, m),
+                        points=n**3,
+                    )
+                )
+    return benchmarks
+
+
+def _measure(benchmark: Benchmark, repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        if benchmark.clear_sympy_cache:
+            clear_cache()
+        start = time.perf_counter()
+        benchmark.func()
+        best = min(best, time.perf_counter() - start)
+
+    if benchmark.clear_sympy_cache:
+        clear_cache()
+    tracemalloc.start()
+    try:
+        benchmark.func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = {"seconds": best, "peak_bytes": int(peak)}
+    if benchmark.points is not None:
+        result["points_per_second"] = (
+            benchmark.points / best if best > 0 else float("inf")
+        )
+    return result
+
+
+def _environment() -> Dict[str, object]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sympy": sp.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(
+    benchmarks: Iterable[Benchmark],
+    *,
+    repeat: int = 3,
+    select: Sequence[str] = (),
+    log: Optional[Callable[[str], None]] = None,
+) -> Dict[str, object]:
+    """Measure *benchmarks* whose name starts with any of *select* (all if empty)."""
+
+    results = {}
+    for benchmark in benchmarks:
+        if select and not any(benchmark.name.startswith(s) for s in select):
+            continue
+        results[benchmark.name] = _measure(benchmark, repeat)
+        if log is not None:
+            log(_format_result(benchmark.name, results[benchmark.name]))
+    return {
+        "version": FORMAT_VERSION,
+        "environment": _environment(),
+        "results": results,
+    }
+
+
+def _format_result(name: str, result: Dict[str, float]) -> str:
+    line = (
+        f"{name:<32} {result['seconds'] * 1e3:10.2f} ms"
+        f" {result['peak_bytes'] / 2**20:9.2f} MiB"
+    )
+    if "points_per_second" in result:
+        line += f" {result['points_per_second'] / 1e6:9.2f} Mpts/s"
+    return line
+
+
+def compare(
+    current: Dict[str, object], baseline: Dict[str, object], threshold: float = 0.2
+) -> List[Dict[str, object]]:
+    """Per-benchmark time ratios of *current* over *baseline*.
+
+    Only benchmarks present in both are compared.  An entry is marked as a
+    ``regression`` when its time grew by more than *threshold* (a fraction).
+    """
+
+    if baseline.get("version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Baseline has format version {baseline.get('version')}, "
+            f"expected {FORMAT_VERSION}"
+        )
+    rows = []
+    old = baseline["results"]
+    for name, result in current["results"].items():
+        if name not in old:
+            continue
+        ratio = (
+            result["seconds"] / old[name]["seconds"]
+            if old[name]["seconds"] > 0
+            else float("inf")
+        )
+        rows.append(
+            {
+                "name": name,
+                "seconds": result["seconds"],
+                "baseline_seconds": old[name]["seconds"],
+                "ratio": ratio,
+                "peak_bytes": result["peak_bytes"],
+                "baseline_peak_bytes": old[name]["peak_bytes"],
+                "regression": ratio > 1.0 + threshold,
+            }
+        )
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument(
+        "--compare", metavar="BASELINE", help="compare against a stored JSON result"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown before --compare fails (default 0.2)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="timed runs per benchmark (default 3)"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="skip CircularRLC and the large grids"
+    )
+    parser.add_argument(
+        "--select",
+        nargs="*",
+        default=(),
+        help="only run benchmarks with these name prefixes",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(suite(args.quick), repeat=args.repeat, select=args.select, log=print)
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+    if not args.compare:
+        return 0
+    with open(args.compare) as fh:
+        baseline = json.load(fh)
+    rows = compare(results, baseline, args.threshold)
+    print()
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<32} {row['ratio']:6.2f}x{flag}")
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
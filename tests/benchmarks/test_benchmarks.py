@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from benchmarks.run import Benchmark, compare, main, run
+
+
+def test_results_are_written_and_compared(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = [
+        "--quick",
+        "--repeat",
+        "1",
+        "--select",
+        "construct/sphere",
+        "sample/composite/16",
+    ]
+    assert main(args + ["-o", str(baseline)]) == 0
+    results = json.loads(baseline.read_text())
+    assert set(results["results"]) == {"construct/sphere", "sample/composite/16"}
+    assert results["results"]["sample/composite/16"]["points_per_second"] > 0
+    assert results["results"]["sample/composite/16"]["peak_bytes"] > 0
+
+    # a baseline that ran infinitely fast makes every benchmark a regression
+    for result in results["results"].values():
+        result["seconds"] = 1e-12
+    baseline.write_text(json.dumps(results))
+    assert main(args + ["--compare", str(baseline)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+
+
+def test_compare_skips_missing_and_checks_version():
+    current = run([Benchmark("noop", lambda: None, points=10)], repeat=2)
+    assert compare(current, {"version": current["version"], "results": {}}) == []
+    (row,) = compare(current, current)
+    assert row["ratio"] == 1.0 and not row["regression"]
+    with pytest.raises(ValueError):
+        compare(current, {"version": 0, "results": {}})
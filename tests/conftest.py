@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def evaluate_parser():
+    """Evaluate a WarpX parser string with NumPy (AMReX syntax -> Python)."""
+
+    def evaluate(text, x, y, z):
+        env = dict(
+            x=x,
+            y=y,
+            z=z,
+            sqrt=np.sqrt,
+            abs=np.abs,
+            min=np.minimum,
+            max=np.maximum,
+            where=np.where,
+        )
+        python = text.replace("^", "**").replace("if(", "where(")
+        *assignments, result = python.split(";")
+        for assignment in assignments:
+            name, value = assignment.split("=", 1)
+            env[name] = eval(value, env)
+        return eval(result, env)
+
+    return evaluate
@@ -0,0 +1,19 @@
+import numpy as np
+
+from warpdrive.geometry import Geometry, Grid
+from warpdrive.material.material import COPPER, QUARTZ
+from warpdrive.sdf import box, sphere, translate
+
+
+def test_point_lookup_matches_voxels():
+    grid = Grid(((-1.0, 1.0),) * 3, 11)
+    geometry = Geometry(
+        {COPPER: sphere(0.5), QUARTZ: translate(box((0.3, 0.3, 0.3)), (0.4, 0.0, 0.0))}
+    )
+    vox = geometry.voxelize(grid, priority={COPPER: 1})
+    points = np.stack(np.meshgrid(*grid.axes, indexing="ij"), axis=-1).reshape(-1, 3)
+    ids, distances = geometry.evaluate_points(
+        points, priority={COPPER: 1}, distances=True, batch=64
+    )
+    np.testing.assert_array_equal(ids.reshape(grid.shape), vox.material_ids)
+    np.testing.assert_array_equal(ids > 0, distances <= 0)
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+from warpdrive.geometry import Geometry, Grid
+from warpdrive.material.material import COPPER, QUARTZ, VACUUM, Material
+from warpdrive.sdf import box, sphere, translate
+from warpdrive.sdf.symbols import x
+
+
+def _overlapping():
+    # the quartz box overlaps the right half of the copper sphere
+    return Geometry(
+        {COPPER: sphere(0.5), QUARTZ: translate(box((0.3, 0.3, 0.3)), (0.4, 0.0, 0.0))}
+    )
+
+
+def test_ids_and_properties():
+    grid = Grid(((-1.0, 1.0),) * 3, (21, 11, 11))
+    vox = _overlapping().voxelize(grid, max_chunk_bytes=2048)
+    assert vox.material_ids.dtype == np.uint8 and vox.material_ids.shape == grid.shape
+    assert vox.materials == (VACUUM, COPPER, QUARTZ)
+
+    xs, _, _ = grid.axes
+    ids = vox.material_ids[:, 5, 5]
+    assert ids[np.argmin(abs(xs + 0.3))] == 1
+    assert ids[np.argmin(abs(xs - 0.4))] == 2  # later solid wins
+    assert ids[0] == 0
+    np.testing.assert_array_equal(
+        vox.electrical_conductivity, np.where(vox.material_ids == 1, 5.96e7, 0.0)
+    )
+    np.testing.assert_array_equal(vox.mask(QUARTZ), vox.material_ids == 2)
+
+
+def test_priority_and_workers():
+    grid = Grid(((-1.0, 1.0),) * 3, 16)
+    serial = _overlapping().voxelize(grid, priority={COPPER: 1})
+    threaded = _overlapping().voxelize(
+        grid, priority={COPPER: 1}, workers=3, max_chunk_bytes=4096
+    )
+    np.testing.assert_array_equal(serial.material_ids, threaded.material_ids)
+    np.testing.assert_array_equal(serial.permittivity, threaded.permittivity)
+    xs, _, _ = grid.axes
+    assert serial.material_ids[np.argmin(abs(xs - 0.3)), 8, 8] == 1
+
+
+def test_position_dependent_property():
+    graded = Material(name="Graded", electrical_conductivity=1.0 + x)
+    grid = Grid(((-1.0, 1.0),) * 3, 9)
+    vox = Geometry({graded: sphere(0.6)}).voxelize(grid)
+    xs, _, _ = grid.axes
+    inside = vox.material_ids == 1
+    expected = np.broadcast_to(1.0 + xs[:, None, None], grid.shape)
+    np.testing.assert_allclose(vox.electrical_conductivity[inside], expected[inside])
+    assert not vox.electrical_conductivity[~inside].any()
+
+    with pytest.raises(ValueError):
+        Geometry(
+            {Material(name="Bad", permittivity=x * sp.Symbol("t")): sphere(1.0)}
+        ).voxelize(grid)
+
+
+def test_volume_fractions_resolve_thin_features():
+    # a 0.02 thick plate between grid planes spaced 0.1 apart
+    plate = translate(box((2.0, 2.0, 0.01)), (0.0, 0.0, 0.05))
+    grid = Grid(((-1.0, 1.0),) * 3, 21)
+    vox = Geometry({COPPER: sphere(0.55), QUARTZ: plate}).voxelize(
+        grid, supersample=10, max_chunk_bytes=1 << 14
+    )
+    assert not (vox.material_ids == 2).any()
+
+    fractions = vox.fractions
+    assert fractions.dtype == np.float32 and fractions.shape == (3,) + grid.shape
+    np.testing.assert_allclose(fractions.sum(axis=0), 1.0, rtol=1e-6)
+    cell = np.prod(grid.spacing)
+    assert fractions[2].sum() * cell == pytest.approx(2.1 * 2.1 * 0.02, rel=0.05)
+    sphere_volume = 4 / 3 * np.pi * 0.55**3 - np.pi * 0.55**2 * 0.02
+    assert fractions[1].sum() * cell == pytest.approx(sphere_volume, rel=0.02)
+
+
+def test_voxelize_into_directory(tmp_path):
+    grid = Grid(((-1.0, 1.0),) * 3, 16)
+    in_memory = _overlapping().voxelize(grid, supersample=2)
+    on_disk = _overlapping().voxelize(
+        grid, supersample=2, out=tmp_path, max_chunk_bytes=4096
+    )
+    assert isinstance(on_disk.material_ids, np.memmap)
+    np.testing.assert_array_equal(
+        np.load(tmp_path / "material_ids.npy"), in_memory.material_ids
+    )
+    np.testing.assert_array_equal(
+        np.load(tmp_path / "fractions.npy"), in_memory.fractions
+    )
+    np.testing.assert_array_equal(on_disk.permittivity, in_memory.permittivity)
+
+
+@pytest.mark.parametrize("n", [16, 21])
+def test_voxelize_in_float32(n):
+    grid = Grid(((-1.0, 1.0),) * 3, n)
+    single = _overlapping().voxelize(grid, dtype=np.float32, supersample=2)
+    double = _overlapping().voxelize(grid, supersample=2)
+    assert single.permittivity.dtype == np.float32
+    # a point on a material interface may go either way in single precision
+    pure = (double.fractions == 1.0).any(axis=0)
+    np.testing.assert_array_equal(single.material_ids[pure], double.material_ids[pure])
+    np.testing.assert_allclose(single.fractions, double.fractions, atol=1e-6)
@@ -0,0 +1,20 @@
+import numpy as np
+
+from warpdrive.geometry import Geometry, Grid
+from warpdrive.material.material import COPPER, QUARTZ
+from warpdrive.sdf import box, sphere, translate
+
+
+def test_warpx_material_functions_match_voxels(evaluate_parser):
+    grid = Grid(((-1.0, 1.0),) * 3, 13)
+    geometry = Geometry(
+        {COPPER: sphere(0.5), QUARTZ: translate(box((0.3, 0.3, 0.3)), (0.4, 0.0, 0.0))}
+    )
+    vox = geometry.voxelize(grid)
+    functions = geometry.to_warpx()
+    points = np.meshgrid(*grid.axes, indexing="ij")
+    for name, expression in functions.items():
+        np.testing.assert_allclose(
+            evaluate_parser(expression.text, *points), getattr(vox, name)
+        )
+    assert functions["permeability"].n_ops == 0
@@ -0,0 +1,69 @@
+import math
+
+import numpy as np
+import pytest
+
+from warpdrive.sdf import (
+    bounds,
+    box,
+    cylinder,
+    intersection,
+    rotate,
+    sample_grid,
+    sphere,
+    subtraction,
+    translate,
+    union,
+)
+from warpdrive.sdf.bounds import bounding_box, padded_bbox, sampling_bbox
+
+
+def test_primitive_bounds():
+    assert bounding_box(sphere(0.5, (1.0, 0.0, 0.0))) == (
+        (0.5, 1.5),
+        (-0.5, 0.5),
+        (-0.5, 0.5),
+    )
+    assert bounding_box(box((1.0, 2.0, 3.0))) == ((-1.0, 1.0), (-2.0, 2.0), (-3.0, 3.0))
+    assert bounding_box(cylinder(1.0))[2] == (-math.inf, math.inf)
+
+
+def test_bounds_propagate_through_operations():
+    a = translate(box((0.5, 0.5, 0.5)), (1.0, 0.0, 0.0))
+    b = sphere(0.5)
+    assert bounding_box(union(a, b)) == ((-0.5, 1.5), (-0.5, 0.5), (-0.5, 0.5))
+    assert bounding_box(subtraction(a, b)) == bounding_box(a)
+    assert bounding_box(intersection(a, b)) == ((0.5, 0.5), (-0.5, 0.5), (-0.5, 0.5))
+
+    rotated = bounding_box(rotate(box((1.0, 0.1, 0.1)), (0.0, 0.0, math.pi / 2)))
+    np.testing.assert_allclose(
+        rotated, ((-0.1, 0.1), (-1.0, 1.0), (-0.1, 0.1)), atol=1e-12
+    )
+
+
+def test_solid_lies_inside_padded_bounds():
+    expr = union(
+        translate(box((0.3, 0.2, 0.1)), (0.5, 0.0, 0.0)),
+        rotate(cylinder(0.2, 0.6), (0.4, 0.0, 0.3)),
+    )
+    bbox = padded_bbox(bounding_box(expr), 24)
+    values = sample_grid(expr, bbox, 24)
+    # border samples are at least one padding cell away from the solid
+    for axis in range(3):
+        faces = np.take(values, [0, -1], axis=axis)
+        assert faces.min() > 0
+
+
+def test_unbounded_box_cannot_be_padded():
+    with pytest.raises(ValueError):
+        padded_bbox(bounding_box(cylinder(1.0)), 20)
+
+
+def test_evicted_bounds_are_derived_again():
+    expr = union(sphere(0.5), translate(box((0.2, 0.3, 0.4)), (1.0, 0.0, 0.0)))
+    registered = bounding_box(expr)
+    with bounds._lock:
+        del bounds._registry[expr]  # as if pushed out by a long sweep
+    assert bounding_box(expr) is None
+    np.testing.assert_allclose(sampling_bbox(expr, 20), padded_bbox(registered, 20))
+    assert bounding_box(expr) is not None
@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+
+from warpdrive.sdf import box, sphere, translate
+from warpdrive.sdf.cache import KernelCache, structural_hash
+
+
+def test_hits_and_misses_are_counted():
+    cache = KernelCache(maxsize=8)
+    first = cache.get(sphere(1.0))
+    again = cache.get(sphere(1.0))  # structurally equal, separately built
+    assert first is again
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.currsize) == (1, 1, 1)
+
+
+def test_lru_eviction():
+    cache = KernelCache(maxsize=2)
+    a, b, c = sphere(1.0), sphere(2.0), sphere(3.0)
+    cache.get(a)
+    cache.get(b)
+    cache.get(a)  # refresh a, so b is least recently used
+    cache.get(c)
+    assert len(cache) == 2 and cache.stats().evictions == 1
+    cache.get(a)
+    assert cache.stats().hits == 2
+
+
+def test_disk_tier_round_trip(tmp_path):
+    expr = translate(box((0.5, 0.25, 0.1)), (0.1, 0.0, 0.0))
+    writer = KernelCache(directory=tmp_path)
+    compiled = writer.get(expr)
+    assert (tmp_path / f"{structural_hash(expr)}.json").exists()
+
+    reader = KernelCache(directory=tmp_path)  # e.g. a fresh process
+    loaded = reader.get(expr)
+    assert reader.stats().disk_hits == 1
+    pts = np.linspace(-1.0, 1.0, 7)
+    np.testing.assert_array_equal(loaded(pts, pts, pts), compiled(pts, pts, pts))
+
+    gradient = reader.get(expr, gradient=True)
+    assert (
+        gradient is not loaded
+        and KernelCache(directory=tmp_path).get(expr, gradient=True).gradient
+    )
+
+
+def test_disk_tier_is_size_bounded(tmp_path):
+    cache = KernelCache(directory=tmp_path, max_disk_bytes=1)
+    for r in (1.0, 2.0, 3.0):
+        cache.get(sphere(r))
+    assert len(list(tmp_path.glob("*.json"))) <= 1
+
+
+def test_damaged_disk_entries_are_recompiled(tmp_path):
+    expr = sphere(1.0)
+    KernelCache(directory=tmp_path).get(expr)
+    path = tmp_path / f"{structural_hash(expr)}.json"
+    payload = json.loads(path.read_text())
+
+    edited = dict(payload, source=payload["source"] + "\nraise SystemExit\n")
+    truncated = {k: v for k, v in payload.items() if k != "instructions"}
+    for damaged in (edited, truncated, [payload]):
+        path.write_text(json.dumps(damaged))
+        cache = KernelCache(directory=tmp_path)
+        kernel = cache.get(expr)
+        assert cache.stats().disk_hits == 0
+        assert kernel(np.zeros(1), np.zeros(1), np.zeros(1))[0] == -1.0
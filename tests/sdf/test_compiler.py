@@ -0,0 +1,96 @@
+import numpy as np
+import sympy as sp
+
+from warpdrive.sdf import (
+    box,
+    box_frame,
+    compile_sdf,
+    cylinder,
+    sphere,
+    subtraction,
+    translate,
+)
+
+x, y, z = sp.symbols("x y z")
+
+rng = np.random.default_rng(0)
+PTS = rng.uniform(-2.0, 2.0, size=(3, 500))
+
+
+def _reference(expr):
+    return sp.lambdify((x, y, z), expr, modules="numpy")(*PTS)
+
+
+def test_compiled_matches_lambdify():
+    exprs = (
+        sphere(1.0, (0.1, 0.2, 0.3)),
+        box((1.0, 0.5, 0.3)),
+        box_frame((1.0, 1.0, 1.0), 0.1),
+        cylinder(0.5, 1.0),
+    )
+    for expr in exprs:
+        np.testing.assert_allclose(
+            compile_sdf(expr)(*PTS), _reference(expr), rtol=0, atol=1e-12
+        )
+
+
+def test_shared_subexpressions_emitted_once():
+    part = translate(box((0.5, 0.5, 0.5)), (1.0, 0.0, 0.0))
+    single = compile_sdf(part)
+    # `part` appears twice in the tree but must only be computed once
+    twice = compile_sdf(subtraction(sp.Min(part, sphere(1.0)), part))
+    assert twice.n_ops < 2 * single.n_ops
+    np.testing.assert_allclose(
+        twice(*PTS),
+        _reference(subtraction(sp.Min(part, sphere(1.0)), part)),
+        atol=1e-12,
+    )
+
+
+def test_writes_into_out_and_broadcasts():
+    kernel = compile_sdf(sphere(1.0))
+    xs = np.linspace(-1.0, 1.0, 5)
+    out = np.empty((5, 5, 5))
+    result = kernel(xs[:, None, None], xs[None, :, None], xs[None, None, :], out=out)
+    assert result is out
+    X, Y, Z = np.meshgrid(xs, xs, xs, indexing="ij")
+    np.testing.assert_allclose(out, np.sqrt(X**2 + Y**2 + Z**2) - 1.0)
+
+
+def test_constant_and_fallback_expressions():
+    const = compile_sdf(sp.Float(2.0) + sp.sqrt(2))
+    np.testing.assert_allclose(const(*PTS), 2.0 + np.sqrt(2.0))
+
+    expr = sp.Heaviside(x) + sp.sin(y) * z
+    np.testing.assert_allclose(compile_sdf(expr)(*PTS), _reference(expr))
+
+
+def test_gradient_matches_central_differences():
+    exprs = (
+        sphere(1.0, (0.1, 0.2, 0.3)),
+        subtraction(box((1.0, 0.5, 0.3)), cylinder(0.2, 1.0)),
+        box_frame((1.0, 1.0, 1.0), 0.1),
+        sp.atan2(y, x) * sp.exp(z) + sp.asinh(x * y),
+    )
+    for expr in exprs:
+        kernel = compile_sdf(expr, gradient=True)
+        assert kernel.gradient and kernel.result[0] == compile_sdf(expr).result
+        values = kernel(*PTS)
+        assert values.shape == (4, PTS.shape[1])
+        np.testing.assert_allclose(values[0], _reference(expr), atol=1e-12)
+        value = compile_sdf(expr)
+        for axis, step in enumerate(1e-6 * np.eye(3)):
+            central = (
+                value(*(PTS + step[:, None])) - value(*(PTS - step[:, None]))
+            ) / 2e-6
+            np.testing.assert_allclose(values[axis + 1], central, atol=1e-6)
+
+
+def test_gradient_is_finite_at_kinks():
+    # centre of a sphere: sqrt of zero; centre of a box: tie of three maxima
+    for expr in (sphere(1.0), box((1.0, 1.0, 1.0))):
+        values = compile_sdf(expr, gradient=True)(0.0, 0.0, 0.0)
+        np.testing.assert_array_equal(values, [-1.0, 0.0, 0.0, 0.0])
+    np.testing.assert_array_equal(
+        compile_sdf(x - 1.0, gradient=True)(2.0, 0.0, 0.0), [1.0, 1.0, 0.0, 0.0]
+    )
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+from warpdrive.geometry import Geometry, Grid
+from warpdrive.material.material import COPPER
+from warpdrive.sdf import Expression, Sphere, sphere, translate, x
+from warpdrive.sdf.field_cache import FieldCache, configure_field_cache, expression_hash
+from warpdrive.sdf.marching_cubes import sdf_to_mesh
+
+
+@pytest.fixture
+def field_cache(tmp_path):
+    yield configure_field_cache(tmp_path / "fields")
+    configure_field_cache(None)
+
+
+def test_mesh_reuses_cached_field(field_cache):
+    expr = translate(sphere(0.5), (0.1, 0.0, 0.0))
+    verts, faces = sdf_to_mesh(expr, resolution=20)
+    assert field_cache.stats().writes == 1
+    verts2, faces2 = sdf_to_mesh(expr, resolution=20)
+    assert field_cache.stats().hits == 1
+    np.testing.assert_array_equal(verts, verts2)
+    np.testing.assert_array_equal(faces, faces2)
+
+    sdf_to_mesh(expr, resolution=21)
+    assert field_cache.stats().writes == 2
+
+
+def test_hits_are_read_only_memmaps_and_directory_is_bounded(tmp_path):
+    cache = FieldCache(tmp_path, max_bytes=3 * 8 * 1000 + 500)
+    keys = [
+        cache.key(
+            "sdf", expression_hash(sphere(r)), ((0, 1),) * 3, (10, 10, 10), np.float64
+        )
+        for r in (1, 2, 3, 4)
+    ]
+    assert len(set(keys)) == 4
+    for n, key in enumerate(keys):
+        cache.store(key, {"values": np.full((10, 10, 10), float(n))})
+    assert cache.load(keys[0]) is None
+    values = cache.load(keys[-1])["values"]
+    assert isinstance(values, np.memmap) and not values.flags.writeable
+    assert values[0, 0, 0] == 3.0
+    assert cache.stats().evictions == 1
+
+
+def test_voxelize_uses_field_cache(field_cache):
+    geometry = Geometry({COPPER: sphere(0.5)})
+    grid = Grid(((-1.0, 1.0),) * 3, 12)
+    first = geometry.voxelize(grid, supersample=2)
+    second = geometry.voxelize(grid, supersample=2)
+    assert field_cache.stats().hits == 1
+    assert (
+        isinstance(second.material_ids, np.memmap)
+        and second.materials == first.materials
+    )
+    np.testing.assert_array_equal(first.fractions, second.fractions)
+    np.testing.assert_array_equal(first.permittivity, second.permittivity)
+
+
+def test_node_hash_sees_full_float_precision():
+    # both leaves print as "sqrt(x**2) - 1.0"
+    a = Expression(sp.sqrt(x**2) - 1.0)
+    b = Expression(sp.sqrt(x**2) - (1.0 + 2.0**-50))
+    assert repr(a) == repr(b) and expression_hash(a) != expression_hash(b)
+    assert expression_hash(a | Sphere(1.0)) == expression_hash(
+        Expression(sp.sqrt(x**2) - 1.0) | Sphere(1.0)
+    )
+    assert expression_hash(a | Sphere(1.0)) != expression_hash(b | Sphere(1.0))
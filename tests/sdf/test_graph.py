@@ -0,0 +1,147 @@
+import math
+import pickle
+import time
+
+import numpy as np
+import sympy as sp
+
+from warpdrive.sdf import (
+    Affine,
+    Box,
+    BoxFrame,
+    Cylinder,
+    RoundBox,
+    Sphere,
+    Subtraction,
+    Union,
+    as_node,
+    box,
+    compile_sdf,
+    interval_bounds,
+    rotate,
+    sample_grid,
+    sphere,
+    subtraction,
+    translate,
+    union,
+)
+from warpdrive.sdf.bounds import bounding_box
+from warpdrive.sdf.marching_cubes import sdf_to_mesh
+
+x, y, z = sp.symbols("x y z")
+
+
+def _part():
+    frame = BoxFrame((0.4, 0.3, 0.2), 0.05).rotate((0.3, 0.1, 0.7))
+    rounded = RoundBox((0.3, 0.3, 0.3), 0.1).translate((0.2, 0.0, 0.0))
+    return ((Sphere(0.5) | frame) - Cylinder(0.2)) ^ rounded & Box(
+        (0.6, 0.6, 0.6)
+    ) | Cylinder(0.1, 0.4)
+
+
+def test_nodes_match_sympy():
+    node = _part()
+    f = sp.lambdify((x, y, z), node.to_sympy(), "numpy")
+    pts = np.random.default_rng(0).uniform(-0.8, 0.8, size=(3, 500))
+    np.testing.assert_allclose(node(*pts), f(*pts), atol=1e-12)
+    assert bounding_box(node) == bounding_box(node.to_sympy())
+
+
+def test_nodes_are_interned():
+    assert Sphere(1) is Sphere(1.0)
+    assert Union(Box((1, 1, 1)), Sphere(1)) | Sphere(1) is Box((1, 1, 1)) | Sphere(1)
+    node = _part()
+    assert pickle.loads(pickle.dumps(node)) is node
+
+
+def test_existing_functions_accept_nodes():
+    node = union(translate(Box((0.5, 0.5, 0.5)), (0.5, 0.0, 0.0)), sphere(0.5))
+    assert isinstance(node, Union)
+    assert as_node(node.to_sympy()) is not None
+    assert bounding_box(node) == ((-0.5, 1.0), (-0.5, 0.5), (-0.5, 0.5))
+
+    lo, hi = interval_bounds(node, ((2.0, 3.0), (0.0, 0.0), (0.0, 0.0)))
+    assert 0.0 < lo <= 1.0 <= hi
+
+    bbox = ((-1.0, 1.5),) * 3
+    values = sample_grid(node, bbox, 17, max_chunk_bytes=4096)
+    np.testing.assert_allclose(
+        values, sample_grid(node.to_sympy(), bbox, 17), atol=1e-12
+    )
+    verts, faces = sdf_to_mesh(node, resolution=16)
+    assert len(faces) > 0
+
+
+def test_sympy_subtraction_of_sums_becomes_a_node():
+    # -(sphere) is distributed into an Add, not kept as Mul(-1, sphere)
+    cuts = [
+        subtraction(
+            translate(box((0.5, 0.4, 0.3)), (dx, 0.0, 0.0)),
+            sphere(0.2, (dx + 0.1, 0.0, 0.0)),
+        )
+        for dx in (0.0, 2.0)
+    ]
+    assert all(isinstance(arg, sp.Add) for arg in cuts[0].args)
+    node = as_node(union(*cuts))
+    assert isinstance(node, Union)
+    assert all(isinstance(child, Subtraction) for child in node.children)
+
+
+def test_transforms_fold_into_one_affine():
+    node = (
+        Box((1.0, 2.0, 3.0))
+        .rotate((math.pi / 2, 0.0, 0.0))
+        .translate((1.0, 0.0, 0.0))
+        .translate((0.0, 1.0, 0.0))
+    )
+    assert isinstance(node, Affine) and isinstance(node.child, Box)
+    # axis-aligned rotation snaps to a signed permutation
+    assert set(np.abs(node.matrix[:, :3]).ravel()) == {0.0, 1.0}
+    assert node.bounds == ((0.0, 2.0), (-2.0, 4.0), (-2.0, 2.0))
+    assert Sphere(1.0).translate((1.0, 0.0, 0.0)).translate((-1.0, 0.0, 0.0)) is Sphere(
+        1.0
+    )
+
+    xs, ys, zs = (
+        np.linspace(-3, 3, 7)[:, None, None],
+        np.linspace(-3, 3, 8)[None, :, None],
+        np.linspace(-3, 3, 9),
+    )
+    assert node.evaluate(xs, ys, zs).shape == (7, 8, 9)
+    f = sp.lambdify((x, y, z), node.to_sympy(), "numpy")
+    np.testing.assert_allclose(node(xs, ys, zs), f(xs, ys, zs), atol=1e-12)
+    rotated = rotate(box((1.0, 2.0, 3.0)), (0.0, 0.0, math.pi / 2))
+    assert all(abs(c) > 1e-12 for c in rotated.atoms(sp.Float))
+
+
+def test_construction_scales_linearly():
+    start = time.perf_counter()
+    parts = [
+        Box((0.01, 0.02, 0.03))
+        .translate((0.1 * i, 0.0, 0.0))
+        .rotate((0.0, 0.0, 0.01 * i))
+        for i in range(300)
+    ]
+    node = parts[0]
+    for part in parts[1:]:
+        node = node | part
+    assert time.perf_counter() - start < 1.0
+    assert len(node.children) == 300
+
+
+def test_indexed_union_matches_plain_minimum():
+    spheres = [sphere(0.05, (0.1 * (i % 10), 0.1 * (i // 10), 0.0)) for i in range(100)]
+    start = time.perf_counter()
+    expr = spheres[0]
+    for s in spheres[1:]:
+        expr = union(expr, s)
+    assert time.perf_counter() - start < 2.0
+    assert isinstance(expr, sp.Min) and len(expr.args) == 100
+    bbox = ((-0.2, 1.1), (-0.2, 1.1), (-0.1, 0.1))
+    shape = (40, 40, 12)
+    indexed = sample_grid(expr, bbox, shape)
+    xs, ys, zs = (np.linspace(lo, hi, n) for (lo, hi), n in zip(bbox, shape))
+    dense = compile_sdf(expr)(xs[:, None, None], ys[None, :, None], zs[None, None, :])
+    np.testing.assert_allclose(indexed, dense, atol=1e-12)
+    node = Union(*map(as_node, spheres))
+    np.testing.assert_allclose(sample_grid(node, bbox, shape), dense, atol=1e-12)
@@ -0,0 +1,50 @@
+import numpy as np
+
+from warpdrive.geometry.circuit.circular_rlc import CircularRLC
+from warpdrive.sdf import (
+    box,
+    compile_sdf,
+    cylinder,
+    rotate,
+    sphere,
+    subtraction,
+    translate,
+    union,
+)
+from warpdrive.sdf.interval import box_sign, interval_bounds
+
+
+def _assert_encloses(expr, rng, n_boxes=50, scale=2.0):
+    kernel = compile_sdf(expr)
+    lo_c = rng.uniform(-scale, scale, size=(n_boxes, 3))
+    size = rng.uniform(0.0, scale / 2, size=(n_boxes, 3))
+    hi_c = lo_c + size
+    lo, hi = interval_bounds(expr, tuple(zip(lo_c.T, hi_c.T)))
+    for b in range(n_boxes):
+        pts = rng.uniform(lo_c[b], hi_c[b], size=(200, 3)).T
+        vals = kernel(*pts)
+        assert lo[b] <= vals.min() and vals.max() <= hi[b]
+
+
+def test_bounds_enclose_samples():
+    rng = np.random.default_rng(1)
+    expr = subtraction(
+        union(rotate(cylinder(0.5, 1.0), (0.3, 0.2, 0.1)), sphere(0.7)),
+        translate(box((0.2, 0.3, 0.4)), (0.5, 0.0, 0.0)),
+    )
+    _assert_encloses(expr, rng)
+
+
+def test_circular_rlc_conductor_is_enclosed():
+    rng = np.random.default_rng(2)
+    conductor = CircularRLC._sdf_conductor(1e-3, 1e-4, 1e-4, 5e-5, 5e-5)
+    _assert_encloses(conductor, rng, n_boxes=20, scale=2e-3)
+
+
+def test_box_sign_classification():
+    expr = sphere(1.0)
+    assert box_sign(expr, ((2.0, 3.0), (0.0, 0.1), (0.0, 0.1))) == 1
+    assert box_sign(expr, ((-0.1, 0.1), (-0.1, 0.1), (-0.1, 0.1))) == -1
+    assert box_sign(expr, ((0.5, 1.5), (0.0, 0.1), (0.0, 0.1))) == 0
+    signs = box_sign(expr, (([2.0, -0.1], [3.0, 0.1]), (0.0, 0.1), (0.0, 0.1)))
+    np.testing.assert_array_equal(signs, [1, -1])
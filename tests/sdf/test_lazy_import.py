@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+import warpdrive.sdf
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+
+def test_import_loads_no_heavy_dependencies():
+    out = _run(
+        "import sys, warpdrive.sdf; "
+        "print(sorted(m for m in ('numpy', 'sympy', 'matplotlib') if m in sys.modules))"
+    )
+    assert out.strip() == "[]"
+
+
+def test_names_resolve_on_access():
+    out = _run(
+        "import sys, warpdrive.sdf as s; s.sphere; "
+        "print('sympy' in sys.modules, 'warpdrive.sdf.plotting' in sys.modules)"
+    )
+    assert out.split() == ["True", "False"]
+    assert set(warpdrive.sdf.__all__) <= set(dir(warpdrive.sdf))
+
+
+def test_submodule_import_does_not_shadow_function():
+    import warpdrive.sdf.union  # noqa: F401
+    from warpdrive.sdf import union
+
+    assert callable(union) and warpdrive.sdf.union is union
+    assert warpdrive.sdf.Union.__name__ == "Union"
@@ -1,10 +1,12 @@
+import numpy as np
 import pytest
 import sympy as sp
 
-pytest.importorskip("skimage")
+from warpdrive.sdf import box, sphere
+from warpdrive.sdf.bounds import padded_bbox
+from warpdrive.sdf.marching_cubes import sdf_to_mesh, sdf_to_meshes
 
-from warpdrive.sdf import sphere
-from warpdrive.sdf.marching_cubes import sdf_to_mesh
+pytest.importorskip("skimage")
 
 x, y, z = sp.symbols("x y z")
 
@@ -15,4 +17,58 @@ def test_sdf_to_mesh_basic():
     # Expect some vertices and faces
     assert verts.shape[1] == 3
     assert faces.shape[1] == 3
-    assert len(verts) > 0 and len(faces) > 0 
\ No newline at end of file
+    assert len(verts) > 0 and len(faces) > 0
+
+
+def test_adaptive_matches_dense_surface():
+    expr = sphere(1.0)
+    bbox = ((-1.2, 1.2),) * 3
+    dense_v, dense_f = sdf_to_mesh(expr, bbox=bbox, resolution=41)
+    verts, faces = sdf_to_mesh(expr, bbox=bbox, resolution=41, adaptive=True, block=8)
+
+    def area(v, f):
+        tri = v[f]
+        return (
+            0.5
+            * np.linalg.norm(
+                np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]), axis=1
+            ).sum()
+        )
+
+    assert len(faces) == len(dense_f)
+    assert abs(area(verts, faces) - area(dense_v, dense_f)) < 1e-6
+    np.testing.assert_allclose(np.linalg.norm(verts, axis=1), 1.0, atol=0.02)
+
+
+def test_bbox_defaults_to_expression_bounds():
+    verts, faces = sdf_to_mesh(sphere(0.25), resolution=20)
+    np.testing.assert_allclose(np.linalg.norm(verts, axis=1), 0.25, atol=0.01)
+
+
+def test_out_of_core_field_is_meshed_in_slabs(tmp_path):
+    bbox = ((-1.2, 1.2),) * 3
+    dense_v, dense_f = sdf_to_mesh(sphere(1.0), bbox=bbox, resolution=41)
+    path = tmp_path / "field.npy"
+    verts, faces = sdf_to_mesh(
+        sphere(1.0),
+        bbox=bbox,
+        resolution=41,
+        out=path,
+        max_chunk_bytes=41 * 41 * 8 * 4 * 6,
+    )
+
+    field = np.load(path, mmap_mode="r")
+    assert field.shape == (41, 41, 41) and field[20, 20, 20] == pytest.approx(-1.0)
+    # same triangles, only the vertices on slab seams are duplicated
+    assert len(faces) == len(dense_f) and len(verts) > len(dense_v)
+    np.testing.assert_allclose(np.linalg.norm(verts, axis=1), 1.0, atol=0.02)
+
+
+def test_meshes_on_shared_grid_match_single_meshes():
+    exprs = [sphere(0.5), box((0.3, 0.2, 0.6))]
+    meshes = sdf_to_meshes(exprs, resolution=24, workers=2, cache=False)
+    bbox = padded_bbox(((-0.5, 0.5), (-0.5, 0.5), (-0.6, 0.6)), 24)  # hull of both
+    for expr, (verts, faces) in zip(exprs, meshes):
+        ref_v, ref_f = sdf_to_mesh(expr, bbox=bbox, resolution=24, cache=False)
+        np.testing.assert_allclose(verts, ref_v, atol=1e-12)
+        np.testing.assert_array_equal(faces, ref_f)
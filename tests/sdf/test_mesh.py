@@ -0,0 +1,87 @@
+import io
+
+import numpy as np
+import pytest
+
+from warpdrive.sdf import box, sphere
+from warpdrive.sdf.marching_cubes import sdf_to_mesh
+from warpdrive.sdf.mesh import decimate, weld, write_ply, write_stl
+
+pytest.importorskip("skimage")
+
+BBOX = ((-1.2, 1.2),) * 3
+
+
+def _edge_counts(faces):
+    edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    return np.unique(edges, axis=0, return_counts=True)[1]
+
+
+def test_weld_merges_slab_seams(tmp_path):
+    dense_v, dense_f = weld(*sdf_to_mesh(sphere(1.0), BBOX, 41))
+    slabs = sdf_to_mesh(
+        sphere(1.0),
+        BBOX,
+        41,
+        out=tmp_path / "f.npy",
+        max_chunk_bytes=41 * 41 * 8 * 4 * 6,
+    )
+    verts, faces = weld(*slabs)
+    assert len(verts) == len(dense_v) and len(faces) == len(dense_f)
+    assert (_edge_counts(faces) == 2).all()
+
+
+def test_decimate_keeps_closed_surface_near_sphere():
+    verts, faces = weld(*sdf_to_mesh(sphere(1.0), BBOX, 41))
+    small_v, small_f = decimate(verts, faces, 1000)
+    assert 800 < len(small_f) <= 1000
+    assert (_edge_counts(small_f) == 2).all()
+    assert len(small_v) - len(_edge_counts(small_f)) + len(small_f) == 2
+    np.testing.assert_allclose(np.linalg.norm(small_v, axis=1), 1.0, atol=0.03)
+
+
+def test_decimate_keeps_box_corners():
+    verts, faces = weld(*sdf_to_mesh(box((0.5, 0.4, 0.3)), resolution=40))
+    small_v, _ = decimate(verts, faces, 200)
+    np.testing.assert_allclose(np.abs(small_v).max(axis=0), [0.5, 0.4, 0.3], atol=0.02)
+
+
+@pytest.mark.parametrize("scale", [1.0, 1e-3])
+def test_decimate_max_error_is_a_distance(scale):
+    verts, faces = weld(*sdf_to_mesh(sphere(1.0), BBOX, 41))
+    verts = verts * scale
+
+    def error(v, f):
+        points = np.concatenate([v, v[f].mean(axis=1)])
+        return np.abs(np.linalg.norm(points, axis=1) - scale).max()
+
+    small_v, small_f = decimate(verts, faces, None, max_error=1e-2 * scale)
+    assert 0.1 * len(faces) < len(small_f) < 0.5 * len(faces)
+    assert (_edge_counts(small_f) == 2).all()
+    assert error(small_v, small_f) <= error(verts, faces) + 1e-2 * scale
+
+
+def test_stl_and_ply_round_trip(tmp_path):
+    verts, faces = weld(*sdf_to_mesh(sphere(1.0), BBOX, 16))
+
+    write_stl(tmp_path / "m.stl", verts, faces, chunk=100)
+    data = (tmp_path / "m.stl").read_bytes()
+    assert np.frombuffer(data, "<u4", 1, 80)[0] == len(faces) and len(
+        data
+    ) == 84 + 50 * len(faces)
+    records = np.frombuffer(
+        data, [("n", "<f4", 3), ("v", "<f4", (3, 3)), ("attr", "<u2")], offset=84
+    )
+    np.testing.assert_allclose(records["v"], verts[faces], atol=1e-6)
+    np.testing.assert_allclose(np.linalg.norm(records["n"], axis=1), 1.0, atol=1e-6)
+
+    buffer = io.BytesIO()
+    write_ply(buffer, verts, faces, chunk=100)
+    head, body = buffer.getvalue().split(b"end_header\n")
+    assert b"element face %d" % len(faces) in head and b"property double x" in head
+    np.testing.assert_array_equal(
+        np.frombuffer(body, "<f8", 3 * len(verts)).reshape(-1, 3), verts
+    )
+    packed = np.frombuffer(body, [("n", "u1"), ("i", "<i4", 3)], offset=24 * len(verts))
+    assert (packed["n"] == 3).all()
+    np.testing.assert_array_equal(packed["i"], faces)
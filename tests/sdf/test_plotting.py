@@ -1,5 +1,4 @@
 import pytest
-import sympy as sp
 
 # Skip if optional deps absent
 matplotlib = pytest.importorskip("matplotlib")
@@ -9,7 +8,9 @@ pytest.importorskip("skimage")
 matplotlib.use("Agg")
 
 import matplotlib.pyplot as plt  # noqa: E402  (after backend set)
-from warpdrive.sdf import sphere, box, plot_sdf  # noqa: E402  (after backend set)
+
+from warpdrive.sdf import box, plot_sdf, sphere  # noqa: E402  (after backend set)
+from warpdrive.sdf.marching_cubes import sdf_to_mesh  # noqa: E402
 
 
 def test_plot_sdf_runs():
@@ -20,6 +21,32 @@ def test_plot_sdf_runs():
     plot_sdf(expr, bbox=((-0.5, 0.5),) * 3, resolution=8)
 
     # list of two expressions with colors
-    plot_sdf([expr, box((0.2, 0.2, 0.2))], bbox=((-0.6, 0.6),) * 3, resolution=8, color=["cyan", "magenta"])
-
-    matplotlib.pyplot.close("all") 
\ No newline at end of file
+    plot_sdf(
+        [expr, box((0.2, 0.2, 0.2))],
+        bbox=((-0.6, 0.6),) * 3,
+        resolution=8,
+        color=["cyan", "magenta"],
+    )
+
+    matplotlib.pyplot.close("all")
+
+
+def test_plot_sdf_max_faces_limits_drawn_triangles():
+    plot_sdf(
+        [sphere(0.3), box((0.2, 0.2, 0.2))],
+        bbox=((-0.6, 0.6),) * 3,
+        resolution=24,
+        max_faces=400,
+    )
+    (collection,) = plt.gca().collections
+    assert len(collection.get_facecolor()) <= 400
+    matplotlib.pyplot.close("all")
+
+
+def test_plot_sdf_draws_every_triangle_by_default():
+    bbox = ((-0.6, 0.6),) * 3
+    plot_sdf(sphere(0.5), bbox=bbox, resolution=40)
+    (collection,) = plt.gca().collections
+    _, faces = sdf_to_mesh(sphere(0.5), bbox, 40)
+    assert len(collection.get_facecolor()) == len(faces)
+    matplotlib.pyplot.close("all")
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from warpdrive.sdf import Sphere, Union, evaluate_points, sphere, translate, union
+from warpdrive.sdf.points import point_batches
+from warpdrive.utils.instrumentation import trace
+
+rng = np.random.default_rng(0)
+PTS = rng.uniform(-1.0, 1.0, size=(5000, 3))
+
+
+def test_matches_direct_evaluation():
+    expr = union(sphere(0.5), translate(sphere(0.3), (0.6, 0.0, 0.0)))
+    direct = evaluate_points(expr, PTS, batch=10**6)
+    np.testing.assert_allclose(
+        evaluate_points(expr, PTS, batch=333, workers=2), direct, atol=0
+    )
+    out = np.empty(len(PTS), dtype=np.float32)
+    assert evaluate_points(expr, PTS, out=out) is out
+    np.testing.assert_allclose(out, direct, atol=1e-6)
+    with pytest.raises(ValueError):
+        evaluate_points(expr, PTS.T)
+
+
+def test_batches_are_compact_and_cover_all_points():
+    order, starts, boxes = point_batches(PTS, 500)
+    assert sorted(order) == list(range(len(PTS)))
+    assert len(starts) == len(boxes) == 10
+    # Morton batches of a tenth of the points span well below the full cube
+    assert np.prod(boxes[:, :, 1] - boxes[:, :, 0], axis=1).mean() < 0.5 * 8
+
+
+def test_union_culls_far_children():
+    centres = rng.uniform(-1.0, 1.0, size=(40, 3))
+    node = Union(*(Sphere(0.05, tuple(c)) for c in centres))
+    expected = (
+        np.min(np.linalg.norm(PTS[:, None, :] - centres[None], axis=2), axis=1) - 0.05
+    )
+    with trace() as t:
+        values = evaluate_points(node, PTS, batch=256)
+    np.testing.assert_allclose(values, expected, atol=1e-12)
+    assert "cull" in t.summary()
@@ -0,0 +1,101 @@
+import numpy as np
+import sympy as sp
+
+from warpdrive.sdf import (
+    box,
+    sample_fields,
+    sample_gradient,
+    sample_grid,
+    sphere,
+    subtraction,
+    translate,
+    validate_precision,
+)
+
+x, y, z = sp.symbols("x y z")
+
+BBOX = ((-1.0, 1.5), (-1.2, 1.0), (-0.8, 0.9))
+
+
+def _dense(expr, n):
+    xs, ys, zs = (np.linspace(lo, hi, n) for lo, hi in BBOX)
+    X, Y, Z = np.meshgrid(xs, ys, zs, indexing="ij")
+    return sp.lambdify((x, y, z), expr, modules="numpy")(X, Y, Z)
+
+
+def test_matches_dense_meshgrid():
+    expr = translate(box((0.5, 0.4, 0.3)), (0.2, 0.0, 0.1))
+    np.testing.assert_allclose(
+        sample_grid(expr, BBOX, 21), _dense(expr, 21), atol=1e-12
+    )
+
+
+def test_tiny_chunks_are_identical():
+    expr = sphere(0.7, (0.1, 0.1, 0.0))
+    full = sample_grid(expr, BBOX, 17)
+    # budget smaller than one plane forces tiling along the second axis
+    tiled = sample_grid(expr, BBOX, 17, max_chunk_bytes=64)
+    np.testing.assert_array_equal(full, tiled)
+
+
+def test_fills_preallocated_output():
+    out = np.full((9, 10, 11), np.nan)
+    result = sample_grid(sphere(0.5), BBOX, (9, 10, 11), out=out)
+    assert result is out and np.isfinite(out).all()
+
+
+def test_parallel_is_bit_identical():
+    expr = translate(box((0.5, 0.4, 0.3)), (0.2, 0.0, 0.1))
+    serial = sample_grid(expr, BBOX, 23)
+    parallel = sample_grid(expr, BBOX, 23, workers=4, max_chunk_bytes=4096)
+    np.testing.assert_array_equal(serial, parallel)
+
+
+def test_narrow_band_keeps_signs_and_near_values():
+    expr = translate(box((0.5, 0.4, 0.3)), (0.2, 0.0, 0.1))
+    dense = sample_grid(expr, BBOX, 33)
+    banded = sample_grid(expr, BBOX, 33, narrow_band=True, block=4)
+    np.testing.assert_array_equal(np.sign(banded), np.sign(dense))
+    # samples on either side of a sign change are what meshing relies on
+    for axis in range(3):
+        a, b = np.moveaxis(dense, axis, 0), np.moveaxis(banded, axis, 0)
+        crossing = np.sign(a[:-1]) != np.sign(a[1:])
+        np.testing.assert_array_equal(b[:-1][crossing], a[:-1][crossing])
+        np.testing.assert_array_equal(b[1:][crossing], a[1:][crossing])
+
+
+def test_float32_sampling_and_precision_check():
+    expr = subtraction(box((1.0, 0.5, 0.5)), sphere(0.6))
+    bbox = ((-1.5, 1.5),) * 3
+    single = sample_grid(expr, bbox, 24, dtype=np.float32, max_chunk_bytes=4096)
+    assert single.dtype == np.float32
+    np.testing.assert_allclose(single, sample_grid(expr, bbox, 24), atol=1e-6)
+
+    assert validate_precision(expr, bbox, 24).safe
+    # far from the origin float32 spacing is too coarse for a small part
+    far = translate(sphere(1.0), (1e4, 0.0, 0.0))
+    report = validate_precision(
+        far, ((1e4 - 1.2, 1e4 + 1.2), (-1.2, 1.2), (-1.2, 1.2)), 32
+    )
+    assert not report.safe and report.max_abs_error > report.tolerance
+
+
+def test_gradient_grid_matches_values_and_normals():
+    expr = translate(sphere(0.6), (0.2, 0.0, 0.0))
+    grad = sample_gradient(expr, BBOX, 9, max_chunk_bytes=1024)
+    assert grad.shape == (4, 9, 9, 9)
+    np.testing.assert_allclose(grad[0], sample_grid(expr, BBOX, 9), atol=1e-12)
+    # the gradient of an exact distance is the unit normal
+    np.testing.assert_allclose(np.linalg.norm(grad[1:], axis=0), 1.0, atol=1e-12)
+
+
+def test_fields_share_one_pass():
+    exprs = [
+        sphere(0.7, (0.1, 0.1, 0.0)),
+        translate(box((0.5, 0.4, 0.3)), (0.2, 0.0, 0.1)),
+    ]
+    fields = sample_fields(exprs, BBOX, (9, 10, 11), max_chunk_bytes=256, workers=2)
+    assert fields.shape == (2, 9, 10, 11)
+    for expr, values in zip(exprs, fields):
+        np.testing.assert_array_equal(values, sample_grid(expr, BBOX, (9, 10, 11)))
+    assert sample_fields([], BBOX, (9, 10, 11)).shape == (0, 9, 10, 11)
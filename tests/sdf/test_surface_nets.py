@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from warpdrive.sdf import box, compile_sdf, cylinder, sphere, subtraction
+from warpdrive.sdf.surface_nets import sdf_to_surface_net
+
+BBOX = ((-1.2, 1.2),) * 3
+
+
+def _volume(verts, faces):
+    tri = verts[faces]
+    return np.einsum("ij,ij->i", tri[:, 0], np.cross(tri[:, 1], tri[:, 2])).sum() / 6
+
+
+def _edge_counts(faces):
+    edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    return np.unique(edges, axis=0, return_counts=True)[1]
+
+
+def test_sphere_is_closed_and_outward():
+    verts, faces = sdf_to_surface_net(sphere(1.0), BBOX, 41, cache=False)
+    assert (_edge_counts(faces) == 2).all()
+    np.testing.assert_allclose(_volume(verts, faces), 4 / 3 * np.pi, rtol=0.01)
+    np.testing.assert_allclose(np.linalg.norm(verts, axis=1), 1.0, atol=0.01)
+
+
+def test_dual_contouring_keeps_sharp_edges():
+    expr = subtraction(box((0.5, 0.4, 0.3)), cylinder(0.15, 0.6))
+    kernel = compile_sdf(expr)
+    errors = {}
+    for sharp in (False, True):
+        verts, faces = sdf_to_surface_net(expr, resolution=40, sharp=sharp, cache=False)
+        centers = verts[faces].mean(axis=1)
+        errors[sharp] = np.abs(
+            kernel(centers[:, 0], centers[:, 1], centers[:, 2])
+        ).max()
+    np.testing.assert_allclose(np.abs(verts).max(axis=0), [0.5, 0.4, 0.3], atol=1e-9)
+    assert errors[True] < 0.5 * errors[False]
+
+
+def test_slabs_and_blocks_match_dense(tmp_path):
+    expr = box((0.5, 0.4, 0.3))
+    dense = sdf_to_surface_net(expr, BBOX, 33, cache=False)
+    slabs = sdf_to_surface_net(
+        expr, BBOX, 33, out=tmp_path / "f.npy", max_chunk_bytes=33 * 33 * 8 * 8 * 5
+    )
+    blocks = sdf_to_surface_net(expr, BBOX, 33, adaptive=True, block=8)
+    for verts, faces in (slabs, blocks):
+        assert len(verts) == len(dense[0])
+        np.testing.assert_allclose(
+            np.sort(verts, axis=0), np.sort(dense[0], axis=0), atol=1e-12
+        )
+        assert len(faces) == len(dense[1]) and (_edge_counts(faces) == 2).all()
+
+
+def _min_angle(verts, faces):
+    tri = verts[faces]
+    angles = []
+    for i in range(3):
+        u = tri[:, (i + 1) % 3] - tri[:, i]
+        v = tri[:, (i + 2) % 3] - tri[:, i]
+        cos = np.einsum("ij,ij->i", u, v)
+        cos /= np.linalg.norm(u, axis=1) * np.linalg.norm(v, axis=1)
+        angles.append(np.degrees(np.arccos(np.clip(cos, -1.0, 1.0))))
+    return np.min(angles)
+
+
+@pytest.mark.parametrize("scale", [1.0, 1e-3])
+def test_compared_with_marching_cubes(scale):
+    pytest.importorskip("skimage")
+    from warpdrive.sdf.marching_cubes import sdf_to_mesh
+
+    bbox = tuple((scale * lo, scale * hi) for lo, hi in BBOX)
+    cell = scale * 2.4 / 40
+    # the box's faces lie on grid planes, where either mesher may leave
+    # degenerate triangles: compare angles on the sphere only
+    for expr, smooth, max_error, ratio in (
+        (sphere(scale), True, 0.1, 0.5),
+        (box((0.5 * scale, 0.4 * scale, 0.3 * scale)), False, 0.05, 0.2),
+    ):
+        kernel = compile_sdf(expr)
+        mc_verts, mc_faces = sdf_to_mesh(expr, bbox, 41)
+        verts, faces = sdf_to_surface_net(expr, bbox, 41, cache=False)
+        assert len(faces) <= 1.1 * len(mc_faces)
+        if smooth:
+            assert _min_angle(verts, faces) > 20.0 > _min_angle(mc_verts, mc_faces)
+
+        _, quads = sdf_to_surface_net(expr, bbox, 41, quads=True, cache=False)
+        assert quads.shape == (len(faces) // 2, 4)
+        assert len(quads) < 0.6 * len(mc_faces)
+
+        small_v, small_f = sdf_to_surface_net(
+            expr, bbox, 41, max_error=max_error, cache=False
+        )
+        assert len(small_f) < ratio * len(mc_faces)
+        assert (_edge_counts(small_f) == 2).all()
+        points = np.concatenate([small_v, small_v[small_f].mean(axis=1)])
+        error = np.abs(kernel(points[:, 0], points[:, 1], points[:, 2])).max()
+        points = np.concatenate([verts, verts[faces].mean(axis=1)])
+        before = np.abs(kernel(points[:, 0], points[:, 1], points[:, 2])).max()
+        assert error <= before + max_error * cell
@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+
+from warpdrive.sdf import (
+    Box,
+    Cylinder,
+    Rotate,
+    Sphere,
+    Translate,
+    box,
+    compile_sdf,
+    cylinder,
+    declare_symmetry,
+    mirror_symmetry,
+    rotate,
+    sample_grid,
+    sphere,
+    translate,
+    union,
+    x,
+    y,
+)
+from warpdrive.sdf.sampling import grid_axes
+from warpdrive.utils.instrumentation import trace
+
+
+def test_detects_symmetry_from_expressions_and_nodes():
+    assert mirror_symmetry(box((0.5, 0.4, 0.3))) == (True, True, True)
+    assert mirror_symmetry(cylinder(0.2, 0.6)) == (True, True, True)
+    assert mirror_symmetry(translate(sphere(0.5), (0.0, 0.2, 0.0))) == (
+        True,
+        False,
+        True,
+    )
+    assert mirror_symmetry(rotate(box((0.5, 0.4, 0.3)), (0.0, 0.0, 0.3))) == (
+        False,
+        False,
+        True,
+    )
+    pair = union(
+        translate(box((0.1, 0.1, 0.1)), (0.5, 0.0, 0.0)),
+        translate(box((0.1, 0.1, 0.1)), (-0.5, 0.0, 0.0)),
+    )
+    assert mirror_symmetry(pair) == (True, True, True)
+
+    assert Sphere(0.5, (0.0, 0.2, 0.0)).symmetry == (True, False, True)
+    assert Rotate(
+        Translate(Cylinder(0.2, 0.6), (0.0, 0.0, 0.1)), (math.pi / 2, 0.0, 0.0)
+    ).symmetry == (True, False, True)
+    assert (Box((0.5, 0.5, 0.5)) - Sphere(0.2, (0.3, 0.0, 0.0))).symmetry == (
+        False,
+        True,
+        True,
+    )
+
+
+def test_declared_symmetry_is_kept():
+    # even (6 x**2 + 2), but only after expanding the cubes
+    expr = (x + 1) ** 3 - (x - 1) ** 3 + y - 1
+    assert mirror_symmetry(expr) == (False, False, True)
+    assert declare_symmetry(expr, (True, False, False)) is expr
+    assert mirror_symmetry(expr) == (True, False, True)
+
+
+def test_symmetric_sampling_evaluates_one_octant():
+    expr = box((0.5, 0.4, 0.3))
+    bbox = ((-1.0, 1.0), (-0.8, 0.8), (-0.6, 0.6))
+    shape = (16, 17, 9)
+    with trace() as t:
+        values = sample_grid(expr, bbox, shape, max_chunk_bytes=512, symmetry=True)
+    assert t.summary()["evaluate"]["points"] == 8 * 9 * 5
+    # the grid is only symmetric up to rounding of the coordinates
+    direct = sample_grid(expr, bbox, shape)
+    np.testing.assert_allclose(values, direct, rtol=0, atol=4 * np.finfo(float).eps)
+
+    # an off-centre box along y only mirrors x and z
+    shifted = ((-1.0, 1.0), (-0.7, 0.9), (-0.6, 0.6))
+    with trace() as t:
+        values = sample_grid(expr, shifted, 9, symmetry=True)
+    assert t.summary()["evaluate"]["points"] == 5 * 9 * 5
+    np.testing.assert_allclose(
+        values, sample_grid(expr, shifted, 9), rtol=0, atol=4 * np.finfo(float).eps
+    )
+
+
+def test_sampling_evaluates_every_point_by_default():
+    expr = box((0.5, 0.4, 0.3))
+    bbox = ((-1.0, 1.0), (-0.8, 0.8), (-0.6, 0.6))
+    with trace() as t:
+        values = sample_grid(expr, bbox, (16, 17, 9))
+    assert t.summary()["evaluate"]["points"] == 16 * 17 * 9
+    xs, ys, zs = grid_axes(bbox, (16, 17, 9))
+    np.testing.assert_array_equal(
+        values, compile_sdf(expr)(xs[:, None, None], ys[None, :, None], zs)
+    )
@@ -0,0 +1,42 @@
+import re
+
+import numpy as np
+import pytest
+import sympy as sp
+
+from warpdrive.sdf import (
+    box,
+    compile_sdf,
+    cylinder,
+    sphere,
+    subtraction,
+    translate,
+    union,
+)
+from warpdrive.sdf.warpx import eb_implicit_function, to_warpx
+
+
+def test_export_matches_kernel_and_hoists_shared_terms(evaluate_parser):
+    expr = subtraction(
+        union(box((1.0, 2.0, 3.0)), sphere(1.5, (1.0, 0.0, 0.0))),
+        translate(cylinder(0.5, 1.0), (0.2, 0.0, 0.0)),
+    )
+    exported = to_warpx(expr)
+    pts = np.random.default_rng(1).uniform(-3, 3, size=(3, 200))
+    np.testing.assert_allclose(
+        evaluate_parser(exported.text, *pts), compile_sdf(expr)(*pts), atol=1e-12
+    )
+
+    assert exported.n_locals > 0 and exported.text.count(";") == exported.n_locals
+    assert exported.size < len(str(expr))
+    # every hoisted local is referenced at least twice
+    for name in re.findall(r"(t\d+)=", exported.text):
+        assert len(re.findall(rf"\b{name}\b", exported.text)) >= 3
+
+
+def test_eb_implicit_function_is_positive_inside(evaluate_parser):
+    text = eb_implicit_function(sphere(1.0)).text
+    assert evaluate_parser(text, 0.0, 0.0, 0.0) == pytest.approx(1.0)
+    assert evaluate_parser(text, 2.0, 0.0, 0.0) == pytest.approx(-1.0)
+    with pytest.raises(ValueError):
+        to_warpx(sp.besselj(0, sp.Symbol("x")))
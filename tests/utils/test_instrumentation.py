@@ -0,0 +1,63 @@
+import json
+import threading
+
+import pytest
+
+from warpdrive.sdf import sample_grid, sphere
+from warpdrive.sdf.marching_cubes import sdf_to_mesh
+from warpdrive.utils.instrumentation import (
+    add_span_callback,
+    remove_span_callback,
+    span,
+    trace,
+)
+
+
+def test_meshing_stages_are_traced(tmp_path):
+    with trace(memory=True) as t:
+        verts, faces = sdf_to_mesh(
+            sphere(0.7, (0.01, 0.02, 0.03)), resolution=20, cache=False
+        )
+    summary = t.summary()
+    assert {"allocate", "evaluate", "isolevel_scan", "marching_cubes"} <= set(summary)
+    assert summary["evaluate"]["points"] == summary["isolevel_scan"]["points"] == 20**3
+    assert summary["allocate"]["bytes"] == 20**3 * 8
+    assert summary["marching_cubes"]["faces"] == len(faces)
+    assert all("allocated_bytes" in s for s in t.to_dict()["spans"])
+
+    path = tmp_path / "trace.json"
+    t.save_chrome_trace(path)
+    events = json.loads(path.read_text())["traceEvents"]
+    assert {e["ph"] for e in events} == {"X"} and min(e["ts"] for e in events) == 0.0
+
+
+def test_spans_nest_and_reach_callbacks():
+    seen = []
+    add_span_callback(seen.append)
+    try:
+        with span("outer", points=3) as outer:
+            with span("inner"):
+                pass
+            outer.set(bytes=24)
+        worker = threading.Thread(
+            target=lambda: sample_grid(sphere(1.0), ((-1, 1),) * 3, 4)
+        )
+        worker.start()
+        worker.join()
+    finally:
+        remove_span_callback(seen.append)
+    inner, outer = seen[:2]
+    assert inner.parent == "outer" and outer.parent is None
+    assert outer.attrs == {"points": 3, "bytes": 24}
+    evaluate = next(s for s in seen if s.name == "evaluate")
+    assert evaluate.thread != outer.thread
+
+
+def test_disabled_spans_record_nothing():
+    with span("ignored") as s:
+        s.set(points=1)
+    with trace() as t:
+        pass
+    assert t.spans == [] and t.to_chrome_trace()["traceEvents"] == []
+    with pytest.raises(ValueError):
+        remove_span_callback(print)
@@ -1,3 +1,6 @@
 from .geometry import Geometry
+from .grid import Grid
+from .points import evaluate_points
+from .voxelize import Voxelization, voxelize
 
-__all__ = ["Geometry"] 
\ No newline at end of file
+__all__ = ["Geometry", "Grid", "Voxelization", "evaluate_points", "voxelize"]
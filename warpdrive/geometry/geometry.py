@@ -1,9 +1,11 @@
 from __future__ import annotations
+
 from typing import Dict
 
 import sympy
 
 from warpdrive.material.material import Material
+from warpdrive.sdf.bounds import bounding_box, hull_bounds
 from warpdrive.sdf.union import union
 
 
@@ -15,7 +17,7 @@ class Geometry:
     ):
         self.solids = solids
 
-    def __add__(self, other: 'Geometry') -> 'Geometry':
+    def __add__(self, other: "Geometry") -> "Geometry":
         solids = {**self.solids}
 
         for material, expr in other.solids.items():
@@ -27,11 +29,45 @@ class Geometry:
         return Geometry(
             solids=solids,
         )
-    
+
+    def bounding_box(self):
+        """Hull of the solids' bounds, or *None* if any of them is unknown."""
+        return hull_bounds(
+            *(bounding_box(expr, derive=True) for expr in self.solids.values())
+        )
+
+    def voxelize(self, grid, **kwargs):
+        """Material ids and parameter arrays on *grid*.
+
+        See `warpdrive.geometry.voxelize.voxelize` for the keyword arguments.
+        """
+        from .voxelize import voxelize
+
+        return voxelize(self, grid, **kwargs)
+
+    def evaluate_points(self, points, **kwargs):
+        """Material ids at ``(N, 3)`` *points*.
+
+        See `warpdrive.geometry.points.evaluate_points` for the keyword
+        arguments.
+        """
+        from .points import evaluate_points
+
+        return evaluate_points(self, points, **kwargs)
+
+    def to_warpx(self, **kwargs):
+        """WarpX parser strings of the material parameters.
+
+        See `warpdrive.geometry.warpx.material_functions`.
+        """
+        from .warpx import material_functions
+
+        return material_functions(self, **kwargs)
+
     def plot(
         self,
         *,
-        bbox=((-1, 1), (-1, 1), (-1, 1)),
+        bbox=None,
         resolution: int = 50,
         isolevel: float = 0.0,
         color_by_material: bool = True,
@@ -40,13 +76,18 @@ class Geometry:
 
         Parameters
         ----------
+        bbox
+            Sampling domain; defaults to the padded `bounding_box` of the
+            solids.
         color_by_material
             If *True* use the RGBA colour stored in each `Material`.  Otherwise a
             default colour is used for all solids.
         """
 
         try:
-            from warpdrive.sdf import plot_sdf  # runtime import keeps heavy deps optional
+            from warpdrive.sdf import (
+                plot_sdf,  # runtime import keeps heavy deps optional
+            )
         except ImportError as exc:  # pragma: no cover
             raise RuntimeError("plot_sdf optional dependencies missing") from exc
 
@@ -56,6 +97,7 @@ class Geometry:
         exprs = list(self.solids.values())
 
         if color_by_material:
+
             def _rgba_to_mpl(rgba):
                 r, g, b, a = rgba
                 return (r / 255, g / 255, b / 255, a / 255)
@@ -64,5 +106,6 @@ class Geometry:
         else:
             colors = "cyan"
 
-        plot_sdf(exprs, bbox=bbox, resolution=resolution, isolevel=isolevel, color=colors)
-    
+        plot_sdf(
+            exprs, bbox=bbox, resolution=resolution, isolevel=isolevel, color=colors
+        )
@@ -0,0 +1,49 @@
+"""Regular sampling grid shared by the voxeliser and the solver input."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from warpdrive.sdf.sampling import Bbox, Resolution, grid_axes, grid_shape
+
+__all__ = ["Grid"]
+
+
+@dataclass(frozen=True)
+class Grid:
+    """Regular grid of ``shape`` points spanning *bbox* (both ends inclusive).
+
+    Point ``[i, j, k]`` sits at ``(xs[i], ys[j], zs[k])`` and stands for the
+    cell of size `spacing` centred on it, matching
+    `warpdrive.sdf.sampling.sample_grid`.
+    """
+
+    bbox: Bbox
+    shape: Tuple[int, int, int]
+
+    def __init__(self, bbox: Bbox, shape: Resolution):
+        object.__setattr__(
+            self, "bbox", tuple((float(lo), float(hi)) for lo, hi in bbox)
+        )
+        object.__setattr__(self, "shape", grid_shape(shape))
+
+    @classmethod
+    def from_spacing(cls, bbox: Bbox, spacing: float) -> "Grid":
+        """Grid covering *bbox* with at most *spacing* between points."""
+        shape = tuple(max(2, int(np.ceil((hi - lo) / spacing)) + 1) for lo, hi in bbox)
+        return cls(bbox, shape)
+
+    @property
+    def axes(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Point coordinates ``xs, ys, zs`` along each axis."""
+        return grid_axes(self.bbox, self.shape)
+
+    @property
+    def spacing(self) -> Tuple[float, float, float]:
+        spacing = tuple(
+            (hi - lo) / (n - 1) for (lo, hi), n in zip(self.bbox, self.shape)
+        )
+        return spacing  # type: ignore[return-value]
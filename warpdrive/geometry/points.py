@@ -0,0 +1,130 @@
+"""Material lookup of a `Geometry` at scattered points.
+
+`evaluate_points` tells which material sits at each of ``N`` arbitrary
+positions, e.g. for particle injection, absorption or loading, with the
+same priority rule as `warpdrive.geometry.voxelize.voxelize`.  The points
+are cut into spatially compact batches
+(`warpdrive.sdf.points.point_batches`) and a solid is only evaluated for
+the batches whose box overlaps its bounding box; outside of it the solid's
+SDF is positive anyway.
+
+Plain SDFs are passed on to `warpdrive.sdf.points.evaluate_points`.
+
+>>> import numpy as np
+>>> from warpdrive.material.material import COPPER
+>>> from warpdrive.sdf import sphere
+>>> points = np.array([[0.0, 0.0, 0.0], [2.0, 0.0, 0.0]])
+>>> evaluate_points(Geometry({COPPER: sphere(1.0)}), points)
+array([1, 0], dtype=uint8)
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, Optional
+
+import numpy as np
+
+from warpdrive.material.material import Material
+from warpdrive.sdf.bounds import bounding_box
+from warpdrive.sdf.graph import Union, as_node
+from warpdrive.sdf.points import DEFAULT_POINT_BATCH, _as_points
+from warpdrive.sdf.points import evaluate_points as evaluate_sdf_points
+from warpdrive.sdf.points import point_batches
+from warpdrive.sdf.sampling import _kernel, _map, _resolve_workers
+from warpdrive.utils.instrumentation import span
+
+from .geometry import Geometry
+from .voxelize import _MAX_SOLIDS, _paint_order
+
+__all__ = ["evaluate_points"]
+
+
+def evaluate_points(
+    target,
+    points,
+    *,
+    priority: Optional[Mapping[Material, int]] = None,
+    distances: bool = False,
+    batch: int = DEFAULT_POINT_BATCH,
+    workers: Optional[int] = 1,
+    dtype=None,
+):
+    """Material ids of a `Geometry`, or distances of an SDF, at *points*.
+
+    Parameters
+    ----------
+    target
+        `Geometry`, or an SDF expression / `~warpdrive.sdf.node.SDFNode`.
+    points
+        ``(N, 3)`` array of positions.
+    priority
+        Optional per-material priority; higher values win overlaps.
+    distances
+        For a `Geometry`, also return the signed distance to the union of
+        all solids.
+    batch, workers, dtype
+        As in `warpdrive.sdf.points.evaluate_points`.
+
+    Returns
+    -------
+    numpy.ndarray or tuple
+        For an SDF, the ``(N,)`` distances.  For a `Geometry`, ``uint8`` ids
+        indexing ``(background, *geometry.solids)`` as in
+        `~warpdrive.geometry.voxelize.Voxelization.materials`, so 0 is the
+        background; with *distances*, the tuple ``(ids, distances)``.
+    """
+
+    if not isinstance(target, Geometry):
+        return evaluate_sdf_points(
+            target, points, batch=batch, workers=workers, dtype=dtype
+        )
+
+    points = _as_points(points)
+    solids = list(target.solids.items())
+    if len(solids) > _MAX_SOLIDS:
+        raise ValueError(
+            f"At most {_MAX_SOLIDS} solids fit uint8 ids, got {len(solids)}"
+        )
+    if dtype is None:
+        dtype = points.dtype if np.issubdtype(points.dtype, np.floating) else np.float64
+
+    kernels = [_kernel(expr) for _, expr in solids]
+    paint = _paint_order([m for m, _ in solids], priority)
+    order, starts, boxes = point_batches(points, batch)
+    ends = np.append(starts[1:], len(points))
+
+    # (n_solids, n_batches): batch box overlaps the solid's bounding box
+    overlap = np.ones((len(solids), len(starts)), dtype=bool)
+    for n, (_, expr) in enumerate(solids):
+        bbox = bounding_box(expr)
+        if bbox is not None:
+            for axis, (lo, hi) in enumerate(bbox):
+                overlap[n] &= (boxes[:, axis, 0] <= hi) & (boxes[:, axis, 1] >= lo)
+
+    coords = [
+        np.ascontiguousarray(points[order, axis], dtype=dtype) for axis in range(3)
+    ]
+    sorted_ids = np.zeros(len(points), dtype=np.uint8)
+
+    def paint_batch(b: int) -> None:
+        s = slice(starts[b], ends[b])
+        part = [c[s] for c in coords]
+        block = sorted_ids[s]
+        for n in paint:
+            if overlap[n, b]:
+                block[kernels[n](*part) <= 0.0] = n + 1
+
+    with span("evaluate", points=len(points), batches=len(starts), solids=len(solids)):
+        _map(paint_batch, range(len(starts)), _resolve_workers(workers))
+    ids = np.empty_like(sorted_ids)
+    ids[order] = sorted_ids
+    if not distances:
+        return ids
+
+    exprs = [expr for _, expr in solids]
+    if not exprs:
+        raise ValueError("No solids defined in geometry.")
+    union = Union(*map(as_node, exprs)) if len(exprs) > 1 else exprs[0]
+    return ids, evaluate_sdf_points(
+        union, points, batch=batch, workers=workers, dtype=dtype
+    )
@@ -0,0 +1,82 @@
+"""WarpX parser strings for the material parameters of a `Geometry`.
+
+Each parameter becomes one nested ``if(d<=0,value,...)`` expression over the
+solids' SDFs (exported with `warpdrive.sdf.warpx.to_warpx`), highest
+priority outermost, so the solver resolves overlaps exactly like
+`warpdrive.geometry.voxelize.voxelize`.  The strings are meant for inputs
+such as ``macroscopic.epsilon_function(x,y,z)`` and
+``macroscopic.sigma_function(x,y,z)``.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Mapping, Optional
+
+import sympy as sp
+
+from warpdrive.material.material import VACUUM, Material
+from warpdrive.sdf.warpx import WarpXExpression, to_warpx
+
+from .voxelize import PROPERTIES, _paint_order
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .geometry import Geometry
+
+__all__ = ["material_functions"]
+
+
+def material_functions(
+    geometry: "Geometry",
+    *,
+    priority: Optional[Mapping[Material, int]] = None,
+    background: Material = VACUUM,
+) -> Dict[str, WarpXExpression]:
+    """Return one WarpX parser string per `Material` property.
+
+    Args:
+        geometry: Solids and their materials.
+        priority: Optional per-material priority; higher values win overlaps.
+        background: Material outside every solid.
+
+    Returns:
+        Mapping from property name (see `warpdrive.geometry.voxelize.PROPERTIES`)
+        to its parser string.  Solids are exported once per string, each with
+        its own local-variable prefix.
+    """
+
+    solids = list(geometry.solids.items())
+    materials = [m for m, _ in solids]
+    order = _paint_order(materials, priority)
+    sdfs = {n: to_warpx(solids[n][1], prefix=f"s{n}t") for n in order}
+
+    functions = {}
+    for name in PROPERTIES:
+        default = sp.sympify(getattr(background, name))
+        values = [sp.sympify(getattr(m, name)) for m in materials]
+        if all(v == default for v in values):
+            functions[name] = to_warpx(default)
+            continue
+
+        parts = [to_warpx(default, prefix="bt")]
+        text = _split(parts[0])[1]
+        n_tests = 0
+        for n in order:
+            sdf, value = sdfs[n], to_warpx(values[n], prefix=f"v{n}t")
+            if value.text == text:
+                # both branches agree, the solid does not change this parameter
+                continue
+            text = f"if({_split(sdf)[1]}<=0,{_split(value)[1]},{text})"
+            parts += [sdf, value]
+            n_tests += 1
+        functions[name] = WarpXExpression(
+            "".join(_split(p)[0] for p in parts) + text,
+            sum(p.n_ops for p in parts) + 2 * n_tests,
+            sum(p.n_locals for p in parts),
+        )
+    return functions
+
+
+def _split(expression: WarpXExpression):
+    """``(local definitions, final expression)`` of a parser string."""
+    head, _, tail = expression.text.rpartition(";")
+    return head + ";" if head else "", tail
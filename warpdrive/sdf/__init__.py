@@ -3,38 +3,144 @@ Signed Distance Function (SDF) utilities for 3-D geometry.
 
 This subpackage builds symbolic SDFs using SymPy and offers
 numeric evaluation helpers.
+
+Every public name is imported on first access (module ``__getattr__``), so
+``import warpdrive.sdf`` itself loads neither NumPy nor SymPy and the
+plotting helper only pulls in matplotlib when used.
 """
-from .sphere import sphere
-from .cylinder import cylinder
-from .box import box
-from .round_box import round_box
-from .box_frame import box_frame
-from .union import union
-from .subtraction import subtraction
-from .intersection import intersection
-from .xor import xor
-from .translate import translate
-from .rotate import rotate
-from .difference import difference
-# Optional plotting helper (slow import)
-from .plotting import plot_sdf
-from .symbols import x, y, z
-
-__all__ = [
-    "sphere",
-    "cylinder",
-    "box",
-    "round_box",
-    "box_frame",
-    "union",
-    "subtraction",
-    "intersection",
-    "xor",
-    "translate",
-    "rotate",
-    "difference",
-    "plot_sdf",
-    "x",
-    "y",
-    "z",
-] 
\ No newline at end of file
+
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING
+
+# public name -> submodule defining it
+_EXPORTS = {
+    "sphere": "sphere",
+    "cylinder": "cylinder",
+    "box": "box",
+    "round_box": "round_box",
+    "box_frame": "box_frame",
+    "union": "union",
+    "subtraction": "subtraction",
+    "intersection": "intersection",
+    "xor": "xor",
+    "translate": "translate",
+    "rotate": "rotate",
+    "difference": "difference",
+    "compile_sdf": "compiler",
+    "sample_grid": "sampling",
+    "sample_fields": "sampling",
+    "sample_gradient": "sampling",
+    "validate_precision": "sampling",
+    "evaluate_points": "points",
+    "mirror_symmetry": "symmetry",
+    "declare_symmetry": "symmetry",
+    "interval_bounds": "interval",
+    "box_sign": "interval",
+    "to_warpx": "warpx",
+    "eb_implicit_function": "warpx",
+    "SDFNode": "graph",
+    "Sphere": "graph",
+    "Box": "graph",
+    "RoundBox": "graph",
+    "BoxFrame": "graph",
+    "Cylinder": "graph",
+    "Expression": "graph",
+    "Affine": "graph",
+    "Translate": "graph",
+    "Rotate": "graph",
+    "Union": "graph",
+    "Intersection": "graph",
+    "Subtraction": "graph",
+    "Xor": "graph",
+    "as_node": "graph",
+    "from_sympy": "graph",
+    "plot_sdf": "plotting",
+    "x": "symbols",
+    "y": "symbols",
+    "z": "symbols",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .box import box  # noqa: F401
+    from .box_frame import box_frame  # noqa: F401
+    from .compiler import compile_sdf  # noqa: F401
+    from .cylinder import cylinder  # noqa: F401
+    from .difference import difference  # noqa: F401
+    from .graph import (  # noqa: F401
+        Affine,
+        Box,
+        BoxFrame,
+        Cylinder,
+        Expression,
+        Intersection,
+        Rotate,
+        RoundBox,
+        SDFNode,
+        Sphere,
+        Subtraction,
+        Translate,
+        Union,
+        Xor,
+        as_node,
+        from_sympy,
+    )
+    from .intersection import intersection  # noqa: F401
+    from .interval import box_sign, interval_bounds  # noqa: F401
+    from .plotting import plot_sdf  # noqa: F401
+    from .points import evaluate_points  # noqa: F401
+    from .rotate import rotate  # noqa: F401
+    from .round_box import round_box  # noqa: F401
+    from .sampling import (  # noqa: F401
+        sample_fields,
+        sample_gradient,
+        sample_grid,
+        validate_precision,
+    )
+    from .sphere import sphere  # noqa: F401
+    from .subtraction import subtraction  # noqa: F401
+    from .symbols import x, y, z  # noqa: F401
+    from .symmetry import declare_symmetry, mirror_symmetry  # noqa: F401
+    from .translate import translate  # noqa: F401
+    from .union import union  # noqa: F401
+    from .warpx import eb_implicit_function, to_warpx  # noqa: F401
+    from .xor import xor  # noqa: F401
+
+
+def __getattr__(name: str):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _LazyModule(types.ModuleType):
+    """Keeps functions from being shadowed by their submodules.
+
+    Importing ``warpdrive.sdf.union`` binds the submodule as the package
+    attribute ``union``, which the eager ``from .union import union`` used
+    to overwrite again.  Here that binding is dropped instead, so the name
+    keeps resolving to the function.
+    """
+
+    def __setattr__(self, name: str, value) -> None:
+        if (
+            isinstance(value, types.ModuleType)
+            and name in _EXPORTS
+            and value.__name__ == f"{self.__name__}.{name}"
+        ):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
@@ -0,0 +1,231 @@
+"""Axis-aligned bounding boxes of SDF solids.
+
+SymPy expressions cannot carry extra attributes, so bounds live in a side
+table keyed on the expression itself (SymPy hashes and compares expressions
+structurally, so a rebuilt but identical expression finds the same entry).
+Every primitive registers its analytic box, and `translate`, `rotate`,
+`union`, `intersection`, `subtraction` and `xor` derive the box of their
+result from their operands.  `bounding_box` then gives a tight enclosure of
+``{expr <= 0}`` for free, which the meshing and plotting helpers use when no
+*bbox* is given.
+
+Boxes are ``((xmin, xmax), (ymin, ymax), (zmin, zmax))`` and may contain
+infinite entries, e.g. for an infinite cylinder.
+
+The table is bounded, so an expression that has not been looked up for a
+long time may lose its entry.  ``bounding_box(expr, derive=True)``, as used
+by `sampling_bbox` and the meshing and plotting helpers, then derives a box
+with interval arithmetic instead (see `warpdrive.sdf.interval`).
+
+>>> from warpdrive.sdf import sphere, translate
+>>> bounding_box(translate(sphere(1.0), (2.0, 0.0, 0.0)))
+((1.0, 3.0), (-1.0, 1.0), (-1.0, 1.0))
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import sympy as sp
+
+from .interval import interval_bounds
+from .node import SDFNode
+
+__all__ = [
+    "bounding_box",
+    "hull_bounds",
+    "intersect_bounds",
+    "padded_bbox",
+    "register_bounds",
+    "sampling_bbox",
+    "transform_bounds",
+]
+
+
+Bbox = Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]]
+
+# Oldest entries are dropped beyond this size to keep long sweeps bounded.
+_MAX_ENTRIES = 1 << 16
+
+# Half-widths 2**k of the cubes tried as enclosures when deriving a box.
+_DERIVE_SCALES = 2.0 ** np.arange(-32, 64)
+# Bisection steps per face when tightening a derived box.
+_DERIVE_STEPS = 48
+
+_registry: OrderedDict[sp.Basic, Bbox] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _as_bbox(bbox) -> Bbox:
+    bounds = tuple((float(lo), float(hi)) for lo, hi in bbox)
+    return bounds  # type: ignore[return-value]
+
+
+def intersect_bounds(*bboxes: Optional[Bbox]) -> Optional[Bbox]:
+    """Intersection of the known boxes (``None`` entries are ignored)."""
+    known = [b for b in bboxes if b is not None]
+    if not known:
+        return None
+    return tuple(
+        (max(b[a][0] for b in known), min(b[a][1] for b in known)) for a in range(3)
+    )  # type: ignore[return-value]
+
+
+def hull_bounds(*bboxes: Optional[Bbox]) -> Optional[Bbox]:
+    """Smallest box containing all *bboxes*; ``None`` if any is unknown."""
+    if not bboxes or any(b is None for b in bboxes):
+        return None
+    known = [b for b in bboxes if b is not None]
+    return tuple(
+        (min(b[a][0] for b in known), max(b[a][1] for b in known)) for a in range(3)
+    )  # type: ignore[return-value]
+
+
+def transform_bounds(
+    bbox: Optional[Bbox], matrix=None, offset=(0.0, 0.0, 0.0)
+) -> Optional[Bbox]:
+    """Box enclosing ``matrix @ p + offset`` for every ``p`` in *bbox*."""
+    if bbox is None:
+        return None
+    lo = np.array([b[0] for b in bbox])
+    hi = np.array([b[1] for b in bbox])
+    finite = np.isfinite(lo) & np.isfinite(hi)
+    center = np.where(finite, (lo + hi) / 2, 0.0)
+    half = np.where(finite, (hi - lo) / 2, np.inf)
+    if matrix is not None:
+        m = np.asarray(matrix, dtype=float)
+        center = m @ center
+        # |m| @ half, without inf * 0 for axes the matrix does not mix in
+        half = np.where(m != 0.0, np.abs(m) * half[None, :], 0.0).sum(axis=1)
+    center = center + np.asarray(offset, dtype=float)
+    bounds = tuple((float(c - h), float(c + h)) for c, h in zip(center, half))
+    return bounds  # type: ignore[return-value]
+
+
+def register_bounds(expr: sp.Expr, bbox: Optional[Bbox]) -> sp.Expr:
+    """Record that ``{expr <= 0}`` lies inside *bbox* and return *expr*.
+
+    Registering a second box for the same expression keeps the intersection
+    of both, since each is a valid enclosure on its own.
+    """
+    if bbox is None:
+        return expr
+    bbox = _as_bbox(bbox)
+    with _lock:
+        previous = _registry.pop(expr, None)
+        _registry[expr] = intersect_bounds(previous, bbox)  # type: ignore[assignment]
+        while len(_registry) > _MAX_ENTRIES:
+            _registry.popitem(last=False)
+    return expr
+
+
+def bounding_box(expr: sp.Expr, *, derive: bool = False) -> Optional[Bbox]:
+    """Return the registered box of ``{expr <= 0}``, or ``None`` if unknown.
+
+    With *derive*, a missing box is derived with `_derive_bounds` and
+    registered.  This is much slower than a lookup and only meant for
+    callers that would otherwise have to give up.
+    """
+    if isinstance(expr, SDFNode):
+        return expr.bounds
+    with _lock:
+        bbox = _registry.get(expr)
+        if bbox is not None:
+            _registry.move_to_end(expr)
+    if bbox is None and derive:
+        bbox = _derive_bounds(expr)
+        register_bounds(expr, bbox)
+    return bbox
+
+
+def _derive_bounds(expr: sp.Expr) -> Optional[Bbox]:
+    """Box of ``{expr <= 0}`` proven with interval arithmetic, if possible.
+
+    The solid lies in the cube ``[-L, L]**3`` if *expr* is provably positive
+    on the six half-spaces beyond its faces.  Each face is then moved inwards
+    by bisection as long as the slab it sweeps stays provably positive.
+    Rotated solids mix unbounded coordinates and usually cannot be enclosed
+    this way; ``None`` is returned then.
+    """
+    expr = sp.sympify(expr)
+
+    def positive(lo, hi):
+        # huge and infinite bounds overflow harmlessly to +-inf or nan
+        with np.errstate(over="ignore", invalid="ignore"):
+            d_lo, _ = interval_bounds(expr, tuple(zip(lo, hi)))
+        return np.asarray(d_lo) > 0.0
+
+    n = len(_DERIVE_SCALES)
+    # (axis, face, scale): face 2 * a is x_a >= L, face 2 * a + 1 is x_a <= -L
+    lo = np.full((3, 6, n), -np.inf)
+    hi = np.full((3, 6, n), np.inf)
+    for a in range(3):
+        lo[a, 2 * a] = _DERIVE_SCALES
+        hi[a, 2 * a + 1] = -_DERIVE_SCALES
+    enclosed = np.all(positive(lo, hi), axis=0)
+    if not enclosed.any():
+        return None
+    half = float(_DERIVE_SCALES[np.argmax(enclosed)])
+
+    # face f keeps the slab between its position t and the cube face proven
+    # positive; t = half always is, since that slab is the empty face itself
+    proven = np.full(6, half)
+    unproven = np.full(6, -half)
+    lo = np.full((3, 6), -half)
+    hi = np.full((3, 6), half)
+    axes = np.arange(3)
+    for _ in range(_DERIVE_STEPS):
+        t = 0.5 * (proven + unproven)
+        lo[axes, 2 * axes] = t[0::2]
+        hi[axes, 2 * axes + 1] = -t[1::2]
+        inside = positive(lo, hi)
+        proven = np.where(inside, t, proven)
+        unproven = np.where(inside, unproven, t)
+    if np.any(proven[0::2] < -proven[1::2]):
+        return None  # provably empty
+    return _as_bbox(zip(-proven[1::2], proven[0::2]))
+
+
+def padded_bbox(bbox: Bbox, resolution: int | Iterable[int], cells: int = 2) -> Bbox:
+    """Grow *bbox* so that *cells* grid spacings separate it from the border.
+
+    The margin is solved for the spacing of the *padded* grid with the given
+    number of samples, so the surface never touches the outermost samples
+    and marching cubes produces closed meshes.
+    """
+    shape = (
+        [int(resolution)] * 3
+        if isinstance(resolution, (int, np.integer))
+        else list(resolution)
+    )
+    extents = [hi - lo for lo, hi in bbox]
+    if not all(np.isfinite(extents)):
+        raise ValueError(
+            f"Cannot sample unbounded box {bbox}; pass an explicit `bbox`."
+        )
+    fallback = max(max(extents), 1e-12)
+    padded = []
+    for (lo, hi), n in zip(bbox, shape):
+        if n - 1 <= 2 * cells:
+            raise ValueError(f"Resolution {n} too small for a {cells}-cell margin.")
+        extent = hi - lo if hi > lo else fallback
+        margin = cells * extent / (n - 1 - 2 * cells)
+        center = (lo + hi) / 2
+        half = extent / 2 + margin
+        padded.append((center - half, center + half))
+    return tuple(padded)  # type: ignore[return-value]
+
+
+def sampling_bbox(
+    expr: sp.Expr, resolution: int | Iterable[int], cells: int = 2
+) -> Bbox:
+    """Padded `bounding_box` of *expr*, ready to use as a sampling domain."""
+    bbox = bounding_box(expr, derive=True)
+    if bbox is None:
+        raise ValueError(
+            "No bounds are known for this expression; pass an explicit `bbox`."
+        )
+    return padded_bbox(bbox, resolution, cells)
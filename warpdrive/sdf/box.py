@@ -1,4 +1,4 @@
-"""Axis-aligned box signed-distance expression.
+r"""Axis-aligned box signed-distance expression.
 
 Given half-extents *b = (hx, hy, hz)* the distance formula follows
 Inigo Quilez’ reference implementation:
@@ -15,6 +15,7 @@ from __future__ import annotations
 
 import sympy as sp
 
+from .bounds import register_bounds
 from .symbols import x, y, z
 
 __all__ = ["box"]
@@ -39,4 +40,4 @@ def box(half_extents: tuple[float, float, float]):
 
     outside = sp.sqrt(sp.Max(qx, 0) ** 2 + sp.Max(qy, 0) ** 2 + sp.Max(qz, 0) ** 2)
     inside = sp.Min(sp.Max(qx, sp.Max(qy, qz)), 0)
-    return outside + inside 
\ No newline at end of file
+    return register_bounds(outside + inside, ((-hx, hx), (-hy, hy), (-hz, hz)))
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import sympy as sp
 
+from .bounds import register_bounds
 from .symbols import x, y, z
 
 __all__ = ["box_frame"]
@@ -40,11 +41,13 @@ def box_frame(half_extents: tuple[float, float, float], thickness: float):
 
     # Helper to build distance for a given orientation
     def d(px_, py_, pz_, qx_, qy_, qz_):
-        outside_vec = sp.Matrix([
-            sp.Max(px_, 0),
-            sp.Max(py_, 0),
-            sp.Max(pz_, 0),
-        ])
+        outside_vec = sp.Matrix(
+            [
+                sp.Max(px_, 0),
+                sp.Max(py_, 0),
+                sp.Max(pz_, 0),
+            ]
+        )
         outside = sp.sqrt(outside_vec.dot(outside_vec))
         inside = sp.Min(sp.Max(px_, sp.Max(py_, pz_)), 0)
         return outside + inside
@@ -53,4 +56,6 @@ def box_frame(half_extents: tuple[float, float, float], thickness: float):
     d2 = d(qx, py, qz, None, None, None)
     d3 = d(qx, qy, pz, None, None, None)
 
-    return sp.Min(d1, sp.Min(d2, d3)) 
\ No newline at end of file
+    return register_bounds(
+        sp.Min(d1, sp.Min(d2, d3)), ((-hx, hx), (-hy, hy), (-hz, hz))
+    )
@@ -0,0 +1,260 @@
+"""Process-wide cache of compiled SDF kernels.
+
+Compiling a large composed expression is far more expensive than evaluating
+it on a modest grid, and `sdf_to_mesh`, `plot_sdf` and `Geometry.plot` tend
+to see the same expressions over and over.  `KernelCache` keeps compiled
+kernels in an in-memory LRU keyed on the expression itself (SymPy hashes and
+compares expressions structurally) and can optionally persist the generated
+kernels to a directory keyed on `structural_hash`, so notebook re-runs and
+parameter sweeps in fresh processes skip lowering and code generation.
+
+The default cache used by `compile_sdf` is configured with
+`configure_kernel_cache`; the on-disk tier can also be enabled through the
+``WARPDRIVE_KERNEL_CACHE_DIR`` environment variable.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import sympy as sp
+
+from .compiler import CompiledSDF, Instruction, _build
+
+__all__ = [
+    "CacheStats",
+    "KernelCache",
+    "configure_kernel_cache",
+    "get_kernel_cache",
+    "structural_hash",
+]
+
+# Bump whenever the generated kernel format changes to invalidate disk entries.
+_FORMAT_VERSION = "2"
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_MAX_DISK_BYTES = 256 * 1024**2
+
+
+def structural_hash(expr: sp.Basic) -> str:
+    """Return a process-independent SHA-256 digest of *expr*'s structure."""
+    return hashlib.sha256(sp.srepr(expr).encode()).hexdigest()
+
+
+def _source_digest(source: str) -> str:
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of `KernelCache` counters."""
+
+    hits: int
+    misses: int
+    disk_hits: int
+    disk_writes: int
+    evictions: int
+    currsize: int
+    maxsize: Optional[int]
+
+
+class KernelCache:
+    """LRU cache of `CompiledSDF` kernels with an optional on-disk tier.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of kernels kept in memory.  ``None`` means unbounded,
+        ``0`` disables the in-memory tier.
+    directory
+        Directory for persisted kernels.  ``None`` disables the disk tier.
+    max_disk_bytes
+        Size limit of *directory*; least recently used files are removed
+        once it is exceeded.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = DEFAULT_MAXSIZE,
+        directory: Union[str, os.PathLike, None] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory is not None else None
+        self.max_disk_bytes = int(max_disk_bytes)
+        self._entries: OrderedDict[object, CompiledSDF] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._disk_hits = self._disk_writes = (
+            self._evictions
+        ) = 0
+
+    # -- public API ---------------------------------------------------------
+
+    def get(self, expr: sp.Expr, *, gradient: bool = False) -> CompiledSDF:
+        """Return the compiled kernel for *expr*, compiling on a miss."""
+
+        key = (expr, "gradient") if gradient else expr
+        with self._lock:
+            kernel = self._entries.get(key)
+            if kernel is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return kernel
+            self._misses += 1
+
+        digest = None
+        if self.directory is not None:
+            digest = structural_hash(expr)
+            if gradient:
+                digest = hashlib.sha256(f"{digest}:gradient".encode()).hexdigest()
+        kernel = self._load(expr, digest) if digest is not None else None
+        if kernel is None:
+            kernel = _build(expr, gradient)
+            if digest is not None:
+                self._store(kernel, digest)
+
+        with self._lock:
+            if self.maxsize != 0:
+                self._entries[key] = kernel
+                self._entries.move_to_end(key)
+                while self.maxsize is not None and len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return kernel
+
+    def clear(self, *, disk: bool = False) -> None:
+        """Drop in-memory entries (and persisted kernels if *disk*)."""
+        with self._lock:
+            self._entries.clear()
+        if disk and self.directory is not None and self.directory.is_dir():
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> CacheStats:
+        """Return current hit/miss counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                disk_hits=self._disk_hits,
+                disk_writes=self._disk_writes,
+                evictions=self._evictions,
+                currsize=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- disk tier ----------------------------------------------------------
+
+    def _path(self, digest: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{digest}.json"
+
+    def _load(self, expr: sp.Expr, digest: str) -> Optional[CompiledSDF]:
+        path = self._path(digest)
+        try:
+            payload = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != _FORMAT_VERSION:
+            return None
+        # Only run source that was stored for this very expression and has not
+        # been edited since; anything else is recompiled.
+        source = payload.get("source")
+        if (
+            payload.get("digest") != digest
+            or not isinstance(source, str)
+            or payload.get("source_digest") != _source_digest(source)
+        ):
+            return None
+        try:
+            instructions = tuple(
+                Instruction(target, op, tuple(args), frozenset(deps))
+                for target, op, args, deps in payload["instructions"]
+            )
+            result = payload["result"]
+            if isinstance(result, list):  # gradient kernel
+                result = tuple(result)
+            kernel = CompiledSDF(
+                expr, source, instructions, result, payload["peak_buffers"]
+            )
+        except (KeyError, TypeError, ValueError, SyntaxError):
+            return None
+        os.utime(path)  # mark as recently used for eviction
+        with self._lock:
+            self._disk_hits += 1
+        return kernel
+
+    def _store(self, kernel: CompiledSDF, digest: str) -> None:
+        if kernel.has_fallbacks:
+            # lambdified fallbacks cannot be serialised; keep them in memory only
+            return
+        assert self.directory is not None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": _FORMAT_VERSION,
+            "digest": digest,
+            "source": kernel.source,
+            "source_digest": _source_digest(kernel.source),
+            "instructions": [
+                [i.target, i.op, list(i.args), sorted(i.deps)]
+                for i in kernel.instructions
+            ],
+            "result": kernel.result,
+            "peak_buffers": kernel.peak_buffers,
+        }
+        path = self._path(digest)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(payload))
+        os.replace(tmp, path)
+        with self._lock:
+            self._disk_writes += 1
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        assert self.directory is not None
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+_default_cache = KernelCache(
+    directory=os.environ.get("WARPDRIVE_KERNEL_CACHE_DIR") or None
+)
+
+
+def get_kernel_cache() -> KernelCache:
+    """Return the process-wide cache used by `compile_sdf`."""
+    return _default_cache
+
+
+def configure_kernel_cache(
+    maxsize: Optional[int] = DEFAULT_MAXSIZE,
+    directory: Union[str, os.PathLike, None] = None,
+    max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+) -> KernelCache:
+    """Replace the process-wide kernel cache and return the new instance."""
+    global _default_cache
+    _default_cache = KernelCache(
+        maxsize=maxsize, directory=directory, max_disk_bytes=max_disk_bytes
+    )
+    return _default_cache
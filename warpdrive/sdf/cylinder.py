@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import sympy as sp
 
+from .bounds import register_bounds
 from .symbols import x, y, z
 
 __all__ = ["cylinder"]
@@ -23,14 +24,16 @@ def cylinder(
         Total height. If *None*, produce an infinite cylinder.
     """
 
-    expr_radial = sp.sqrt(x**2 + y**2) - float(radius)
+    r = float(radius)
+    expr_radial = sp.sqrt(x**2 + y**2) - r
 
     if height is None:
         expr = expr_radial
+        half_h = float("inf")
     else:
         half_h = float(height) / 2.0
         dz = sp.Abs(z) - half_h
         outside = sp.sqrt(sp.Max(expr_radial, 0) ** 2 + sp.Max(dz, 0) ** 2)
         expr = outside + sp.Min(sp.Max(expr_radial, dz), 0)
 
-    return expr
\ No newline at end of file
+    return register_bounds(expr, ((-r, r), (-r, r), (-half_h, half_h)))
@@ -0,0 +1,237 @@
+"""Content-addressed on-disk cache of sampled fields.
+
+Parameter sweeps and repeated jobs sample the same geometry on the same grid
+over and over.  `FieldCache` stores the resulting arrays as ``.npy`` files
+named by a SHA-256 digest of everything that determines them: what was
+computed (*kind*), the structural hash of the expression, the bounding box,
+the grid shape and the dtype.  Hits are opened with
+``np.load(mmap_mode="r")``, so they cost nothing until touched (and are
+read-only).  Once the directory outgrows *max_bytes*, the least recently
+used files are removed.
+
+The cache is off by default.  Enable it with `configure_field_cache` or the
+``WARPDRIVE_FIELD_CACHE_DIR`` environment variable; `sdf_to_mesh`,
+`plot_sdf`, `Geometry.plot` and `Geometry.voxelize` then use it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+import sympy as sp
+
+from .cache import structural_hash
+from .node import SDFNode
+
+__all__ = [
+    "FieldCache",
+    "FieldCacheStats",
+    "configure_field_cache",
+    "expression_hash",
+    "get_field_cache",
+]
+
+# Bump whenever the meaning of stored arrays changes to invalidate old entries.
+_FORMAT_VERSION = "1"
+
+DEFAULT_MAX_FIELD_BYTES = 4 * 1024**3
+
+
+def expression_hash(expr) -> str:
+    """Process-independent digest of a SymPy expression or `SDFNode`."""
+    if isinstance(expr, SDFNode):
+        return _node_hash(expr)
+    return structural_hash(sp.sympify(expr))
+
+
+def _node_hash(root: SDFNode) -> str:
+    """Digest of a node graph from its node types and exact parameters.
+
+    ``repr`` is not enough: `Expression` leaves print SymPy ``str``, which
+    rounds floats.  Shared sub-graphs are hashed once, bottom-up.
+    """
+    digests: Dict[SDFNode, str] = {}
+    stack = [root]
+    while stack:
+        node = stack[-1]
+        if node in digests:
+            stack.pop()
+            continue
+        pending = [c for c in _param_nodes(node._params) if c not in digests]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        text = f"node:{type(node).__name__}{_encode(node._params, digests)}"
+        digests[node] = hashlib.sha256(text.encode()).hexdigest()
+    return digests[root]
+
+
+def _param_nodes(params) -> Iterable[SDFNode]:
+    for p in params:
+        if isinstance(p, SDFNode):
+            yield p
+        elif isinstance(p, tuple):
+            yield from _param_nodes(p)
+
+
+def _encode(param, digests: Dict[SDFNode, str]) -> str:
+    if isinstance(param, SDFNode):
+        return digests[param]
+    if isinstance(param, tuple):
+        return "(" + ",".join(_encode(p, digests) for p in param) + ")"
+    if isinstance(param, sp.Basic):
+        return sp.srepr(param)
+    return repr(param)  # floats repr exactly
+
+
+@dataclass(frozen=True)
+class FieldCacheStats:
+    """Snapshot of `FieldCache` counters."""
+
+    hits: int
+    misses: int
+    writes: int
+    evictions: int
+
+
+class FieldCache:
+    """Directory of ``.npy`` arrays keyed on what produced them.
+
+    Parameters
+    ----------
+    directory
+        Where the arrays are stored; created on first write.
+    max_bytes
+        Size limit of *directory*; least recently used files are removed
+        once it is exceeded.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        max_bytes: int = DEFAULT_MAX_FIELD_BYTES,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._writes = self._evictions = 0
+
+    @staticmethod
+    def key(
+        kind: str, expr_hash: str, bbox, shape: Iterable[int], dtype, *extra
+    ) -> str:
+        """Digest identifying one cached result."""
+        parts = [
+            _FORMAT_VERSION,
+            kind,
+            expr_hash,
+            repr(tuple((float(lo), float(hi)) for lo, hi in bbox)),
+            repr(tuple(int(n) for n in shape)),
+            np.dtype(dtype).str,
+            *map(repr, extra),
+        ]
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def load(
+        self, key: str, names: Sequence[str] = ("values",)
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """Memory-map the arrays stored under *key*, or ``None`` on a miss."""
+        arrays = {}
+        for name in names:
+            path = self._path(key, name)
+            try:
+                arrays[name] = np.load(path, mmap_mode="r")
+                os.utime(path)  # mark as recently used for eviction
+            except (OSError, ValueError):
+                with self._lock:
+                    self._misses += 1
+                return None
+        with self._lock:
+            self._hits += 1
+        return arrays
+
+    def store(self, key: str, arrays: Dict[str, np.ndarray]) -> None:
+        """Write *arrays* under *key* (atomically per file) and evict."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name, array in arrays.items():
+            path = self._path(key, name)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "wb") as fh:
+                np.save(fh, np.asarray(array), allow_pickle=False)
+            os.replace(tmp, path)
+        with self._lock:
+            self._writes += 1
+        self._evict()
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Dict[str, np.ndarray]],
+        names: Sequence[str] = ("values",),
+    ) -> Dict[str, np.ndarray]:
+        """Return the arrays under *key*, running *compute* on a miss."""
+        arrays = self.load(key, names)
+        if arrays is None:
+            arrays = compute()
+            self.store(key, arrays)
+        return arrays
+
+    def clear(self) -> None:
+        """Remove every cached array."""
+        if self.directory.is_dir():
+            for path in self.directory.glob("*.npy"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> FieldCacheStats:
+        """Return current hit/miss counters."""
+        with self._lock:
+            return FieldCacheStats(
+                self._hits, self._misses, self._writes, self._evictions
+            )
+
+    def _path(self, key: str, name: str) -> Path:
+        return self.directory / f"{key}.{name}.npy"
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.npy"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self._evictions += 1
+
+
+_default_cache: Optional[FieldCache] = None
+if os.environ.get("WARPDRIVE_FIELD_CACHE_DIR"):
+    _default_cache = FieldCache(os.environ["WARPDRIVE_FIELD_CACHE_DIR"])
+
+
+def get_field_cache() -> Optional[FieldCache]:
+    """Return the process-wide field cache, or ``None`` if disabled."""
+    return _default_cache
+
+
+def configure_field_cache(
+    directory: Union[str, os.PathLike, None],
+    max_bytes: int = DEFAULT_MAX_FIELD_BYTES,
+) -> Optional[FieldCache]:
+    """Replace the process-wide field cache; ``None`` disables it."""
+    global _default_cache
+    _default_cache = FieldCache(directory, max_bytes) if directory is not None else None
+    return _default_cache
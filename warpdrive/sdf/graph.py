@@ -0,0 +1,793 @@
+"""Lightweight native SDF node graph.
+
+Building geometry through SymPy pays for ``xreplace`` over the whole
+sub-tree at every `translate` and `rotate`, and for ``Max`` canonicalisation
+at every `intersection`; both grow super-linearly with the number of parts
+(`union` skips SymPy's ``Min`` canonicalisation, but still re-sorts all of
+its operands).  The nodes
+below are plain slotted objects instead: construction is a dictionary
+lookup (nodes are hash-consed, see `warpdrive.sdf.node.SDFNode`), evaluation
+goes straight to NumPy, and a SymPy expression is only built when
+`SDFNode.to_sympy` is called.
+
+Nodes work with the existing helpers: `union`, `intersection`,
+`subtraction`, `xor`, `difference`, `translate` and `rotate` return nodes
+when given one, and `sample_grid`, `sdf_to_mesh`, `interval_bounds` and
+`bounding_box` accept nodes wherever they accept expressions.
+
+>>> part = (Box((1.0, 1.0, 0.1)) - Cylinder(0.5)).translate((0.0, 0.0, 1.0))
+>>> float(part(0.75, 0.0, 1.0))
+-0.1
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import sympy as sp
+
+from .bounds import (
+    Bbox,
+    bounding_box,
+    hull_bounds,
+    intersect_bounds,
+    register_bounds,
+    transform_bounds,
+)
+from .compiler import compile_sdf
+from .interval import (
+    Interval,
+    iabs,
+    imaximum,
+    iminimum,
+    interval_bounds,
+    isqrt,
+    isquare,
+)
+from .node import SDFNode, as_node
+from .symbols import x as _x
+from .symbols import y as _y
+from .symbols import z as _z
+from .symmetry import mirror_symmetry
+
+__all__ = [
+    "Affine",
+    "Box",
+    "BoxFrame",
+    "Cylinder",
+    "Expression",
+    "Intersection",
+    "RoundBox",
+    "Rotate",
+    "SDFNode",
+    "Sphere",
+    "Subtraction",
+    "Translate",
+    "Union",
+    "Xor",
+    "as_node",
+    "from_sympy",
+]
+
+
+# The primitive formulas are written once against a tiny math namespace and
+# evaluated either on arrays or on intervals.
+_NP = SimpleNamespace(
+    abs=np.abs, sqrt=np.sqrt, square=np.square, maximum=np.maximum, minimum=np.minimum
+)
+_IV = SimpleNamespace(
+    abs=iabs,
+    sqrt=isqrt,
+    square=isquare,
+    maximum=lambda a, b: imaximum(Interval.of(a), Interval.of(b)),
+    minimum=lambda a, b: iminimum(Interval.of(a), Interval.of(b)),
+)
+
+
+_XYZ = (_x, _y, _z)
+
+Vec3 = Tuple[float, float, float]
+Symmetry = Tuple[bool, bool, bool]
+
+
+def _vec3(values: Iterable[float]) -> Vec3:
+    a, b, c = map(float, values)
+    return (a, b, c)
+
+
+def _centred_bounds(half_extents: Vec3) -> Bbox:
+    hx, hy, hz = half_extents
+    return ((-hx, hx), (-hy, hy), (-hz, hz))
+
+
+# `_formula` arguments are arrays or `Interval`s, depending on the namespace
+def _box_distance(m: SimpleNamespace, qx: Any, qy: Any, qz: Any) -> Any:
+    outside = m.sqrt(
+        m.square(m.maximum(qx, 0.0))
+        + m.square(m.maximum(qy, 0.0))
+        + m.square(m.maximum(qz, 0.0))
+    )
+    inside = m.minimum(m.maximum(qx, m.maximum(qy, qz)), 0.0)
+    return outside + inside
+
+
+class _Primitive(SDFNode):
+    """Leaf evaluated by `_formula` on arrays and intervals alike."""
+
+    __slots__ = ()
+
+    def _formula(self, m: SimpleNamespace, x: Any, y: Any, z: Any) -> Any:
+        raise NotImplementedError
+
+    def evaluate(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        result: np.ndarray = self._formula(_NP, x, y, z)
+        return result
+
+    def interval(self, x: Interval, y: Interval, z: Interval) -> Interval:
+        result: Interval = self._formula(_IV, x, y, z)
+        return result
+
+
+class Sphere(_Primitive):
+    """Sphere of *radius* around *center* (see `warpdrive.sdf.sphere`)."""
+
+    __slots__ = ("radius", "center")
+
+    radius: float
+    center: Vec3
+
+    def __new__(
+        cls, radius: float, center: Sequence[float] = (0.0, 0.0, 0.0)
+    ) -> Sphere:
+        radius, center = float(radius), _vec3(center)
+        return cls._intern((radius, center), radius=radius, center=center)
+
+    def _formula(self, m: SimpleNamespace, x: Any, y: Any, z: Any) -> Any:
+        cx, cy, cz = self.center
+        return (
+            m.sqrt(m.square(x - cx) + m.square(y - cy) + m.square(z - cz)) - self.radius
+        )
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        r = self.radius
+        cx, cy, cz = self.center
+        return ((cx - r, cx + r), (cy - r, cy + r), (cz - r, cz + r))
+
+    def _compute_symmetry(self) -> Symmetry:
+        cx, cy, cz = self.center
+        return (cx == 0.0, cy == 0.0, cz == 0.0)
+
+    def _to_sympy(self) -> sp.Expr:
+        from .sphere import sphere
+
+        return sphere(self.radius, self.center)
+
+
+class Box(_Primitive):
+    """Axis-aligned box with *half_extents* (see `warpdrive.sdf.box`)."""
+
+    __slots__ = ("half_extents",)
+
+    half_extents: Vec3
+
+    def __new__(cls, half_extents: Sequence[float]) -> Box:
+        half_extents = _vec3(half_extents)
+        return cls._intern((half_extents,), half_extents=half_extents)
+
+    def _formula(self, m: SimpleNamespace, x: Any, y: Any, z: Any) -> Any:
+        hx, hy, hz = self.half_extents
+        return _box_distance(m, m.abs(x) - hx, m.abs(y) - hy, m.abs(z) - hz)
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        return _centred_bounds(self.half_extents)
+
+    def _compute_symmetry(self) -> Symmetry:
+        return (True, True, True)
+
+    def _to_sympy(self) -> sp.Expr:
+        from .box import box
+
+        return box(self.half_extents)
+
+
+class RoundBox(_Primitive):
+    """Box with edges rounded by *radius* (see `warpdrive.sdf.round_box`)."""
+
+    __slots__ = ("half_extents", "radius")
+
+    half_extents: Vec3
+    radius: float
+
+    def __new__(cls, half_extents: Sequence[float], radius: float) -> RoundBox:
+        half_extents, radius = _vec3(half_extents), float(radius)
+        return cls._intern(
+            (half_extents, radius), half_extents=half_extents, radius=radius
+        )
+
+    def _formula(self, m: SimpleNamespace, x: Any, y: Any, z: Any) -> Any:
+        hx, hy, hz = self.half_extents
+        r = self.radius
+        return (
+            _box_distance(m, m.abs(x) - hx + r, m.abs(y) - hy + r, m.abs(z) - hz + r)
+            - r
+        )
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        return _centred_bounds(self.half_extents)
+
+    def _compute_symmetry(self) -> Symmetry:
+        return (True, True, True)
+
+    def _to_sympy(self) -> sp.Expr:
+        from .round_box import round_box
+
+        return round_box(self.half_extents, self.radius)
+
+
+class BoxFrame(_Primitive):
+    """Hollow box frame (see `warpdrive.sdf.box_frame`)."""
+
+    __slots__ = ("half_extents", "thickness")
+
+    half_extents: Vec3
+    thickness: float
+
+    def __new__(cls, half_extents: Sequence[float], thickness: float) -> BoxFrame:
+        half_extents, thickness = _vec3(half_extents), float(thickness)
+        return cls._intern(
+            (half_extents, thickness), half_extents=half_extents, thickness=thickness
+        )
+
+    def _formula(self, m: SimpleNamespace, x: Any, y: Any, z: Any) -> Any:
+        hx, hy, hz = self.half_extents
+        e = self.thickness
+        px, py, pz = m.abs(x) - hx, m.abs(y) - hy, m.abs(z) - hz
+        qx, qy, qz = m.abs(px + e) - e, m.abs(py + e) - e, m.abs(pz + e) - e
+        d1 = _box_distance(m, px, qy, qz)
+        d2 = _box_distance(m, qx, py, qz)
+        d3 = _box_distance(m, qx, qy, pz)
+        return m.minimum(d1, m.minimum(d2, d3))
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        return _centred_bounds(self.half_extents)
+
+    def _compute_symmetry(self) -> Symmetry:
+        return (True, True, True)
+
+    def _to_sympy(self) -> sp.Expr:
+        from .box_frame import box_frame
+
+        return box_frame(self.half_extents, self.thickness)
+
+
+class Cylinder(_Primitive):
+    """Z-aligned cylinder, infinite if *height* is None.
+
+    See `warpdrive.sdf.cylinder`.
+    """
+
+    __slots__ = ("radius", "height")
+
+    radius: float
+    height: Optional[float]
+
+    def __new__(cls, radius: float, height: Optional[float] = None) -> Cylinder:
+        radius = float(radius)
+        height = None if height is None else float(height)
+        return cls._intern((radius, height), radius=radius, height=height)
+
+    def _formula(self, m: SimpleNamespace, x: Any, y: Any, z: Any) -> Any:
+        radial = m.sqrt(m.square(x) + m.square(y)) - self.radius
+        if self.height is None:
+            return radial
+        dz = m.abs(z) - self.height / 2.0
+        outside = m.sqrt(
+            m.square(m.maximum(radial, 0.0)) + m.square(m.maximum(dz, 0.0))
+        )
+        return outside + m.minimum(m.maximum(radial, dz), 0.0)
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        r = self.radius
+        h = float("inf") if self.height is None else self.height / 2.0
+        return ((-r, r), (-r, r), (-h, h))
+
+    def _compute_symmetry(self) -> Symmetry:
+        return (True, True, True)
+
+    def _to_sympy(self) -> sp.Expr:
+        from .cylinder import cylinder
+
+        return cylinder(self.radius, self.height)
+
+
+class Expression(SDFNode):
+    """Leaf wrapping an arbitrary SymPy SDF, evaluated by its compiled kernel."""
+
+    __slots__ = ("expr",)
+
+    expr: sp.Expr
+
+    def __new__(cls, expr: object) -> Expression:
+        expr = sp.sympify(expr)
+        return cls._intern((expr,), expr=expr)
+
+    @property
+    def peak_buffers(self) -> int:
+        return compile_sdf(self.expr).peak_buffers
+
+    def evaluate(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        return compile_sdf(self.expr)(x, y, z)
+
+    def interval(self, x: Interval, y: Interval, z: Interval) -> Interval:
+        lo, hi = interval_bounds(self.expr, ((x.lo, x.hi), (y.lo, y.hi), (z.lo, z.hi)))
+        return Interval(lo, hi)
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        return bounding_box(self.expr)
+
+    def _compute_symmetry(self) -> Symmetry:
+        return mirror_symmetry(self.expr)
+
+    def _to_sympy(self) -> sp.Expr:
+        return self.expr
+
+
+# -- transforms -------------------------------------------------------------------
+
+
+# Entries this close to 0 or +-1 are snapped, so that e.g. ``cos(pi / 2)``
+# does not turn an axis-aligned rotation into a dense matrix.
+_SNAP_TOL = 1e-12
+
+
+def _snap(matrix: np.ndarray) -> np.ndarray:
+    m = np.where(np.abs(matrix) < _SNAP_TOL, 0.0, matrix)
+    return np.where(np.abs(np.abs(m) - 1.0) < _SNAP_TOL, np.sign(m), m)
+
+
+class Affine(SDFNode):
+    """*child* evaluated at ``matrix @ (x, y, z, 1)``.
+
+    *matrix* is the 3x4 map from world to child coordinates.  Stacked
+    transforms fold into a single node on construction, and rows are applied
+    term by term skipping zero entries, so a signed-permutation matrix (any
+    axis-aligned rotation) costs no arithmetic beyond negation and keeps
+    open-grid coordinate vectors one-dimensional.
+    """
+
+    __slots__ = ("child", "matrix", "_rows")
+
+    child: SDFNode
+    matrix: np.ndarray
+    # per output row: the nonzero ``(axis, coefficient)`` terms and the offset
+    _rows: Tuple[Tuple[Tuple[Tuple[int, float], ...], float], ...]
+
+    def __new__(  # type: ignore[misc]  # the child itself for the identity
+        cls, child: object, matrix: Any
+    ) -> SDFNode:
+        child = as_node(child)
+        matrix = _snap(np.asarray(matrix, dtype=float).reshape(3, 4))
+        if isinstance(child, Affine):
+            inner = child.matrix
+            matrix = _snap(
+                np.column_stack(
+                    (
+                        inner[:, :3] @ matrix[:, :3],
+                        inner[:, :3] @ matrix[:, 3] + inner[:, 3],
+                    )
+                )
+            )
+            child = child.child
+        if np.array_equal(matrix, np.eye(3, 4)):
+            return child
+        rows = tuple(
+            (
+                tuple((a, float(row[a])) for a in range(3) if row[a] != 0.0),
+                float(row[3]),
+            )
+            for row in matrix
+        )
+        key = tuple(map(tuple, matrix.tolist()))
+        return cls._intern((child, key), child=child, matrix=matrix, _rows=rows)
+
+    @property
+    def children(self) -> Tuple[SDFNode, ...]:
+        return (self.child,)
+
+    def _local(self, coords: Tuple[Any, Any, Any]) -> List[Any]:
+        local = []
+        for terms, const in self._rows:
+            value: Any = None
+            for axis, coef in terms:
+                term = (
+                    coords[axis]
+                    if coef == 1.0
+                    else -coords[axis] if coef == -1.0 else coef * coords[axis]
+                )
+                value = term if value is None else value + term
+            if value is None:
+                value = const
+            elif const != 0.0:
+                value = value + const
+            local.append(value)
+        return local
+
+    def evaluate(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        return self.child.evaluate(*self._local((x, y, z)))
+
+    def interval(self, x: Interval, y: Interval, z: Interval) -> Interval:
+        return self.child.interval(*(Interval.of(v) for v in self._local((x, y, z))))
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        inverse = np.linalg.inv(self.matrix[:, :3])
+        return transform_bounds(
+            self.child.bounds, matrix=inverse, offset=-inverse @ self.matrix[:, 3]
+        )
+
+    def _compute_symmetry(self) -> Symmetry:
+        # Mirroring world axis a mirrors child axis b if the map sends one to
+        # the other alone (a signed permutation on that pair) with no offset.
+        linear, offset = self.matrix[:, :3], self.matrix[:, 3]
+        child = self.child.symmetry
+        symmetry: List[bool] = []
+        for a in range(3):
+            rows = np.flatnonzero(linear[:, a])
+            b = int(rows[0]) if len(rows) == 1 else -1
+            symmetry.append(
+                bool(
+                    b >= 0
+                    and np.count_nonzero(linear[b]) == 1
+                    and offset[b] == 0.0
+                    and child[b]
+                )
+            )
+        sx, sy, sz = symmetry
+        return (sx, sy, sz)
+
+    def _to_sympy(self) -> sp.Expr:
+        local = []
+        for terms, const in self._rows:
+            value = sp.Float(const) if const else sp.Integer(0)
+            for axis, coef in terms:
+                value += (
+                    sp.Integer(int(coef)) if abs(coef) == 1.0 else sp.Float(coef)
+                ) * _XYZ[axis]
+            local.append(value)
+        expr = self.child.to_sympy().xreplace(dict(zip(_XYZ, local)))
+        return register_bounds(expr, self.bounds)
+
+
+def Translate(child: object, offset: Sequence[float]) -> SDFNode:
+    """*child* moved by *offset* (see `warpdrive.sdf.translate`)."""
+    ox, oy, oz = _vec3(offset)
+    return Affine(
+        child, [[1.0, 0.0, 0.0, -ox], [0.0, 1.0, 0.0, -oy], [0.0, 0.0, 1.0, -oz]]
+    )
+
+
+def Rotate(child: object, angles: Sequence[float]) -> SDFNode:
+    """*child* rotated by Euler *angles* (see `warpdrive.sdf.rotate`)."""
+    from .rotate import _rotation_matrix
+
+    # coordinates are mapped back by the inverse rotation R^T
+    rotation: Any = _rotation_matrix(*_vec3(angles))
+    inverse = np.array(rotation.T.tolist(), dtype=np.float64)
+    return Affine(child, np.column_stack((inverse, np.zeros(3))))
+
+
+# -- CSG operations ---------------------------------------------------------------
+
+
+def _all_symmetric(children: Sequence[SDFNode]) -> Symmetry:
+    """Mirror planes shared by every child, hence kept by any CSG operation."""
+    sx, sy, sz = (all(c.symmetry[a] for c in children) for a in range(3))
+    return (sx, sy, sz)
+
+
+def _flatten(cls: type, children: Iterable[object]) -> Tuple[SDFNode, ...]:
+    flat: List[SDFNode] = []
+    for child in map(as_node, children):
+        flat.extend(child.children if type(child) is cls else (child,))
+    # drop duplicates but keep first-seen order, so the result is deterministic
+    return tuple(dict.fromkeys(flat))
+
+
+# Unions with at least this many children evaluate open grids tile by tile,
+# culling children per tile (see `Union.evaluate`).
+INDEXED_UNION_MIN_CHILDREN = 8
+_UNION_TILE = 16
+
+
+def _open_grid_axes(
+    x: np.ndarray, y: np.ndarray, z: np.ndarray
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Return the 1-D axes if ``x, y, z`` are open-grid vectors, else None."""
+    shapes = np.shape(x), np.shape(y), np.shape(z)
+    if any(len(s) != 3 for s in shapes):
+        return None
+    if (
+        shapes[0][1:] != (1, 1)
+        or (shapes[1][0], shapes[1][2]) != (1, 1)
+        or shapes[2][:2] != (1, 1)
+    ):
+        return None
+    return x[:, 0, 0], y[0, :, 0], z[0, 0, :]
+
+
+def _tile_ranges(axis: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """First index, minimum and maximum of every tile along *axis*."""
+    starts = np.arange(0, axis.size, _UNION_TILE)
+    return starts, np.minimum.reduceat(axis, starts), np.maximum.reduceat(axis, starts)
+
+
+class Union(SDFNode):
+    """N-ary union ``min(d_1, ..., d_n)`` (see `warpdrive.sdf.union`).
+
+    On open grids (the coordinates `sample_grid` passes) a union of many
+    children is evaluated in tiles of ``16**3`` points.  Every child is first
+    bounded over all tiles at once with interval arithmetic; a child whose
+    lower bound exceeds the smallest upper bound in a tile cannot be the
+    minimum there and is skipped.  Each point then only pays for the few
+    children close to it instead of all of them.
+    """
+
+    __slots__ = ("_children",)
+
+    _children: Tuple[SDFNode, ...]
+
+    def __new__(  # type: ignore[misc]  # a single child is returned as is
+        cls, *children: object
+    ) -> SDFNode:
+        flat = _flatten(cls, children)
+        if len(flat) == 1:
+            return flat[0]
+        return cls._intern(flat, _children=flat)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return Union, self._children
+
+    @property
+    def children(self) -> Tuple[SDFNode, ...]:
+        return self._children
+
+    @property
+    def peak_buffers(self) -> int:
+        return 1 + max(c.peak_buffers for c in self._children)
+
+    def evaluate(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        if len(self._children) >= INDEXED_UNION_MIN_CHILDREN:
+            axes = _open_grid_axes(x, y, z)
+            if (
+                axes is not None
+                and axes[0].size * axes[1].size * axes[2].size > _UNION_TILE**3
+            ):
+                return self._evaluate_tiled(*axes)
+        result = self._children[0].evaluate(x, y, z)
+        for child in self._children[1:]:
+            result = np.minimum(result, child.evaluate(x, y, z))
+        return result
+
+    def _evaluate_tiled(
+        self, xs: np.ndarray, ys: np.ndarray, zs: np.ndarray
+    ) -> np.ndarray:
+        (sx, xlo, xhi), (sy, ylo, yhi), (sz, zlo, zhi) = (
+            _tile_ranges(xs),
+            _tile_ranges(ys),
+            _tile_ranges(zs),
+        )
+        ix = Interval(xlo[:, None, None], xhi[:, None, None])
+        iy = Interval(ylo[None, :, None], yhi[None, :, None])
+        iz = Interval(zlo[None, None, :], zhi[None, None, :])
+        tiles = (sx.size, sy.size, sz.size)
+
+        lower = np.empty((len(self._children),) + tiles)
+        upper = np.full(tiles, np.inf)
+        for n, child in enumerate(self._children):
+            bound = Interval.of(child.interval(ix, iy, iz))
+            lower[n] = bound.lo
+            np.fmin(upper, bound.hi, out=upper)
+        # NaN bounds compare False and keep the child
+        needed = ~(lower > upper)
+
+        out = np.empty(
+            (xs.size, ys.size, zs.size), dtype=np.result_type(xs, ys, zs, 1.0)
+        )
+        ends = [np.append(s[1:], n) for s, n in zip((sx, sy, sz), out.shape)]
+        for i, j, k in np.ndindex(*tiles):
+            a = slice(sx[i], ends[0][i])
+            b = slice(sy[j], ends[1][j])
+            c = slice(sz[k], ends[2][k])
+            tile = out[a, b, c]
+            tile[...] = np.inf
+            for index in np.flatnonzero(needed[:, i, j, k]):
+                np.minimum(
+                    tile,
+                    self._children[index].evaluate(
+                        xs[a, None, None], ys[None, b, None], zs[None, None, c]
+                    ),
+                    out=tile,
+                )
+        return out
+
+    def interval(self, x: Interval, y: Interval, z: Interval) -> Interval:
+        result = self._children[0].interval(x, y, z)
+        for child in self._children[1:]:
+            result = iminimum(result, child.interval(x, y, z))
+        return result
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        return hull_bounds(*(c.bounds for c in self._children))
+
+    def _compute_symmetry(self) -> Symmetry:
+        return _all_symmetric(self._children)
+
+    def _to_sympy(self) -> sp.Expr:
+        from .union import union
+
+        expr = self._children[0].to_sympy()
+        for child in self._children[1:]:
+            expr = union(expr, child.to_sympy())
+        return expr
+
+
+class Intersection(SDFNode):
+    """N-ary intersection ``max(d_1, ..., d_n)`` (see `warpdrive.sdf.intersection`)."""
+
+    __slots__ = ("_children",)
+
+    _children: Tuple[SDFNode, ...]
+
+    def __new__(  # type: ignore[misc]  # a single child is returned as is
+        cls, *children: object
+    ) -> SDFNode:
+        flat = _flatten(cls, children)
+        if len(flat) == 1:
+            return flat[0]
+        return cls._intern(flat, _children=flat)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return Intersection, self._children
+
+    @property
+    def children(self) -> Tuple[SDFNode, ...]:
+        return self._children
+
+    @property
+    def peak_buffers(self) -> int:
+        return 1 + max(c.peak_buffers for c in self._children)
+
+    def evaluate(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        result = self._children[0].evaluate(x, y, z)
+        for child in self._children[1:]:
+            result = np.maximum(result, child.evaluate(x, y, z))
+        return result
+
+    def interval(self, x: Interval, y: Interval, z: Interval) -> Interval:
+        result = self._children[0].interval(x, y, z)
+        for child in self._children[1:]:
+            result = imaximum(result, child.interval(x, y, z))
+        return result
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        return intersect_bounds(*(c.bounds for c in self._children))
+
+    def _compute_symmetry(self) -> Symmetry:
+        return _all_symmetric(self._children)
+
+    def _to_sympy(self) -> sp.Expr:
+        from .intersection import intersection
+
+        expr = self._children[0].to_sympy()
+        for child in self._children[1:]:
+            expr = intersection(expr, child.to_sympy())
+        return expr
+
+
+class Subtraction(SDFNode):
+    """``A \\ B`` as ``max(d_A, -d_B)`` (see `warpdrive.sdf.subtraction`)."""
+
+    __slots__ = ("a", "b")
+
+    a: SDFNode
+    b: SDFNode
+
+    def __new__(cls, a: object, b: object) -> Subtraction:
+        a, b = as_node(a), as_node(b)
+        return cls._intern((a, b), a=a, b=b)
+
+    @property
+    def children(self) -> Tuple[SDFNode, ...]:
+        return (self.a, self.b)
+
+    def evaluate(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        result: np.ndarray = np.maximum(
+            self.a.evaluate(x, y, z), -self.b.evaluate(x, y, z)
+        )
+        return result
+
+    def interval(self, x: Interval, y: Interval, z: Interval) -> Interval:
+        return imaximum(self.a.interval(x, y, z), -self.b.interval(x, y, z))
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        return self.a.bounds
+
+    def _compute_symmetry(self) -> Symmetry:
+        return _all_symmetric((self.a, self.b))
+
+    def _to_sympy(self) -> sp.Expr:
+        from .subtraction import subtraction
+
+        return subtraction(self.a.to_sympy(), self.b.to_sympy())
+
+
+class Xor(SDFNode):
+    """Symmetric difference (see `warpdrive.sdf.xor`)."""
+
+    __slots__ = ("a", "b")
+
+    a: SDFNode
+    b: SDFNode
+
+    def __new__(cls, a: object, b: object) -> Xor:
+        a, b = as_node(a), as_node(b)
+        return cls._intern((a, b), a=a, b=b)
+
+    @property
+    def children(self) -> Tuple[SDFNode, ...]:
+        return (self.a, self.b)
+
+    def evaluate(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        da, db = self.a.evaluate(x, y, z), self.b.evaluate(x, y, z)
+        result: np.ndarray = np.maximum(np.minimum(da, db), -np.maximum(da, db))
+        return result
+
+    def interval(self, x: Interval, y: Interval, z: Interval) -> Interval:
+        da, db = self.a.interval(x, y, z), self.b.interval(x, y, z)
+        return imaximum(iminimum(da, db), -imaximum(da, db))
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        return hull_bounds(self.a.bounds, self.b.bounds)
+
+    def _compute_symmetry(self) -> Symmetry:
+        return _all_symmetric((self.a, self.b))
+
+    def _to_sympy(self) -> sp.Expr:
+        from .xor import xor
+
+        return xor(self.a.to_sympy(), self.b.to_sympy())
+
+
+# -- SymPy conversion -------------------------------------------------------------
+
+
+def _negated(expr: sp.Expr) -> sp.Expr:
+    # ``-B`` is ``Mul(-1, B)`` only for products and atoms: SymPy distributes
+    # the minus over a sum, so ``Max(A, -B)`` holds ``-B`` expanded, and
+    # negating that again gives back ``B``
+    coeff, rest = expr.as_coeff_Mul()
+    if coeff == -1:
+        return rest
+    return -expr
+
+
+def from_sympy(expr: object) -> SDFNode:
+    """Convert a SymPy SDF into nodes.
+
+    ``Min``/``Max`` whose operands are known solids (they carry bounds, see
+    `warpdrive.sdf.bounds`) become `Union`, `Intersection` or `Subtraction`
+    nodes; everything else is wrapped in an `Expression` leaf.
+    """
+
+    expr = sp.sympify(expr)
+    if isinstance(expr, sp.Min) and all(bounding_box(a) is not None for a in expr.args):
+        return Union(*(from_sympy(a) for a in expr.args))
+    if isinstance(expr, sp.Max) and len(expr.args) == 2:
+        for keep, cut in (expr.args, expr.args[::-1]):
+            removed = _negated(cut)
+            if bounding_box(keep) is not None and bounding_box(removed) is not None:
+                return Subtraction(from_sympy(keep), from_sympy(removed))
+    if isinstance(expr, sp.Max) and all(bounding_box(a) is not None for a in expr.args):
+        return Intersection(*(from_sympy(a) for a in expr.args))
+    return Expression(expr)
@@ -7,6 +7,9 @@ from __future__ import annotations
 
 import sympy as sp
 
+from .bounds import bounding_box, intersect_bounds, register_bounds
+from .node import SDFNode, as_node
+
 __all__ = ["intersection"]
 
 
@@ -18,4 +21,8 @@ def intersection(d1: sp.Expr, d2: sp.Expr) -> sp.Expr:
         d2: Second SDF expression.
     """
 
-    return sp.Max(d1, d2) 
\ No newline at end of file
+    if isinstance(d1, SDFNode) or isinstance(d2, SDFNode):
+        return as_node(d1) & as_node(d2)
+    return register_bounds(
+        sp.Max(d1, d2), intersect_bounds(bounding_box(d1), bounding_box(d2))
+    )
@@ -2,37 +2,212 @@ from __future__ import annotations
 
 """Marching-cubes helper for SymPy-defined signed-distance fields."""
 
-from typing import Tuple
-from warpdrive.utils.package_management import require_package
+from typing import List, Optional, Sequence, Tuple
 
 import numpy as np
 import sympy as sp
 
-from .symbols import x, y, z
+from warpdrive.utils.instrumentation import span
+from warpdrive.utils.package_management import require_package
+
+from .bounds import bounding_box, hull_bounds, padded_bbox, sampling_bbox
+from .field_cache import expression_hash, get_field_cache
+from .sampling import (
+    DEFAULT_BLOCK,
+    DEFAULT_MAX_CHUNK_BYTES,
+    Resolution,
+    _kernel,
+    _map,
+    _resolve_workers,
+    grid_axes,
+    grid_shape,
+    narrow_band_blocks,
+    sample_fields,
+    sample_grid,
+)
 
-__all__ = ["sdf_to_mesh"]
+__all__ = ["sdf_to_mesh", "sdf_to_meshes"]
 
 
 def sdf_to_mesh(
     expr: sp.Expr,
-    bbox: Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]],
-    resolution: int,
+    bbox: Optional[
+        Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]]
+    ] = None,
+    resolution: Resolution = 50,
     *,
     isolevel: float = 0.0,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    workers: Optional[int] = 1,
+    adaptive: bool = False,
+    block: int = DEFAULT_BLOCK,
+    cache: bool = True,
+    out=None,
+    dtype=None,
 ):
-    """Sample *expr* on a regular grid, run marching-cubes and return verts/faces."""
+    """Sample *expr* on a regular grid, run marching-cubes and return verts/faces.
+
+    If *bbox* is omitted, the tight bounds carried by the expression (see
+    `warpdrive.sdf.bounds.bounding_box`) padded by two cells are used.
+
+    Sampling is chunked (see `warpdrive.sdf.sampling.sample_grid`) so that
+    kernel temporaries never exceed *max_chunk_bytes*; *workers* threads
+    evaluate the chunks in parallel.
+
+    With ``adaptive=True`` the dense grid is never materialised: an octree
+    of interval bounds (`warpdrive.sdf.sampling.narrow_band_blocks`) keeps
+    only blocks of at most *block* cells per axis that may contain the
+    surface, and each is sampled and meshed on its own.  Memory then scales
+    with the surface area rather than the volume, which makes resolutions
+    in the thousands practical.  Vertices on shared block faces are emitted
+    once per block.
+
+    Dense fields are looked up in (and added to) the on-disk field cache if
+    one is configured (see `warpdrive.sdf.field_cache`) unless *cache* is
+    false.
+
+    *out* (an ``np.memmap`` or the path of a ``.npy`` file to create) makes
+    the dense field live on disk instead of in RAM; it bypasses the field
+    cache.  Memory-mapped fields, including cache hits, are meshed in slabs
+    along the first axis that fit *max_chunk_bytes*, so the whole grid is
+    never loaded at once.
+
+    *dtype* (e.g. ``np.float32``) is the precision of the sampled field,
+    see `warpdrive.sdf.sampling.sample_grid`; it defaults to that of *out*,
+    else float64.
+    """
 
     measure = require_package("skimage").measure
-    func = sp.lambdify((x, y, z), expr, modules="numpy")
+    shape = grid_shape(resolution)
+    if bbox is None:
+        bbox = sampling_bbox(expr, shape)
 
     (xmin, xmax), (ymin, ymax), (zmin, zmax) = bbox
-    xs = np.linspace(xmin, xmax, resolution)
-    ys = np.linspace(ymin, ymax, resolution)
-    zs = np.linspace(zmin, zmax, resolution)
-    X, Y, Z = np.meshgrid(xs, ys, zs, indexing="ij")
-    values = func(X, Y, Z)
+    spacing = (
+        (xmax - xmin) / (shape[0] - 1),
+        (ymax - ymin) / (shape[1] - 1),
+        (zmax - zmin) / (shape[2] - 1),
+    )
+
+    if adaptive:
+        return _mesh_narrow_band(
+            expr, bbox, shape, spacing, isolevel, block, workers, measure, dtype
+        )
+
+    def sample():
+        return {
+            "values": sample_grid(
+                expr,
+                bbox,
+                shape,
+                out=out,
+                max_chunk_bytes=max_chunk_bytes,
+                workers=workers,
+                dtype=dtype,
+            )
+        }
+
+    field_cache = get_field_cache() if cache and out is None else None
+    if field_cache is None:
+        values = sample()["values"]
+    else:
+        key = field_cache.key(
+            "sdf", expression_hash(expr), bbox, shape, dtype or np.float64
+        )
+        values = field_cache.get_or_compute(key, sample)["values"]
+
+    if isinstance(values, np.memmap):
+        return _mesh_slabs(
+            values, (xmin, ymin, zmin), spacing, isolevel, max_chunk_bytes, measure
+        )
+    return _mesh_field(measure, values, (xmin, ymin, zmin), spacing, isolevel)
+
+
+def sdf_to_meshes(
+    exprs: Sequence[sp.Expr],
+    bbox: Optional[
+        Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]]
+    ] = None,
+    resolution: Resolution = 50,
+    *,
+    isolevel: float = 0.0,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    workers: Optional[int] = None,
+    cache: bool = True,
+    dtype=None,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Mesh several expressions sampled on one shared grid.
+
+    Equivalent to ``[sdf_to_mesh(e, bbox, resolution, ...) for e in exprs]``
+    but the grid coordinates are built once and every chunk evaluates all
+    expressions in the same pass (`warpdrive.sdf.sampling.sample_fields`).
+    Fields already in the field cache are not sampled again, and the
+    marching cubes of the different expressions run on *workers* threads
+    (all cores by default).
+
+    If *bbox* is omitted, the hull of the expressions' bounds padded by two
+    cells is used.
+    """
+
+    measure = require_package("skimage").measure
+    exprs = list(exprs)
+    shape = grid_shape(resolution)
+    if bbox is None:
+        hull = hull_bounds(*(bounding_box(e, derive=True) for e in exprs))
+        if hull is None:
+            raise ValueError(
+                "No bounds are known for some expressions; pass an explicit `bbox`."
+            )
+        bbox = padded_bbox(hull, shape)
+    dtype = dtype or np.float64
+
+    (xmin, xmax), (ymin, ymax), (zmin, zmax) = bbox
+    spacing = (
+        (xmax - xmin) / (shape[0] - 1),
+        (ymax - ymin) / (shape[1] - 1),
+        (zmax - zmin) / (shape[2] - 1),
+    )
+
+    field_cache = get_field_cache() if cache else None
+    keys = [None] * len(exprs)
+    fields: list = [None] * len(exprs)
+    if field_cache is not None:
+        for n, expr in enumerate(exprs):
+            keys[n] = field_cache.key("sdf", expression_hash(expr), bbox, shape, dtype)
+            hit = field_cache.load(keys[n])
+            if hit is not None:
+                fields[n] = hit["values"]
 
-    vmin, vmax = float(values.min()), float(values.max())
+    missing = [n for n, values in enumerate(fields) if values is None]
+    if missing:
+        sampled = sample_fields(
+            [exprs[n] for n in missing],
+            bbox,
+            shape,
+            max_chunk_bytes=max_chunk_bytes,
+            workers=workers,
+            dtype=dtype,
+        )
+        for n, values in zip(missing, sampled):
+            fields[n] = values
+            if field_cache is not None:
+                field_cache.store(keys[n], {"values": values})
+
+    def mesh(values):
+        if isinstance(values, np.memmap):
+            return _mesh_slabs(
+                values, (xmin, ymin, zmin), spacing, isolevel, max_chunk_bytes, measure
+            )
+        return _mesh_field(measure, values, (xmin, ymin, zmin), spacing, isolevel)
+
+    return _map(mesh, fields, _resolve_workers(workers))
+
+
+def _mesh_field(measure, values, origin, spacing, isolevel):
+    """March an in-memory field after checking that *isolevel* is crossed."""
+
+    with span("isolevel_scan", points=values.size):
+        vmin, vmax = float(values.min()), float(values.max())
     if not (vmin <= isolevel <= vmax):
         raise ValueError(
             "Iso-level not within sampled value range. "
@@ -40,11 +215,89 @@ def sdf_to_mesh(
             f"Range=({vmin:.3g},{vmax:.3g}), isolevel={isolevel}"
         )
 
-    spacing = (
-        (xmax - xmin) / (resolution - 1),
-        (ymax - ymin) / (resolution - 1),
-        (zmax - zmin) / (resolution - 1),
-    )
-    verts, faces, *_ = measure.marching_cubes(values, level=isolevel, spacing=spacing)
-    verts += np.array([xmin, ymin, zmin])
-    return verts, faces 
\ No newline at end of file
+    verts, faces = _march(measure, values, isolevel, spacing)
+    verts += np.array(origin)
+    return verts, faces
+
+
+def _mesh_narrow_band(
+    expr, bbox, shape, spacing, isolevel, block, workers, measure, dtype
+):
+    """Mesh every near-surface octree leaf separately and concatenate."""
+
+    kernel = _kernel(expr)
+    xs, ys, zs = grid_axes(bbox, shape, dtype or np.float64)
+    near, _, _ = narrow_band_blocks(expr, bbox, shape, isolevel=isolevel, block=block)
+
+    def mesh_block(b: np.ndarray):
+        i0, i1, j0, j1, k0, k1 = b
+        values = kernel(
+            xs[i0 : i1 + 1, None, None],
+            ys[None, j0 : j1 + 1, None],
+            zs[None, None, k0 : k1 + 1],
+        )
+        vmin, vmax = values.min(), values.max()
+        if not (vmin <= isolevel <= vmax) or vmin == vmax:
+            return None
+        verts, faces = _march(measure, values, isolevel, spacing)
+        verts += np.array([xs[i0], ys[j0], zs[k0]])
+        return verts, faces
+
+    pieces = [
+        p for p in _map(mesh_block, near, _resolve_workers(workers)) if p is not None
+    ]
+    if not pieces:
+        raise ValueError(
+            "Iso-level not crossed anywhere in `bbox`. "
+            "Try enlarging `bbox` or increasing `resolution`."
+        )
+    return _concatenate(pieces)
+
+
+def _mesh_slabs(values, origin, spacing, isolevel, max_chunk_bytes, measure):
+    """March an out-of-core field slab by slab along the first axis.
+
+    Consecutive slabs share one plane so no cell is lost; vertices on the
+    shared planes are emitted by both slabs.
+    """
+
+    nx = values.shape[0]
+    plane_bytes = values[0].nbytes
+    # marching cubes keeps a few float64 copies of its input around
+    planes = max(2, min(nx, max_chunk_bytes // (4 * plane_bytes)))
+    pieces = []
+    vmin, vmax = np.inf, -np.inf
+    for i0 in range(0, nx - 1, planes - 1):
+        slab = np.asarray(values[i0 : i0 + planes])
+        smin, smax = float(slab.min()), float(slab.max())
+        vmin, vmax = min(vmin, smin), max(vmax, smax)
+        if not (smin <= isolevel <= smax) or smin == smax:
+            continue
+        verts, faces = _march(measure, slab, isolevel, spacing)
+        verts += np.array([origin[0] + i0 * spacing[0], origin[1], origin[2]])
+        pieces.append((verts, faces))
+    if not pieces:
+        raise ValueError(
+            "Iso-level not within sampled value range. "
+            "Try enlarging `bbox` or increasing `resolution`. "
+            f"Range=({vmin:.3g},{vmax:.3g}), isolevel={isolevel}"
+        )
+    return _concatenate(pieces)
+
+
+def _march(measure, values, isolevel, spacing):
+    """`skimage.measure.marching_cubes` of one block, as a ``marching_cubes`` span."""
+    with span("marching_cubes", points=values.size) as stage:
+        verts, faces, *_ = measure.marching_cubes(
+            values, level=isolevel, spacing=spacing
+        )
+        stage.set(faces=len(faces), bytes=verts.nbytes + faces.nbytes)
+    return verts, faces
+
+
+def _concatenate(pieces):
+    """Merge per-block ``(verts, faces)`` into one mesh."""
+    offsets = np.cumsum([0] + [len(v) for v, _ in pieces[:-1]])
+    verts = np.concatenate([v for v, _ in pieces])
+    faces = np.concatenate([f + off for (_, f), off in zip(pieces, offsets)])
+    return verts, faces
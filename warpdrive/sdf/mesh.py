@@ -0,0 +1,452 @@
+"""Post-processing and export of triangle meshes.
+
+`~warpdrive.sdf.marching_cubes.sdf_to_mesh` returns the raw ``(verts,
+faces)`` of `skimage.measure.marching_cubes`: out-of-core and adaptive
+meshing duplicate the vertices on block seams, and fine grids produce far
+more triangles than a preview or a CAD hand-off needs.  This module works on
+such meshes with whole-array NumPy operations:
+
+* `weld` merges vertices closer than a tolerance and drops the triangles
+  that degenerate;
+* `decimate` simplifies a mesh to a target face count by quadric-error edge
+  collapses (Garland & Heckbert), many independent collapses per round;
+* `write_stl` and `write_ply` stream binary files in bounded chunks, writing
+  the NumPy buffers directly where their layout already matches the file.
+
+>>> from warpdrive.sdf import sphere
+>>> from warpdrive.sdf.marching_cubes import sdf_to_mesh
+>>> verts, faces = weld(*sdf_to_mesh(sphere(1.0), resolution=40))
+>>> verts, faces = decimate(verts, faces, 500)
+>>> len(faces) <= 500
+True
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from ..utils.instrumentation import span
+
+__all__ = ["decimate", "weld", "write_ply", "write_stl"]
+
+PathOrFile = Union[str, "os.PathLike[str]", BinaryIO]
+
+# Faces per block written by the exporters: bounds the temporaries.
+DEFAULT_WRITE_CHUNK = 2**16
+
+# Default welding tolerance, relative to the bounding-box diagonal.
+_WELD_RTOL = 1e-6
+
+# Collapses whose quadric is this close to singular (relative determinant)
+# fall back to the best of the two endpoints and the midpoint.
+_MAX_QUADRIC_COND = 1e8
+
+_STL_RECORD = np.dtype(
+    [("normal", "<f4", (3,)), ("verts", "<f4", (3, 3)), ("attr", "<u2")]
+)
+_PLY_FACE = np.dtype([("count", "u1"), ("index", "<i4", (3,))])
+
+
+def _as_mesh(verts, faces) -> Tuple[np.ndarray, np.ndarray]:
+    verts = np.asarray(verts)
+    faces = np.asarray(faces)
+    if verts.ndim != 2 or verts.shape[1] != 3:
+        raise ValueError(f"Expected vertices of shape (N, 3), got {verts.shape}")
+    if faces.ndim != 2 or faces.shape[1] != 3:
+        raise ValueError(f"Expected triangles of shape (F, 3), got {faces.shape}")
+    return verts, faces
+
+
+def _nondegenerate(faces: np.ndarray) -> np.ndarray:
+    return (
+        (faces[:, 0] != faces[:, 1])
+        & (faces[:, 1] != faces[:, 2])
+        & (faces[:, 2] != faces[:, 0])
+    )
+
+
+def _compact(verts: np.ndarray, faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Drop the vertices no face refers to."""
+    used, faces = np.unique(faces, return_inverse=True)
+    return verts[used], faces.reshape(-1, 3).astype(np.int32, copy=False)
+
+
+def weld(verts, faces, tol: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge vertices that agree to within *tol* and drop degenerate faces.
+
+    Coordinates are snapped to a grid of spacing *tol* (default: ``1e-6``
+    times the bounding-box diagonal) and vertices in the same grid cell are
+    merged into the first of them.  Two points closer than *tol* may still
+    straddle a cell boundary; seam duplicates from meshing, which agree to
+    a few ulps, are merged reliably.
+
+    Returns
+    -------
+    verts, faces
+        The welded mesh; unused vertices are removed.
+    """
+
+    verts, faces = _as_mesh(verts, faces)
+    if len(verts) == 0:
+        return verts, faces.astype(np.int32)
+    lo = verts.min(axis=0)
+    if tol is None:
+        tol = _WELD_RTOL * float(np.linalg.norm(verts.max(axis=0) - lo))
+    if tol <= 0:
+        tol = np.finfo(np.float64).tiny
+
+    with span("weld", verts=len(verts), faces=len(faces)) as stage:
+        cells = np.floor((verts - lo) / tol).astype(np.int64)
+        dims = cells.max(axis=0) + 1
+        if np.prod(dims.astype(np.float64)) < 2**62:
+            keys = np.ravel_multi_index(cells.T, dims)
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        else:
+            _, first, inverse = np.unique(
+                cells, axis=0, return_index=True, return_inverse=True
+            )
+        faces = inverse.reshape(-1)[faces]
+        faces = faces[_nondegenerate(faces)]
+        verts, faces = _compact(verts[first], faces)
+        stage.set(welded_verts=len(verts))
+    return verts, faces
+
+
+def _face_planes(verts: np.ndarray, faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Unit plane ``(a, b, c, d)`` and area of every face."""
+    v0, v1, v2 = (verts[faces[:, k]] for k in range(3))
+    normal = np.cross(v1 - v0, v2 - v0)
+    length = np.linalg.norm(normal, axis=1)
+    normal /= np.where(length > 0, length, 1.0)[:, None]
+    d = -np.einsum("ij,ij->i", normal, v0)
+    return np.column_stack([normal, d]), 0.5 * length
+
+
+def _vertex_quadrics(
+    verts: np.ndarray, faces: np.ndarray, weighted: bool = True
+) -> np.ndarray:
+    """``(V, 4, 4)`` sum of the plane quadrics around each vertex.
+
+    Weighted by face area, the quadric ranks collapses by the volume they
+    sweep; unweighted, its value at a point is the sum of squared distances
+    to the planes, which bounds the distance to every one of them.
+    """
+    planes, area = _face_planes(verts, faces)
+    face_q = planes[:, :, None] * planes[:, None, :]
+    if weighted:
+        face_q *= area[:, None, None]
+    face_q = face_q.reshape(-1, 16)
+    index = faces.ravel()
+    weights = np.repeat(face_q, 3, axis=0)
+    q = np.stack(
+        [np.bincount(index, weights[:, k], minlength=len(verts)) for k in range(16)],
+        axis=1,
+    )
+    return q.reshape(-1, 4, 4)
+
+
+def _edges(
+    faces: np.ndarray, n_verts: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sorted unique edges ``(a, b)`` with ``a < b``, their keys and face counts."""
+    pairs = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1).astype(
+        np.int64
+    )
+    keys, counts = np.unique(pairs[:, 0] * n_verts + pairs[:, 1], return_counts=True)
+    return np.column_stack([keys // n_verts, keys % n_verts]), keys, counts
+
+
+def _quadric_cost(q: np.ndarray, p: np.ndarray) -> np.ndarray:
+    ph = np.column_stack([p, np.ones(len(p))])
+    return (np.matmul(ph[:, None, :], q)[:, 0, :] * ph).sum(axis=1)
+
+
+def _solve3(a: np.ndarray, rhs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Solve a batch of 3x3 systems by the adjugate; mask of well-posed ones."""
+    c0 = np.cross(a[:, 1], a[:, 2])
+    c1 = np.cross(a[:, 2], a[:, 0])
+    c2 = np.cross(a[:, 0], a[:, 1])
+    det = (a[:, 0] * c0).sum(axis=1)
+    scale = np.linalg.norm(a.reshape(-1, 9), axis=1) ** 3
+    ok = np.abs(det) * _MAX_QUADRIC_COND > scale
+    # rows of the inverse's transpose are c0, c1, c2 (a is symmetric)
+    inv = np.stack([c0, c1, c2], axis=1) / np.where(ok, det, 1.0)[:, None, None]
+    return np.matmul(inv, rhs[:, :, None])[:, :, 0], ok
+
+
+def _collapse_targets(
+    q: np.ndarray, va: np.ndarray, vb: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Optimal position of every collapse and its quadric error."""
+    mid = 0.5 * (va + vb)
+    candidates = [va, vb, mid]
+    costs = [_quadric_cost(q, c) for c in candidates]
+    best = np.argmin(np.stack(costs), axis=0)
+    p = np.choose(best[:, None], candidates)
+    cost = np.choose(best, costs)
+
+    solved, ok = _solve3(q[:, :3, :3], -q[:, :3, 3])
+    # keep the optimum only where it stays near the edge
+    ok &= np.linalg.norm(solved - mid, axis=1) <= np.linalg.norm(va - vb, axis=1)
+    idx = np.flatnonzero(ok)
+    if len(idx):
+        optimum = _quadric_cost(q[idx], solved[idx])
+        better = optimum < cost[idx]
+        p[idx[better]] = solved[idx[better]]
+        cost[idx[better]] = optimum[better]
+    return p, np.maximum(cost, 0.0)
+
+
+def _neighbour_counts(
+    edges: np.ndarray, keys: np.ndarray, n_verts: int, a: np.ndarray, b: np.ndarray
+) -> np.ndarray:
+    """Number of vertices adjacent to both *a* and *b*, per candidate edge."""
+    both = np.concatenate([edges, edges[:, ::-1]])
+    both = both[np.argsort(both[:, 0], kind="stable")]
+    start = np.searchsorted(both[:, 0], np.arange(n_verts + 1))
+    degree = start[a + 1] - start[a]
+    owner = np.repeat(np.arange(len(a)), degree)
+    offset = np.arange(degree.sum()) - np.repeat(np.cumsum(degree) - degree, degree)
+    c = both[start[a][owner] + offset, 1]
+    lo, hi = np.minimum(b[owner], c), np.maximum(b[owner], c)
+    probe = lo * n_verts + hi
+    pos = np.minimum(np.searchsorted(keys, probe), len(keys) - 1)
+    shared = (keys[pos] == probe) & (c != b[owner])
+    return np.bincount(owner[shared], minlength=len(a))
+
+
+def _face_independent(faces: np.ndarray, n_verts: int, a, b) -> np.ndarray:
+    """Mask of the collapses (in priority order) sharing no face with an
+    earlier one.
+
+    The link condition is checked on the mesh before the round; collapses
+    on a common face could together still pinch it into a non-manifold
+    edge.
+    """
+    label = np.full(n_verts, len(a))
+    label[a] = label[b] = np.arange(len(a))
+    labels = label[faces]
+    later = (labels > labels.min(axis=1, keepdims=True)) & (labels < len(a))
+    keep = np.ones(len(a), dtype=bool)
+    keep[labels[later]] = False
+    return keep
+
+
+def _flipped(
+    verts: np.ndarray, faces: np.ndarray, moved: np.ndarray, a, b, p
+) -> np.ndarray:
+    """Faces whose normal would turn over (or vanish) after the collapses."""
+    new = verts.copy()
+    new[a] = p
+    new[b] = p
+    touched = np.flatnonzero(moved[faces].any(axis=1))
+    tri = faces[touched]
+    merged = np.zeros(len(verts), dtype=np.int64)
+    merged[b] = a
+    merged[a] = a
+    # faces holding both ends of a collapsed edge disappear
+    ends = np.where(moved[tri], merged[tri], -1 - tri)
+    vanishing = (
+        (ends[:, 0] == ends[:, 1])
+        | (ends[:, 1] == ends[:, 2])
+        | (ends[:, 2] == ends[:, 0])
+    )
+    tri, touched = tri[~vanishing], touched[~vanishing]
+    old_n = np.cross(
+        verts[tri[:, 1]] - verts[tri[:, 0]], verts[tri[:, 2]] - verts[tri[:, 0]]
+    )
+    new_n = np.cross(new[tri[:, 1]] - new[tri[:, 0]], new[tri[:, 2]] - new[tri[:, 0]])
+    # faces that already had no area have no orientation to lose
+    bad = (np.einsum("ij,ij->i", old_n, new_n) <= 0.0) & (
+        np.einsum("ij,ij->i", old_n, old_n) > 0.0
+    )
+    return touched[bad]
+
+
+def decimate(
+    verts,
+    faces,
+    target_faces: Optional[int],
+    *,
+    max_error: Optional[float] = None,
+    max_rounds: int = 200,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simplify a welded mesh to at most *target_faces* triangles.
+
+    Every vertex carries the quadric of the planes of its original faces
+    (Garland & Heckbert, "Surface simplification using quadric error
+    metrics", 1997).  Each round computes the error of collapsing every edge
+    at its optimal point and applies a batch of the cheapest collapses that
+    share no vertex, so the whole round is vectorised.  Collapses that
+    would make the mesh non-manifold, turn over a face or move a boundary
+    vertex are skipped.  Stops early when no admissible collapse remains.
+
+    With *max_error*, a collapse is only made if its new vertex stays within
+    *max_error* of the plane of every original face merged into it, in the
+    units of *verts*; *target_faces* may then be ``None`` to simplify as far
+    as that allows, e.g. to merge the flat patches of a mesh with a tiny
+    *max_error*.
+
+    Run `weld` first on meshes with duplicated seam vertices: collapses do
+    not cross disconnected seams.
+    """
+
+    verts, faces = _as_mesh(verts, faces)
+    if target_faces is None:
+        if max_error is None:
+            raise ValueError("Give `target_faces`, `max_error` or both")
+        target_faces = 1
+    if target_faces < 1:
+        raise ValueError(f"`target_faces` must be positive, got {target_faces}")
+    verts = verts.astype(np.float64)
+    faces = faces.astype(np.int64)
+    with span("decimate", faces=len(faces), target_faces=target_faces) as stage:
+        q = _vertex_quadrics(verts, faces)
+        if max_error is not None:
+            qd = _vertex_quadrics(verts, faces, weighted=False)
+        rng = np.random.default_rng(0)
+        rounds = 0
+        while len(faces) > target_faces and rounds < max_rounds:
+            rounds += 1
+            n_verts = len(verts)
+            all_edges, keys, counts = _edges(faces, n_verts)
+            boundary = np.zeros(n_verts, dtype=bool)
+            boundary[all_edges[counts == 1].ravel()] = True
+            edges = all_edges[(counts == 2) & ~boundary[all_edges].any(axis=1)]
+            if not len(edges):
+                break
+            a, b = edges[:, 0], edges[:, 1]
+            p, cost = _collapse_targets(q[a] + q[b], verts[a], verts[b])
+            if max_error is not None:
+                admissible = _quadric_cost(qd[a] + qd[b], p) <= max_error**2
+                if not admissible.any():
+                    break
+                edges, p, cost = edges[admissible], p[admissible], cost[admissible]
+                a, b = edges[:, 0], edges[:, 1]
+
+            # among the cheaper half of the edges, keep those that win a
+            # random draw against every candidate at both of their ends:
+            # ranking by cost itself would leave only its sparse local minima
+            cheap = np.argpartition(cost, len(cost) // 2)[: len(cost) // 2 + 1]
+            rank = np.full(len(edges), len(edges), dtype=np.int64)
+            rank[cheap] = rng.permutation(len(cheap))
+            best = np.full(n_verts, len(edges), dtype=np.int64)
+            np.minimum.at(best, a[cheap], rank[cheap])
+            np.minimum.at(best, b[cheap], rank[cheap])
+            chosen = cheap[
+                (best[a[cheap]] == rank[cheap]) & (best[b[cheap]] == rank[cheap])
+            ]
+            chosen = chosen[
+                _neighbour_counts(all_edges, keys, n_verts, a[chosen], b[chosen]) == 2
+            ]
+            chosen = chosen[np.argsort(cost[chosen], kind="stable")][
+                : (len(faces) - target_faces + 1) // 2
+            ]
+            chosen = chosen[_face_independent(faces, n_verts, a[chosen], b[chosen])]
+
+            while len(chosen):
+                moved = np.zeros(n_verts, dtype=bool)
+                moved[a[chosen]] = moved[b[chosen]] = True
+                bad = _flipped(verts, faces, moved, a[chosen], b[chosen], p[chosen])
+                if not len(bad):
+                    break
+                veto = np.zeros(n_verts, dtype=bool)
+                veto[faces[bad].ravel()] = True
+                chosen = chosen[~(veto[a[chosen]] | veto[b[chosen]])]
+            if not len(chosen):
+                break
+
+            ca, cb = a[chosen], b[chosen]
+            verts[ca] = p[chosen]
+            q[ca] += q[cb]
+            if max_error is not None:
+                qd[ca] += qd[cb]
+            remap = np.arange(n_verts)
+            remap[cb] = ca
+            faces = remap[faces]
+            faces = faces[_nondegenerate(faces)]
+        verts, faces = _compact(verts, faces)
+        stage.set(rounds=rounds, decimated_faces=len(faces))
+    return verts, faces
+
+
+@contextmanager
+def _open_binary(target: PathOrFile) -> Iterator[BinaryIO]:
+    if hasattr(target, "write"):
+        yield target  # type: ignore[misc]
+    else:
+        with open(target, "wb") as fh:
+            yield fh
+
+
+def _write_array(fh: BinaryIO, array: np.ndarray) -> None:
+    """Write *array*'s buffer without copying it (it must be contiguous)."""
+    fh.write(memoryview(np.ascontiguousarray(array)).cast("B"))
+
+
+def write_stl(
+    target: PathOrFile, verts, faces, *, chunk: int = DEFAULT_WRITE_CHUNK
+) -> None:
+    """Write a binary STL file.
+
+    *target* is a path or a binary file object.  Triangles are converted to
+    STL records *chunk* faces at a time, so at most one chunk is copied.
+    """
+
+    verts, faces = _as_mesh(verts, faces)
+    with span("write_stl", faces=len(faces)), _open_binary(target) as fh:
+        fh.write(b"binary STL written by warpdrive".ljust(80, b" "))
+        fh.write(np.uint32(len(faces)).astype("<u4").tobytes())
+        record = np.zeros(min(chunk, len(faces)), dtype=_STL_RECORD)
+        for start in range(0, len(faces), chunk):
+            tri = verts[faces[start : start + chunk]]
+            block = record[: len(tri)]
+            block["verts"] = tri
+            normal = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+            length = np.linalg.norm(normal, axis=1, keepdims=True)
+            block["normal"] = normal / np.where(length > 0, length, 1.0)
+            _write_array(fh, block)
+
+
+def write_ply(
+    target: PathOrFile, verts, faces, *, chunk: int = DEFAULT_WRITE_CHUNK
+) -> None:
+    """Write a binary little-endian PLY file.
+
+    Vertices keep their precision (``float`` for float32, ``double``
+    otherwise) and are written straight from their buffer when it is
+    little-endian and contiguous; faces are packed *chunk* at a time.
+    """
+
+    verts, faces = _as_mesh(verts, faces)
+    if verts.dtype != np.float32:
+        verts = verts.astype(np.float64, copy=False)
+    vtype = "float" if verts.dtype == np.float32 else "double"
+    header = (
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        "comment written by warpdrive\n"
+        f"element vertex {len(verts)}\n"
+        f"property {vtype} x\nproperty {vtype} y\nproperty {vtype} z\n"
+        f"element face {len(faces)}\n"
+        "property list uchar int vertex_indices\n"
+        "end_header\n"
+    )
+    with (
+        span("write_ply", verts=len(verts), faces=len(faces)),
+        _open_binary(target) as fh,
+    ):
+        fh.write(header.encode("ascii"))
+        little = verts.dtype.newbyteorder("<")
+        for start in range(0, len(verts), chunk):
+            _write_array(fh, verts[start : start + chunk].astype(little, copy=False))
+        record = np.zeros(min(chunk, len(faces)), dtype=_PLY_FACE)
+        record["count"] = 3
+        for start in range(0, len(faces), chunk):
+            block = record[: min(chunk, len(faces) - start)]
+            block["index"] = faces[start : start + chunk]
+            _write_array(fh, block)
@@ -0,0 +1,192 @@
+"""Base class of the native SDF node graph.
+
+`SDFNode` is kept free of imports from the rest of `warpdrive.sdf` so that
+the sampling, interval and bounds helpers can recognise nodes without
+import cycles.  Concrete primitives, transforms and CSG operations live in
+`warpdrive.sdf.graph`.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Optional, Sequence, Tuple, Type, TypeVar, cast
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    import sympy as sp
+
+    from .interval import ArrayLike, Interval
+
+__all__ = ["SDFNode", "as_node"]
+
+
+Bbox = Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]]
+
+_interned: "weakref.WeakValueDictionary[Tuple[Any, ...], SDFNode]" = (
+    weakref.WeakValueDictionary()
+)
+_intern_lock = threading.Lock()
+_UNSET = object()
+
+_Node = TypeVar("_Node", bound="SDFNode")
+
+
+class SDFNode:
+    """Immutable, hash-consed node of an SDF graph.
+
+    Nodes are interned on ``(type, params)``, so structurally identical
+    sub-graphs are the same Python object and compare/hash by identity in
+    O(1).  Subclasses define ``__new__`` to normalise their parameters and
+    then call `_intern`.
+    """
+
+    __slots__ = ("_params", "_sympy", "_bounds", "_symmetry", "__weakref__")
+
+    _params: Tuple[Any, ...]
+    _sympy: Optional["sp.Expr"]
+    # `_UNSET` until computed
+    _bounds: object
+    _symmetry: object
+
+    @classmethod
+    def _intern(cls: Type[_Node], params: Tuple[Any, ...], **fields: Any) -> _Node:
+        key = (cls, params)
+        found = _interned.get(key)
+        if found is not None:
+            return cast(_Node, found)
+        node = object.__new__(cls)
+        node._params = params
+        node._sympy = None
+        node._bounds = _UNSET
+        node._symmetry = _UNSET
+        for name, value in fields.items():
+            object.__setattr__(node, name, value)
+        with _intern_lock:
+            return cast(_Node, _interned.setdefault(key, node))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), self._params
+
+    def __repr__(self) -> str:
+        args = ", ".join(repr(p) for p in self._params)
+        return f"{type(self).__name__}({args})"
+
+    # -- interface implemented by subclasses ------------------------------------
+
+    @property
+    def children(self) -> Tuple["SDFNode", ...]:
+        return ()
+
+    def evaluate(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """Evaluate at broadcastable coordinate arrays (result may broadcast)."""
+        raise NotImplementedError
+
+    def interval(self, x: "Interval", y: "Interval", z: "Interval") -> "Interval":
+        """Conservative enclosure over the box spanned by *x*, *y*, *z*."""
+        raise NotImplementedError
+
+    def _to_sympy(self) -> "sp.Expr":
+        raise NotImplementedError
+
+    def _compute_bounds(self) -> Optional[Bbox]:
+        return None
+
+    def _compute_symmetry(self) -> Tuple[bool, bool, bool]:
+        return (False, False, False)
+
+    # -- shared behaviour -------------------------------------------------------
+
+    @property
+    def bounds(self) -> Optional[Bbox]:
+        """Axis-aligned box enclosing ``{d <= 0}``, or ``None`` if unknown."""
+        if self._bounds is _UNSET:
+            self._bounds = self._compute_bounds()
+        return cast(Optional[Bbox], self._bounds)
+
+    @property
+    def symmetry(self) -> Tuple[bool, bool, bool]:
+        """Whether ``d`` is unchanged by ``x -> -x``, ``y -> -y``, ``z -> -z``."""
+        if self._symmetry is _UNSET:
+            self._symmetry = self._compute_symmetry()
+        return cast(Tuple[bool, bool, bool], self._symmetry)
+
+    @property
+    def peak_buffers(self) -> int:
+        """Rough number of full-size temporaries live during `evaluate`."""
+        return 3 + max((c.peak_buffers for c in self.children), default=0)
+
+    def to_sympy(self) -> "sp.Expr":
+        """Equivalent SymPy expression, built on first use and cached."""
+        if self._sympy is None:
+            self._sympy = self._to_sympy()
+        return self._sympy
+
+    def _sympy_(self) -> "sp.Expr":
+        # lets `sympy.sympify` (and thus `compile_sdf`) accept nodes
+        return self.to_sympy()
+
+    def __call__(
+        self,
+        x: "ArrayLike",
+        y: "ArrayLike",
+        z: "ArrayLike",
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Evaluate like `CompiledSDF`: full broadcast shape, optional *out*."""
+        dtype = np.result_type(np.asarray(x), np.asarray(y), np.asarray(z), 1.0)
+        xa, ya, za = (
+            np.asarray(x).astype(dtype, copy=False),
+            np.asarray(y).astype(dtype, copy=False),
+            np.asarray(z).astype(dtype, copy=False),
+        )
+        value = self.evaluate(xa, ya, za)
+        shape = np.broadcast_shapes(xa.shape, ya.shape, za.shape)
+        if out is not None:
+            out[...] = value
+            return out
+        if np.shape(value) != shape:
+            value = np.broadcast_to(value, shape).astype(dtype)
+        return value
+
+    # -- construction sugar -----------------------------------------------------
+
+    def __or__(self, other: object) -> "SDFNode":
+        from .graph import Union
+
+        return Union(self, as_node(other))
+
+    def __and__(self, other: object) -> "SDFNode":
+        from .graph import Intersection
+
+        return Intersection(self, as_node(other))
+
+    def __sub__(self, other: object) -> "SDFNode":
+        from .graph import Subtraction
+
+        return Subtraction(self, as_node(other))
+
+    def __xor__(self, other: object) -> "SDFNode":
+        from .graph import Xor
+
+        return Xor(self, as_node(other))
+
+    def translate(self, offset: Sequence[float]) -> "SDFNode":
+        from .graph import Translate
+
+        return Translate(self, offset)
+
+    def rotate(self, angles: Sequence[float]) -> "SDFNode":
+        from .graph import Rotate
+
+        return Rotate(self, angles)
+
+
+def as_node(expr: object) -> SDFNode:
+    """Return *expr* as a node, converting SymPy expressions on demand."""
+    if isinstance(expr, SDFNode):
+        return expr
+    from .graph import from_sympy
+
+    return from_sympy(expr)
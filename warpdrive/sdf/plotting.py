@@ -9,28 +9,43 @@ Usage example
 from __future__ import annotations
 
 # ruff: noqa: F401
-from typing import Tuple, Sequence, Union
+from typing import Optional, Sequence, Tuple, Union
 
 import numpy as np
 import sympy as sp
 
-from .symbols import x, y, z
-from .marching_cubes import sdf_to_mesh
+from ..utils.instrumentation import span
 from ..utils.package_management import require_package
+from .bounds import bounding_box, hull_bounds, padded_bbox
+from .marching_cubes import sdf_to_meshes
+from .mesh import decimate, weld
 
 __all__ = ["plot_sdf"]
 
+_FALLBACK_BBOX = ((-1.0, 1.0), (-1.0, 1.0), (-1.0, 1.0))
+
 
 ColorType = Union[str, Tuple[float, float, float], Tuple[float, float, float, float]]
 
 
+def _default_bbox(exprs: Sequence[sp.Expr], resolution: int):
+    """Padded hull of the bounds of *exprs*, or the unit cube if unknown."""
+    hull = hull_bounds(*(bounding_box(e, derive=True) for e in exprs))
+    if hull is None:
+        return _FALLBACK_BBOX
+    return padded_bbox(hull, resolution)
+
+
 def plot_sdf(
     expr: Union[sp.Expr, Sequence[sp.Expr]],
     *,
-    bbox: Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]] = ((-1, 1), (-1, 1), (-1, 1)),
+    bbox: Optional[
+        Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]]
+    ] = None,
     resolution: int = 50,
     isolevel: float = 0.0,
     color: Union[ColorType, Sequence[ColorType]] = "cyan",
+    max_faces: Optional[int] = None,
 ):
     """Render one or many SDFs.
 
@@ -38,10 +53,23 @@ def plot_sdf(
     ----------
     expr : Expr or list[Expr]
         One expression or a list to visualise multiple solids.
+    bbox : tuple, optional
+        Sampling domain.  Defaults to the padded hull of the expressions'
+        bounds, or ``((-1, 1),) * 3`` when some bounds are unknown.
     color : str or RGB/RGBA tuple or list
         Color specification(s). If *expr* is a list, *color* can be a list of
         equal length; otherwise a single value is used for all.
+    max_faces : int, optional
+        Welds and decimates (`warpdrive.sdf.mesh.decimate`) the meshes to
+        at most this many triangles in total, shared out in proportion to
+        their sizes.  Decimating costs more than drawing the triangles
+        once, so it only pays off for figures that are redrawn often;
+        ``None`` (the default) draws every triangle.
     Other parameters are forwarded to the sampler.
+
+    All expressions are sampled in one pass over a shared grid and meshed
+    concurrently (`warpdrive.sdf.marching_cubes.sdf_to_meshes`); their
+    triangles are drawn as a single collection.
     """
 
     # normalise to list
@@ -56,17 +84,41 @@ def plot_sdf(
     else:
         colors = [color] * len(exprs)  # type: ignore[list-item]
 
+    if bbox is None:
+        bbox = _default_bbox(exprs, resolution)
+
     require_package("matplotlib")
     import matplotlib.pyplot as plt  # noqa: WPS433
+    from matplotlib.colors import to_rgba_array  # noqa: WPS433
     from mpl_toolkits.mplot3d.art3d import Poly3DCollection  # noqa: WPS433
 
     fig = plt.figure(figsize=(6, 6))
     ax = fig.add_subplot(111, projection="3d")
 
-    for expr_i, col in zip(exprs, colors):
-        verts, faces = sdf_to_mesh(expr_i, bbox, resolution, isolevel=isolevel)
-        mesh = Poly3DCollection(verts[faces], alpha=0.7, facecolor=col)
-        ax.add_collection3d(mesh)
+    with span("sdf_to_mesh", meshes=len(exprs)):
+        meshes = sdf_to_meshes(exprs, bbox, resolution, isolevel=isolevel)
+    if max_faces is not None:
+        total = sum(len(faces) for _, faces in meshes)
+        if total > max_faces:
+            meshes = [
+                decimate(*weld(v, f), max(1, max_faces * len(f) // total))
+                for v, f in meshes
+            ]
+
+    counts = [len(faces) for _, faces in meshes]
+    # the only per-corner copy, filled mesh by mesh
+    dtype = np.result_type(*{verts.dtype for verts, _ in meshes})
+    triangles = np.empty((sum(counts), 3, 3), dtype=dtype)
+    start = 0
+    for (verts, faces), count in zip(meshes, counts):
+        block = triangles[start : start + count]
+        np.take(verts.astype(dtype, copy=False), faces, axis=0, out=block)
+        start += count
+    with span("poly3d_collection", faces=len(triangles)):
+        facecolors = np.repeat(to_rgba_array(colors), counts, axis=0)
+        ax.add_collection3d(
+            Poly3DCollection(triangles, alpha=0.7, facecolors=facecolors)
+        )
 
     (xmin, xmax), (ymin, ymax), (zmin, zmax) = bbox
     ax.set_xlim(xmin, xmax)
@@ -74,4 +126,5 @@ def plot_sdf(
     ax.set_zlim(zmin, zmax)
     ax.set_box_aspect([xmax - xmin, ymax - ymin, zmax - zmin])
     plt.tight_layout()
-    plt.show() 
\ No newline at end of file
+    with span("show"):
+        plt.show()
@@ -14,6 +14,8 @@ import math
 
 import sympy as sp
 
+from .bounds import bounding_box, register_bounds, transform_bounds
+from .node import SDFNode
 from .symbols import x, y, z
 
 __all__ = ["rotate"]
@@ -22,6 +24,20 @@ __all__ = ["rotate"]
 Matrix = sp.Matrix  # alias for brevity
 
 
+# Entries this close to 0 or +-1 are snapped to exact integers, so rotations
+# by multiples of pi/2 become signed permutations instead of carrying
+# ``6e-17 * x`` terms into every downstream expression.
+_SNAP_TOL = 1e-12
+
+
+def _snap(value: float):
+    if abs(value) < _SNAP_TOL:
+        return 0
+    if abs(abs(value) - 1.0) < _SNAP_TOL:
+        return 1 if value > 0 else -1
+    return value
+
+
 def _rotation_matrix(rx: float, ry: float, rz: float) -> Matrix:
     cx, sx = math.cos(rx), math.sin(rx)
     cy, sy = math.cos(ry), math.sin(ry)
@@ -31,7 +47,7 @@ def _rotation_matrix(rx: float, ry: float, rz: float) -> Matrix:
     Ry = Matrix([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
     Rz = Matrix([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
     # Apply Rx first, then Ry, then Rz: R = Rz * Ry * Rx
-    return Rz * Ry * Rx
+    return (Rz * Ry * Rx).applyfunc(lambda v: _snap(float(v)))
 
 
 def rotate(expr: sp.Expr, angles: tuple[float, float, float]):
@@ -46,6 +62,8 @@ def rotate(expr: sp.Expr, angles: tuple[float, float, float]):
         sympy.Expr: Rotated distance expression.
     """
 
+    if isinstance(expr, SDFNode):
+        return expr.rotate(angles)
     rx, ry, rz = angles
     R = _rotation_matrix(rx, ry, rz)
 
@@ -54,4 +72,5 @@ def rotate(expr: sp.Expr, angles: tuple[float, float, float]):
     px, py, pz = Rt * Matrix([x, y, z])  # type: ignore[misc]
 
     subs_map = {x: px, y: py, z: pz}
-    return expr.xreplace(subs_map) 
\ No newline at end of file
+    bbox = transform_bounds(bounding_box(expr), matrix=R.tolist())
+    return register_bounds(expr.xreplace(subs_map), bbox)
@@ -15,6 +15,7 @@ from __future__ import annotations
 
 import sympy as sp
 
+from .bounds import register_bounds
 from .symbols import x, y, z
 
 __all__ = ["round_box"]
@@ -40,4 +41,4 @@ def round_box(half_extents: tuple[float, float, float], radius: float):
 
     outside = sp.sqrt(sp.Max(qx, 0) ** 2 + sp.Max(qy, 0) ** 2 + sp.Max(qz, 0) ** 2)
     inside = sp.Min(sp.Max(qx, sp.Max(qy, qz)), 0)
-    return outside + inside - r 
\ No newline at end of file
+    return register_bounds(outside + inside - r, ((-hx, hx), (-hy, hy), (-hz, hz)))
@@ -0,0 +1,586 @@
+"""Bounded-memory sampling of signed-distance fields on regular grids.
+
+Rather than materialising three ``np.meshgrid`` coordinate arrays, the
+sampler feeds the compiled kernel open-grid coordinate vectors of shape
+``(n, 1, 1)``, ``(1, m, 1)`` and ``(1, 1, k)``.  NumPy broadcasting then keeps
+every single-axis term one-dimensional, and only the kernel's full-size
+temporaries scale with the chunk.  The grid is walked in slabs along the
+first (slowest-varying, hence contiguous) axis, splitting slabs into tiles
+along the second axis when a single slab exceeds the memory budget.  Every
+chunk is written straight into one preallocated output array.
+
+With ``workers > 1`` the chunks are evaluated in a thread pool.  NumPy
+ufuncs release the GIL on large arrays, threads share the output array, so
+no data is pickled or copied back, and every point goes through exactly the
+same kernel operations as in the serial path, making the result
+bit-identical.
+
+*out* may also be a file path: the grid is then written slab by slab into a
+``.npy`` file opened as a memory map, so grids larger than RAM can be
+sampled and consumed incrementally (see `sdf_to_mesh`).
+
+With ``narrow_band=True`` the grid is first partitioned by an octree of
+interval bounds (`narrow_band_blocks`): blocks that provably do not contain
+the iso-surface are filled with a constant of the right sign and only
+blocks near the surface are evaluated point by point.
+
+With ``symmetry=True``, SDFs that are mirror-symmetric about coordinate
+planes the grid is centred on (`warpdrive.sdf.symmetry`) are only evaluated
+on the upper half along each such axis, up to an eighth of the grid; the
+rest is copied from flipped views.
+
+Usage example
+-------------
+>>> from warpdrive.sdf import sphere
+>>> values = sample_grid(sphere(1.0), ((-1, 1),) * 3, 33, max_chunk_bytes=2**20)
+>>> values.shape
+(33, 33, 33)
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import sympy as sp
+
+from ..utils.instrumentation import span
+from .compiler import CompiledSDF, compile_sdf
+from .graph import INDEXED_UNION_MIN_CHILDREN
+from .graph import Union as UnionNode
+from .graph import from_sympy
+from .interval import interval_bounds
+from .node import SDFNode
+from .symmetry import mirror_axes
+
+__all__ = [
+    "DEFAULT_BLOCK",
+    "DEFAULT_MAX_CHUNK_BYTES",
+    "grid_axes",
+    "grid_shape",
+    "narrow_band_blocks",
+    "sample_fields",
+    "sample_gradient",
+    "sample_grid",
+    "validate_precision",
+]
+
+
+Bbox = Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]]
+Resolution = Union[int, Sequence[int]]
+
+# Budget for the kernel temporaries of one chunk (the output is not counted).
+DEFAULT_MAX_CHUNK_BYTES = 128 * 1024**2
+
+# Leaf size (in cells per axis) of the narrow-band octree.
+DEFAULT_BLOCK = 16
+
+
+def grid_shape(resolution: Resolution) -> Tuple[int, int, int]:
+    """Normalise an int or 3-sequence resolution to a shape tuple."""
+    if isinstance(resolution, (int, np.integer)):
+        shape = (int(resolution),) * 3
+    else:
+        shape = tuple(int(n) for n in resolution)
+    if len(shape) != 3 or min(shape) < 2:
+        raise ValueError(
+            f"Resolution must give at least 2 samples per axis, got {resolution!r}"
+        )
+    return shape  # type: ignore[return-value]
+
+
+def grid_axes(
+    bbox: Bbox, resolution: Resolution, dtype=np.float64
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the sample coordinates ``xs, ys, zs`` along each axis.
+
+    Coordinates are computed in float64 and rounded once to *dtype*.
+    """
+    nx, ny, nz = grid_shape(resolution)
+    (xmin, xmax), (ymin, ymax), (zmin, zmax) = bbox
+    return (
+        np.linspace(xmin, xmax, nx).astype(dtype, copy=False),
+        np.linspace(ymin, ymax, ny).astype(dtype, copy=False),
+        np.linspace(zmin, zmax, nz).astype(dtype, copy=False),
+    )
+
+
+def _chunks(
+    shape: Tuple[int, int, int],
+    bytes_per_point: int,
+    max_chunk_bytes: int,
+    min_chunks: int = 1,
+) -> Iterator[Tuple[slice, slice]]:
+    """Yield ``(x-slice, y-slice)`` tiles whose temporaries fit the budget.
+
+    At least *min_chunks* slabs are produced when the first axis allows it,
+    so that a worker pool has something to balance.
+    """
+    nx, ny, nz = shape
+    points = max(1, max_chunk_bytes // max(1, bytes_per_point))
+    plane = ny * nz
+    if points >= plane:
+        step = max(1, min(nx, points // plane, -(-nx // min_chunks)))
+        for i in range(0, nx, step):
+            yield slice(i, min(i + step, nx)), slice(0, ny)
+    else:
+        rows = max(1, points // nz)
+        for i in range(nx):
+            for j in range(0, ny, rows):
+                yield slice(i, i + 1), slice(j, min(j + rows, ny))
+
+
+def sample_grid(
+    expr: sp.Expr,
+    bbox: Bbox,
+    resolution: Resolution,
+    *,
+    out: np.ndarray | str | os.PathLike | None = None,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    workers: Optional[int] = 1,
+    narrow_band: bool = False,
+    isolevel: float = 0.0,
+    block: int = DEFAULT_BLOCK,
+    dtype=None,
+    symmetry: bool = False,
+) -> np.ndarray:
+    """Evaluate *expr* on a regular grid spanning *bbox* (inclusive).
+
+    Parameters
+    ----------
+    expr
+        SDF expression ``d(x, y, z)``, or an `~warpdrive.sdf.node.SDFNode`
+        which is evaluated directly without going through SymPy.
+    bbox
+        ``((xmin, xmax), (ymin, ymax), (zmin, zmax))``.
+    resolution
+        Samples per axis, either one int or ``(nx, ny, nz)``.
+    out
+        Optional preallocated array (or ``np.memmap``) of shape
+        ``(nx, ny, nz)`` to fill, or the path of a ``.npy`` file to create
+        as a memory map.
+    max_chunk_bytes
+        Upper bound on the memory used by kernel temporaries at any time,
+        shared between all workers.
+    workers
+        Number of threads evaluating chunks concurrently.  ``None`` uses
+        ``os.cpu_count()``.
+    narrow_band
+        Only evaluate blocks that may contain the ``expr == isolevel``
+        surface; all other blocks are filled with the interval bound closest
+        to *isolevel*, which preserves the sign but not the distance.
+    isolevel, block
+        Iso-value and octree leaf size (cells per axis) for *narrow_band*.
+    dtype
+        Floating-point type of the coordinates, every kernel temporary and
+        the output.  Defaults to the dtype of an *out* array, else float64.
+        ``np.float32`` halves memory traffic; use `validate_precision` to
+        check it is accurate enough for a given geometry and grid.
+    symmetry
+        Along every axis where *expr* is mirror-symmetric and *bbox* is
+        centred on the mirror plane (`warpdrive.sdf.symmetry.mirror_axes`),
+        evaluate only the upper half of the grid and copy the lower half
+        from a flipped view of it.  Not used with *narrow_band*.  The grid
+        coordinates are only symmetric up to rounding, so copied values
+        can differ from direct evaluation by a few ulps of the largest
+        *bbox* coordinate (times the slope of *expr*, at most one for a
+        distance); without *symmetry* every sample is evaluated.
+
+    Returns
+    -------
+    numpy.ndarray
+        Values indexed ``[i, j, k]`` ↔ ``(xs[i], ys[j], zs[k])``.
+    """
+
+    shape = grid_shape(resolution)
+    if dtype is None:
+        dtype = out.dtype if isinstance(out, np.ndarray) else np.float64
+    with span("allocate") as stage:
+        out = open_output(out, shape, dtype)
+        stage.set(bytes=out.nbytes)
+    if out.dtype != dtype:
+        raise ValueError(f"`out` has dtype {out.dtype}, expected {np.dtype(dtype)}")
+
+    kernel = _kernel(expr)
+    xs, ys, zs = grid_axes(bbox, shape, dtype)
+    zv = zs[None, None, :]
+    bytes_per_point = out.itemsize * max(1, kernel.peak_buffers)
+    workers = _resolve_workers(workers)
+
+    if narrow_band:
+        with span("narrow_band"):
+            near, far, fill = narrow_band_blocks(
+                expr, bbox, shape, isolevel=isolevel, block=block
+            )
+            for (i0, i1, j0, j1, k0, k1), value in zip(far, fill):
+                out[i0 : i1 + 1, j0 : j1 + 1, k0 : k1 + 1] = value
+
+        def evaluate_block(b: np.ndarray) -> None:
+            i0, i1, j0, j1, k0, k1 = b
+            kernel(
+                xs[i0 : i1 + 1, None, None],
+                ys[None, j0 : j1 + 1, None],
+                zs[None, None, k0 : k1 + 1],
+                out=out[i0 : i1 + 1, j0 : j1 + 1, k0 : k1 + 1],
+            )
+
+        points = (
+            int(np.prod(near[:, 1::2] - near[:, ::2] + 1, axis=1).sum())
+            if len(near)
+            else 0
+        )
+        with span("evaluate", points=points, blocks=len(near)):
+            _map(evaluate_block, near, workers)
+        return _flushed(out)
+
+    # the fundamental region: upper half along every mirrored axis
+    mirrored = mirror_axes(expr, bbox, shape) if symmetry else ()
+    region = tuple(
+        slice(n // 2, None) if a in mirrored else slice(None)
+        for a, n in enumerate(shape)
+    )
+    target = out[region]
+    xs, ys, zv = xs[region[0]], ys[region[1]], zv[..., region[2]]
+
+    def evaluate(chunk: Tuple[slice, slice]) -> None:
+        sx, sy = chunk
+        kernel(xs[sx, None, None], ys[None, sy, None], zv, out=target[sx, sy])
+
+    if workers == 1:
+        chunks = _chunks(target.shape, bytes_per_point, max_chunk_bytes)
+    else:
+        # several slabs per worker keeps the pool balanced
+        chunks = _chunks(
+            target.shape,
+            bytes_per_point,
+            max_chunk_bytes // workers,
+            min_chunks=4 * workers,
+        )
+    with span("evaluate", points=target.size):
+        _map(evaluate, chunks, workers)
+    if mirrored:
+        with span("mirror", axes=len(mirrored), points=out.size - target.size):
+            _mirror_fill(out, region, mirrored)
+    return _flushed(out)
+
+
+def _mirror_fill(
+    out: np.ndarray, region: Tuple[slice, ...], axes: Tuple[int, ...]
+) -> None:
+    """Fill *out* outside *region* by reflecting it along *axes*, one at a time."""
+    done = list(region)
+    for a in axes:
+        n = out.shape[a]
+        h = n // 2
+        dst, src = list(done), list(done)
+        dst[a] = slice(0, h)
+        # sample i mirrors sample n - 1 - i
+        src[a] = slice(n - 1, n - 1 - h, -1)
+        out[tuple(dst)] = out[tuple(src)]
+        done[a] = slice(None)
+
+
+def open_output(out, shape: Tuple[int, ...], dtype) -> np.ndarray:
+    """Validate a caller-supplied *out*, or allocate it.
+
+    ``None`` allocates in memory; a path creates (or overwrites) a ``.npy``
+    file and returns it as a writable ``np.memmap``.
+    """
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if isinstance(out, (str, os.PathLike)):
+        return np.lib.format.open_memmap(
+            os.fspath(out), mode="w+", dtype=dtype, shape=shape
+        )
+    if out.shape != shape:
+        raise ValueError(f"`out` has shape {out.shape}, expected {shape}")
+    return out
+
+
+def _flushed(out: np.ndarray) -> np.ndarray:
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def sample_fields(
+    exprs: Sequence,
+    bbox: Bbox,
+    resolution: Resolution,
+    *,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    workers: Optional[int] = 1,
+    dtype=np.float64,
+) -> np.ndarray:
+    """Evaluate several expressions on one grid in a single pass.
+
+    The coordinates and the chunks of `sample_grid` are shared: each chunk
+    runs every kernel back to back while its coordinates are hot, instead
+    of walking the grid once per expression.
+
+    Returns
+    -------
+    numpy.ndarray
+        Shape ``(len(exprs), *shape)``; ``[n]`` equals
+        ``sample_grid(exprs[n], bbox, resolution)``.
+    """
+
+    shape = grid_shape(resolution)
+    kernels = [_kernel(expr) for expr in exprs]
+    with span("allocate") as stage:
+        out = np.empty((len(kernels),) + shape, dtype=dtype)
+        stage.set(bytes=out.nbytes)
+
+    xs, ys, zs = grid_axes(bbox, shape, dtype)
+    zv = zs[None, None, :]
+    bytes_per_point = out.itemsize * max((k.peak_buffers for k in kernels), default=1)
+    workers = _resolve_workers(workers)
+
+    def evaluate(chunk: Tuple[slice, slice]) -> None:
+        sx, sy = chunk
+        xv, yv = xs[sx, None, None], ys[None, sy, None]
+        for n, kernel in enumerate(kernels):
+            kernel(xv, yv, zv, out=out[n, sx, sy])
+
+    if workers == 1:
+        chunks = _chunks(shape, bytes_per_point, max_chunk_bytes)
+    else:
+        chunks = _chunks(
+            shape, bytes_per_point, max_chunk_bytes // workers, min_chunks=4 * workers
+        )
+    with span("evaluate", points=out.size):
+        _map(evaluate, chunks, workers)
+    return out
+
+
+def sample_gradient(
+    expr: sp.Expr,
+    bbox: Bbox,
+    resolution: Resolution,
+    *,
+    out: np.ndarray | str | os.PathLike | None = None,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    workers: Optional[int] = 1,
+    dtype=None,
+) -> np.ndarray:
+    """Evaluate *expr* and its gradient on the grid of `sample_grid`.
+
+    One pass of the kernel from ``compile_sdf(expr, gradient=True)`` per
+    chunk; the arguments are those of `sample_grid`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Shape ``(4, *shape)``: the value followed by ``dd/dx, dd/dy, dd/dz``.
+        Normalising the last three gives the surface normals.
+    """
+
+    shape = grid_shape(resolution)
+    if dtype is None:
+        dtype = out.dtype if isinstance(out, np.ndarray) else np.float64
+    with span("allocate") as stage:
+        out = open_output(out, (4,) + shape, dtype)
+        stage.set(bytes=out.nbytes)
+    if out.dtype != dtype:
+        raise ValueError(f"`out` has dtype {out.dtype}, expected {np.dtype(dtype)}")
+
+    kernel = compile_sdf(
+        expr.to_sympy() if isinstance(expr, SDFNode) else expr, gradient=True
+    )
+    xs, ys, zs = grid_axes(bbox, shape, dtype)
+    zv = zs[None, None, :]
+    bytes_per_point = out.itemsize * max(1, kernel.peak_buffers)
+    workers = _resolve_workers(workers)
+
+    def evaluate(chunk: Tuple[slice, slice]) -> None:
+        sx, sy = chunk
+        kernel(xs[sx, None, None], ys[None, sy, None], zv, out=out[:, sx, sy])
+
+    if workers == 1:
+        chunks = _chunks(shape, bytes_per_point, max_chunk_bytes)
+    else:
+        chunks = _chunks(
+            shape, bytes_per_point, max_chunk_bytes // workers, min_chunks=4 * workers
+        )
+    with span("evaluate", points=int(np.prod(shape))):
+        _map(evaluate, chunks, workers)
+    return _flushed(out)
+
+
+@dataclass(frozen=True)
+class PrecisionReport:
+    """Outcome of `validate_precision` over the near-surface points.
+
+    ``max_abs_error`` and ``max_rel_error`` (relative to the smallest grid
+    spacing) compare the reduced-precision field with float64 wherever
+    ``|d| <= band``; ``sign_flips`` counts points farther than *tolerance*
+    from the surface whose inside/outside classification changed.
+    """
+
+    dtype: np.dtype
+    n_points: int
+    max_abs_error: float
+    max_rel_error: float
+    sign_flips: int
+    tolerance: float
+
+    @property
+    def safe(self) -> bool:
+        return self.sign_flips == 0 and self.max_abs_error <= self.tolerance
+
+
+def validate_precision(
+    expr,
+    bbox: Bbox,
+    resolution: Resolution,
+    *,
+    dtype=np.float32,
+    band: Optional[float] = None,
+    tolerance: Optional[float] = None,
+    isolevel: float = 0.0,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+) -> PrecisionReport:
+    """Compare sampling in *dtype* against float64 near the surface.
+
+    Only points with ``|d - isolevel| <= band`` (default: two cell
+    diagonals) matter for meshing and voxelisation, so only they are
+    checked.  The result is `PrecisionReport.safe` if no point changes sign
+    and the error stays below *tolerance* (default: ``1e-3`` of the
+    smallest spacing, i.e. the surface moves by less than a thousandth of a
+    cell).
+    """
+
+    shape = grid_shape(resolution)
+    spacing = [(hi - lo) / (n - 1) for (lo, hi), n in zip(bbox, shape)]
+    band = 2.0 * float(np.linalg.norm(spacing)) if band is None else float(band)
+    tolerance = 1e-3 * min(spacing) if tolerance is None else float(tolerance)
+
+    reference = (
+        sample_grid(expr, bbox, shape, max_chunk_bytes=max_chunk_bytes) - isolevel
+    )
+    reduced = sample_grid(
+        expr, bbox, shape, max_chunk_bytes=max_chunk_bytes, dtype=dtype
+    )
+    near = np.abs(reference) <= band
+    reference = reference[near]
+    error = np.abs(reduced[near].astype(np.float64) - isolevel - reference)
+    # points on the surface (within tolerance) may land on either side
+    flipped = (reduced[near] - isolevel > 0) != (reference > 0)
+    flips = np.count_nonzero(flipped & (np.abs(reference) > tolerance))
+    max_error = float(error.max()) if error.size else 0.0
+    return PrecisionReport(
+        dtype=np.dtype(dtype),
+        n_points=int(near.sum()),
+        max_abs_error=max_error,
+        max_rel_error=max_error / min(spacing),
+        sign_flips=int(flips),
+        tolerance=tolerance,
+    )
+
+
+def _kernel(expr) -> Union[CompiledSDF, SDFNode]:
+    """Callable ``(x, y, z, out=None)`` evaluating *expr*.
+
+    Large SymPy unions of solids with known bounds are evaluated as an
+    indexed `~warpdrive.sdf.graph.Union` node rather than one flat kernel.
+    """
+    if isinstance(expr, SDFNode):
+        return expr
+    if isinstance(expr, sp.Min) and len(expr.args) >= INDEXED_UNION_MIN_CHILDREN:
+        node = from_sympy(expr)
+        if isinstance(node, UnionNode):
+            return node
+    return compile_sdf(expr)
+
+
+def _map(func, items, workers: int) -> list:
+    """Apply *func* to every item, in a thread pool if ``workers > 1``."""
+    if workers == 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items))
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    return int(workers)
+
+
+def _split(blocks: np.ndarray, block: int) -> np.ndarray:
+    """Halve every block along each axis spanning more than *block* cells."""
+    for axis in range(3):
+        start, stop = blocks[:, 2 * axis], blocks[:, 2 * axis + 1]
+        split = stop - start > block
+        mid = start + (stop - start) // 2
+        first = blocks.copy()
+        first[split, 2 * axis + 1] = mid[split]
+        second = blocks[split]
+        second[:, 2 * axis] = mid[split]
+        blocks = np.concatenate([first, second])
+    return blocks
+
+
+def narrow_band_blocks(
+    expr: sp.Expr,
+    bbox: Bbox,
+    resolution: Resolution,
+    *,
+    isolevel: float = 0.0,
+    block: int = DEFAULT_BLOCK,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Partition a sampling grid into near-surface and far-field blocks.
+
+    Starting from the whole grid, blocks are classified with
+    `warpdrive.sdf.interval.interval_bounds` one octree level at a time;
+    blocks that may contain the iso-surface are halved until they span at
+    most *block* cells per axis.
+
+    Returns
+    -------
+    near
+        ``(M, 6)`` int array of blocks ``(i0, i1, j0, j1, k0, k1)`` that may
+        contain the surface.  Bounds are inclusive *point* indices, so
+        neighbouring blocks share a face of samples.
+    far
+        ``(F, 6)`` blocks that provably lie on one side of the surface.
+    fill
+        ``(F,)`` values for *far*: the interval bound closest to *isolevel*.
+    """
+
+    if block < 1:
+        raise ValueError(f"block must be >= 1, got {block}")
+    shape = grid_shape(resolution)
+    xs, ys, zs = grid_axes(bbox, shape)
+    blocks = np.array(
+        [[0, shape[0] - 1, 0, shape[1] - 1, 0, shape[2] - 1]], dtype=np.int64
+    )
+
+    near, far, fill = [], [], []
+    while len(blocks):
+        lo, hi = interval_bounds(
+            expr,
+            (
+                (xs[blocks[:, 0]], xs[blocks[:, 1]]),
+                (ys[blocks[:, 2]], ys[blocks[:, 3]]),
+                (zs[blocks[:, 4]], zs[blocks[:, 5]]),
+            ),
+        )
+        outside = lo > isolevel
+        inside = hi < isolevel
+        decided = outside | inside
+        far.append(blocks[decided])
+        fill.append(np.where(outside, lo, hi)[decided])
+
+        undecided = blocks[~decided]
+        extent = undecided[:, 1::2] - undecided[:, 0::2]
+        leaf = (extent <= block).all(axis=1)
+        near.append(undecided[leaf])
+        blocks = _split(undecided[~leaf], block)
+
+    return np.concatenate(near), np.concatenate(far), np.concatenate(fill)
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import sympy as sp
 
+from .bounds import register_bounds
 from .symbols import x, y, z
 
 __all__ = ["sphere"]
 
+
 def sphere(
     radius: float,
     center: tuple[float, float, float] = (0.0, 0.0, 0.0),
@@ -23,4 +25,6 @@ def sphere(
     """
 
     cx, cy, cz = map(float, center)
-    return sp.sqrt((x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2) - float(radius)
\ No newline at end of file
+    r = float(radius)
+    expr = sp.sqrt((x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2) - r
+    return register_bounds(expr, ((cx - r, cx + r), (cy - r, cy + r), (cz - r, cz + r)))
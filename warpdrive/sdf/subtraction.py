@@ -1,4 +1,4 @@
-"""SDF set operation: subtraction (A \ B).
+r"""SDF set operation: subtraction (A \ B).
 
 Given two SDFs *d1* (A) and *d2* (B), subtraction is implemented as
     ``max(-d1, d2)`` according to IQ’s conventions.
@@ -8,15 +8,21 @@ from __future__ import annotations
 
 import sympy as sp
 
+from .bounds import bounding_box, register_bounds
+from .node import SDFNode, as_node
+
 __all__ = ["subtraction"]
 
 
 def subtraction(d1: sp.Expr, d2: sp.Expr) -> sp.Expr:
-    """Return the difference distance field *A \ B*.
+    r"""Return the difference distance field *A \ B*.
 
     Args:
         d1: SDF of the solid to keep (A).
         d2: SDF of the solid to subtract (B).
     """
 
-    return sp.Max(d1, -d2) 
\ No newline at end of file
+    if isinstance(d1, SDFNode) or isinstance(d2, SDFNode):
+        return as_node(d1) - as_node(d2)
+    # A \ B never extends beyond A
+    return register_bounds(sp.Max(d1, -d2), bounding_box(d1))
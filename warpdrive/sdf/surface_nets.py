@@ -0,0 +1,430 @@
+"""Surface nets and dual contouring: a NumPy-only alternative to marching cubes.
+
+Instead of up to four triangles per grid cell, surface nets place one
+vertex inside every cell the surface crosses and join the four cells around
+every crossed grid edge by a quad.  With ``quads=True`` these quads are
+returned as they are, half as many faces as marching cubes produces
+triangles; by default each is split into two triangles along its shorter
+diagonal, about as many faces as marching cubes but none of its slivers:
+on smooth surfaces no angle is much below 20 degrees.  With ``sharp=True``
+(the default) each vertex is placed by dual contouring: the SDF gradient
+at the edge crossings defines tangent planes and the vertex minimises the
+squared distance to them, which keeps the edges and corners of boxes,
+frames and cut-outs sharp.
+
+Fewer triangles than that take a simplification pass: with *max_error* the
+mesh is decimated (`warpdrive.sdf.mesh.decimate`) as far as no vertex moves
+more than that fraction of a cell off the planes of the faces it replaces.
+Flat patches then collapse to a few large triangles, but the decimation
+takes several times longer than the meshing.
+
+Everything is whole-array NumPy, so scikit-image is not needed.  It is not
+faster than scikit-image's compiled marching cubes: compare the
+``surface_net/`` and ``mesh/`` entries of ``python -m benchmarks``, where
+surface nets take about 1.5 times as long without *sharp* and 2 to 3 times
+as long with it.
+
+>>> from warpdrive.sdf import box
+>>> verts, faces = sdf_to_surface_net(box((0.5, 0.5, 0.5)), resolution=20)
+>>> bool(abs(verts).max() <= 0.5 + 1e-9)
+True
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import sympy as sp
+
+from ..utils.instrumentation import span
+from .bounds import sampling_bbox
+from .compiler import compile_sdf
+from .field_cache import expression_hash, get_field_cache
+from .mesh import decimate
+from .node import SDFNode
+from .sampling import (
+    DEFAULT_BLOCK,
+    DEFAULT_MAX_CHUNK_BYTES,
+    Resolution,
+    _kernel,
+    _map,
+    _resolve_workers,
+    grid_axes,
+    grid_shape,
+    narrow_band_blocks,
+    sample_grid,
+)
+
+__all__ = ["sdf_to_surface_net"]
+
+# Eigenvalues of a cell's normal matrix below this fraction of the largest
+# are dropped from the dual-contouring solve: flat patches then keep the
+# mass point along the surface and only real edges and corners pull the
+# vertex off it.
+_QEF_RTOL = 0.1
+
+# Offset, in cells along the crossed edge, of the two gradient samples that
+# give the normal at an edge crossing.
+_NORMAL_STEP = 1e-3
+
+# Window of the grid handled at once: global node index of its first sample
+# and, per axis, the ``[lo, hi)`` node range of the edges whose quads it emits.
+_Window = Tuple[np.ndarray, Tuple[int, int, int], Tuple[Tuple[int, int], ...]]
+
+
+def sdf_to_surface_net(
+    expr: sp.Expr,
+    bbox: Optional[
+        Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]]
+    ] = None,
+    resolution: Resolution = 50,
+    *,
+    isolevel: float = 0.0,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    workers: Optional[int] = 1,
+    adaptive: bool = False,
+    block: int = DEFAULT_BLOCK,
+    cache: bool = True,
+    out=None,
+    dtype=None,
+    sharp: bool = True,
+    quads: bool = False,
+    max_error: Optional[float] = None,
+):
+    """Sample *expr* on a regular grid and mesh it with surface nets.
+
+    Takes the arguments of `warpdrive.sdf.marching_cubes.sdf_to_mesh` and
+    returns ``(verts, faces)`` likewise; fields are shared with it through
+    the field cache.  Memory-mapped fields are meshed in slabs along the
+    first axis and ``adaptive=True`` meshes only the near-surface blocks,
+    as there.  Vertices are identified by their grid cell, so slabs and
+    blocks join without duplicated seam vertices.
+
+    With *sharp* (default), vertices are placed by dual contouring on the
+    gradient of *expr* at the edge crossings; otherwise at the mean of the
+    crossings.
+
+    With *quads*, faces are the ``(Q, 4)`` quads of the net, wound like
+    the triangles.  With *max_error*, in grid cells, the triangles are
+    decimated as far as the surface moves by less than that; see the module
+    docstring.
+    """
+
+    if quads and max_error is not None:
+        raise ValueError("`max_error` only applies to triangle meshes")
+
+    shape = grid_shape(resolution)
+    if bbox is None:
+        bbox = sampling_bbox(expr, shape)
+    (xmin, xmax), (ymin, ymax), (zmin, zmax) = bbox
+    origin = np.array([xmin, ymin, zmin])
+    spacing = np.array(
+        [
+            (xmax - xmin) / (shape[0] - 1),
+            (ymax - ymin) / (shape[1] - 1),
+            (zmax - zmin) / (shape[2] - 1),
+        ]
+    )
+
+    normals_at: Optional[Callable[[np.ndarray, int], np.ndarray]] = None
+    if sharp:
+        gradient = compile_sdf(
+            expr.to_sympy() if isinstance(expr, SDFNode) else expr, gradient=True
+        )
+
+        def _normals(points: np.ndarray, axis: int) -> np.ndarray:
+            # Primitives such as boxes have a kink exactly on the surface,
+            # where the forward-mode gradient is zero; the gradients just
+            # inside and just outside along the crossed edge are not.
+            step = np.zeros(3)
+            step[axis] = _NORMAL_STEP * spacing[axis]
+            grad = 0.0
+            for world in (
+                origin + points * spacing - step,
+                origin + points * spacing + step,
+            ):
+                grad = (
+                    grad
+                    + np.asarray(gradient(world[:, 0], world[:, 1], world[:, 2]))[1:].T
+                )
+            # chain rule: the gradient with respect to grid index coordinates
+            return grad * spacing
+
+        normals_at = _normals
+
+    workers = _resolve_workers(workers)
+    if adaptive:
+        windows = _block_windows(
+            expr, bbox, shape, isolevel, block, dtype or np.float64
+        )
+        pieces = _map(
+            lambda w: _window_net(*w(), isolevel, shape, normals_at), windows, workers
+        )
+        if not any(len(q) for _, _, q in pieces):
+            raise ValueError(
+                "Iso-level not crossed anywhere in `bbox`. "
+                "Try enlarging `bbox` or increasing `resolution`."
+            )
+        return _simplify(
+            *_assemble(pieces, origin, spacing, not quads), spacing, max_error
+        )
+
+    def sample():
+        return {
+            "values": sample_grid(
+                expr,
+                bbox,
+                shape,
+                out=out,
+                max_chunk_bytes=max_chunk_bytes,
+                workers=workers,
+                dtype=dtype,
+            )
+        }
+
+    field_cache = get_field_cache() if cache and out is None else None
+    if field_cache is None:
+        values = sample()["values"]
+    else:
+        key = field_cache.key(
+            "sdf", expression_hash(expr), bbox, shape, dtype or np.float64
+        )
+        values = field_cache.get_or_compute(key, sample)["values"]
+
+    if isinstance(values, np.memmap):
+        windows = _slab_windows(values, max_chunk_bytes)
+    else:
+        windows = [lambda: (values, (0, 0, 0), tuple((0, n) for n in shape))]
+    with span("isolevel_scan", points=values.size):
+        vmin, vmax = float(values.min()), float(values.max())
+    if not (vmin <= isolevel <= vmax):
+        raise ValueError(
+            "Iso-level not within sampled value range. "
+            "Try enlarging `bbox` or increasing `resolution`. "
+            f"Range=({vmin:.3g},{vmax:.3g}), isolevel={isolevel}"
+        )
+    pieces = _map(
+        lambda w: _window_net(*w(), isolevel, shape, normals_at), windows, workers
+    )
+    return _simplify(*_assemble(pieces, origin, spacing, not quads), spacing, max_error)
+
+
+def _slab_windows(
+    values: np.ndarray, max_chunk_bytes: int
+) -> List[Callable[[], _Window]]:
+    """Slabs along the first axis, each with a one-plane halo on both sides."""
+    nx = values.shape[0]
+    planes = max(1, min(nx, max_chunk_bytes // (8 * values[0].nbytes)))
+    rest = tuple((0, n) for n in values.shape[1:])
+
+    def window(s: int) -> Callable[[], _Window]:
+        e = min(s + planes, nx)
+        lo, hi = max(s - 1, 0), min(e + 1, nx)
+        return lambda: (np.asarray(values[lo:hi]), (lo, 0, 0), ((s, e),) + rest)
+
+    return [window(s) for s in range(0, nx, planes)]
+
+
+def _block_windows(
+    expr, bbox, shape, isolevel, block, dtype
+) -> List[Callable[[], _Window]]:
+    """Near-surface octree blocks, each sampled with a one-sample halo."""
+    kernel = _kernel(expr)
+    axes = grid_axes(bbox, shape, dtype)
+    near, _, _ = narrow_band_blocks(expr, bbox, shape, isolevel=isolevel, block=block)
+
+    def window(b: np.ndarray) -> Callable[[], _Window]:
+        owned = tuple((int(b[2 * a]), int(b[2 * a + 1])) for a in range(3))
+        lo = tuple(max(s - 1, 0) for s, _ in owned)
+        hi = tuple(min(e + 1, n) for (_, e), n in zip(owned, shape))
+        xs, ys, zs = (ax[l:h] for ax, l, h in zip(axes, lo, hi))
+        return lambda: (
+            kernel(xs[:, None, None], ys[None, :, None], zs[None, None, :]),
+            lo,
+            owned,
+        )
+
+    return [window(b) for b in near]
+
+
+def _window_net(values, offset, owned, isolevel, shape, normals_at):
+    """Cell vertices and quads of one window of the grid.
+
+    Returns the global ids of the cells crossed in the window, their vertex
+    positions in grid index coordinates and the ``(Q, 4)`` cell ids of the
+    quads around the edges the window owns.
+    """
+
+    values = np.asarray(values)
+    cells_shape = np.array(shape) - 1
+    offset = np.array(offset)
+    wshape = np.array(values.shape)
+    inside = values < isolevel
+
+    cell_ids, points, normals, owners, quads = [], [], [], [], []
+    n_points = 0
+    with span("surface_nets", points=values.size) as stage:
+        for a in range(3):
+            b, c = (a + 1) % 3, (a + 2) % 3
+            lower = [slice(None)] * 3
+            upper = [slice(None)] * 3
+            lower[a], upper[a] = slice(0, -1), slice(1, None)
+            idx = np.nonzero(inside[tuple(lower)] != inside[tuple(upper)])
+            if not len(idx[0]):
+                continue
+            v0 = values[idx].astype(np.float64)
+            shifted = list(idx)
+            shifted[a] = idx[a] + 1
+            v1 = values[tuple(shifted)].astype(np.float64)
+            p = np.stack(idx, axis=1)
+            point = (p + offset).astype(np.float64)
+            point[:, a] += (isolevel - v0) / (v1 - v0)
+            points.append(point)
+            if normals_at is not None:
+                normals.append(normals_at(point, a))
+
+            # the four cells around the edge, as (db, dc) steps down from p
+            corner = []
+            for db, dc in ((1, 1), (0, 1), (0, 0), (1, 0)):
+                cell = p.copy()
+                cell[:, b] -= db
+                cell[:, c] -= dc
+                valid = (
+                    (cell[:, b] >= 0)
+                    & (cell[:, b] < wshape[b] - 1)
+                    & (cell[:, c] >= 0)
+                    & (cell[:, c] < wshape[c] - 1)
+                )
+                ids = np.ravel_multi_index((cell + offset).T, cells_shape, mode="clip")
+                cell_ids.append(ids[valid])
+                owners.append(n_points + np.flatnonzero(valid))
+                corner.append(np.where(valid, ids, -1))
+
+            g = p + offset
+            own = np.all(
+                [(g[:, k] >= owned[k][0]) & (g[:, k] < owned[k][1]) for k in range(3)],
+                axis=0,
+            )
+            quad = np.stack(corner, axis=1)
+            own &= (quad >= 0).all(axis=1)
+            quad = quad[own]
+            # outward (towards larger values) normals point along +a when
+            # the lower end is inside
+            flip = ~inside[idx][own]
+            quad[flip] = quad[flip, ::-1]
+            quads.append(quad)
+            n_points += len(point)
+
+        if not points:
+            stage.set(cells=0, quads=0)
+            return (
+                np.empty(0, dtype=np.int64),
+                np.empty((0, 3)),
+                np.empty((0, 4), dtype=np.int64),
+            )
+
+        points = np.concatenate(points)
+        cell_ids = np.concatenate(cell_ids)
+        owners = np.concatenate(owners)
+        quads = np.concatenate(quads)
+        ids, inverse = np.unique(cell_ids, return_inverse=True)
+        count = np.bincount(inverse, minlength=len(ids))[:, None]
+        mass = np.stack(
+            [
+                np.bincount(inverse, points[owners, k], minlength=len(ids))
+                for k in range(3)
+            ],
+            axis=1,
+        )
+        mass /= count
+        if normals_at is None:
+            verts = mass
+        else:
+            verts = _dual_contour(
+                np.concatenate(normals), points, owners, inverse, mass, ids, cells_shape
+            )
+        stage.set(cells=len(ids), quads=len(quads))
+    return ids, verts, quads
+
+
+def _dual_contour(normals, points, owners, inverse, mass, ids, cells_shape):
+    """Minimise the squared distance to the tangent planes in every cell."""
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    n = np.divide(normals, length, out=np.zeros_like(normals), where=length > 0)[owners]
+    d = np.einsum("ij,ij->i", n, points[owners])
+    m = len(mass)
+    ata = np.stack(
+        [
+            np.bincount(inverse, n[:, i] * n[:, j], minlength=m)
+            for i in range(3)
+            for j in range(3)
+        ],
+        axis=1,
+    ).reshape(-1, 3, 3)
+    atb = np.stack(
+        [np.bincount(inverse, n[:, i] * d, minlength=m) for i in range(3)], axis=1
+    )
+
+    # solve about the mass point with the small eigenvalues truncated
+    residual = atb - np.matmul(ata, mass[:, :, None])[:, :, 0]
+    step = np.zeros_like(mass)
+    # most cells see a single plane: if the mean normal u already carries
+    # all but _QEF_RTOL of the trace, the other eigenvalues are truncated
+    # and only the projection on u is left, without an eigendecomposition
+    u = np.stack([np.bincount(inverse, n[:, k], minlength=m) for k in range(3)], axis=1)
+    u /= np.maximum(np.linalg.norm(u, axis=1, keepdims=True), 1e-300)
+    along = np.einsum("ij,ijk,ik->i", u, ata, u)
+    trace = np.einsum("ijj->i", ata)
+    flat = (trace - along < _QEF_RTOL * along) & (along > 0)
+    step[flat] = (
+        u[flat]
+        * (np.einsum("ij,ij->i", u[flat], residual[flat]) / along[flat])[:, None]
+    )
+
+    rest = ~flat
+    w, v = np.linalg.eigh(ata[rest])
+    keep = w > _QEF_RTOL * w[:, -1:]
+    inv_w = np.where(keep, 1.0 / np.where(keep, w, 1.0), 0.0)
+    step[rest] = np.matmul(
+        v, (inv_w * np.matmul(residual[rest][:, None, :], v)[:, 0, :])[:, :, None]
+    )[:, :, 0]
+
+    # keep every vertex inside its own cell
+    lo = np.stack(np.unravel_index(ids, cells_shape), axis=1).astype(np.float64)
+    return np.clip(mass + step, lo, lo + 1.0)
+
+
+def _assemble(pieces, origin: np.ndarray, spacing: np.ndarray, split: bool):
+    """Merge the windows, index the vertices by cell and, with *split*,
+    split the quads into triangles."""
+    ids = np.concatenate([i for i, _, _ in pieces])
+    verts = np.concatenate([v for _, v, _ in pieces])
+    quads = np.concatenate([q for _, _, q in pieces])
+    ids, first = np.unique(ids, return_index=True)
+    verts = origin + verts[first] * spacing
+    quads = np.searchsorted(ids, quads)
+    if not split:
+        return verts, quads.astype(np.int32)
+
+    q = verts[quads]
+    short = np.linalg.norm(q[:, 0] - q[:, 2], axis=1) <= np.linalg.norm(
+        q[:, 1] - q[:, 3], axis=1
+    )
+    faces = np.concatenate(
+        [
+            np.where(short[:, None], quads[:, [0, 1, 2]], quads[:, [1, 2, 3]]),
+            np.where(short[:, None], quads[:, [0, 2, 3]], quads[:, [1, 3, 0]]),
+        ]
+    )
+    return verts, faces.astype(np.int32)
+
+
+def _simplify(verts, faces, spacing: np.ndarray, max_error: Optional[float]):
+    """Decimate to *max_error* cells, if given."""
+    if max_error is None:
+        return verts, faces
+    verts, faces = decimate(
+        verts, faces, None, max_error=max_error * float(spacing.min())
+    )
+    return verts, faces.astype(np.int32)
@@ -0,0 +1,184 @@
+"""Mirror symmetry of SDFs about the coordinate planes.
+
+An SDF is mirror-symmetric in ``x`` when ``d(-x, y, z) == d(x, y, z)``.
+`box`, `round_box`, `box_frame` and `cylinder` are built on ``Abs`` of the
+coordinates, a sphere around the origin on their squares, and translations
+or rotations that leave a coordinate alone keep its mirror plane.
+`mirror_symmetry` finds such symmetries from the expression structure: one
+pass assigns every sub-expression a parity (even, odd or neither) in each
+coordinate, e.g. ``x`` is odd, ``Abs`` of anything odd or even is even and
+``x - 0.1`` is neither.  A union (or sum, ...) of operands that the
+reflection swaps in pairs, like a part and its mirror image, is even too.
+The test is sound but not complete; symmetries it cannot see can be
+recorded with `declare_symmetry`.  Graph nodes
+(`~warpdrive.sdf.node.SDFNode`) derive theirs from their parameters.
+
+`~warpdrive.sdf.sampling.sample_grid` uses this to evaluate only the part of
+a grid on the positive side of every usable mirror plane, up to 1/8 of it,
+and to fill the rest from flipped views of the evaluated part.
+
+>>> from warpdrive.sdf import box, sphere, translate
+>>> mirror_symmetry(box((1.0, 2.0, 3.0)))
+(True, True, True)
+>>> mirror_symmetry(translate(sphere(1.0), (0.5, 0.0, 0.0)))
+(False, True, True)
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import sympy as sp
+
+from .node import SDFNode
+from .symbols import x, y, z
+
+__all__ = ["declare_symmetry", "mirror_axes", "mirror_symmetry"]
+
+Symmetry = Tuple[bool, bool, bool]
+
+# Oldest entries are dropped beyond this size to keep long sweeps bounded.
+_MAX_ENTRIES = 1 << 16
+
+# A grid axis is mirrored only if its bounds cancel to this relative tolerance.
+_CENTRED_RTOL = 1e-12
+
+_registry: OrderedDict[object, Symmetry] = OrderedDict()
+_lock = threading.Lock()
+
+_EVEN, _ODD, _NEITHER = 1, -1, 0
+
+_ODD_FUNCTIONS = (
+    sp.sin,
+    sp.tan,
+    sp.sinh,
+    sp.tanh,
+    sp.asin,
+    sp.atan,
+    sp.asinh,
+    sp.atanh,
+    sp.sign,
+)
+_EVEN_FUNCTIONS = (sp.cos, sp.cosh, sp.Abs)
+# operations whose value does not depend on the order of their operands
+_SYMMETRIC_OPS = (sp.Add, sp.Mul, sp.Min, sp.Max)
+
+
+def _remember(expr, symmetry: Symmetry) -> None:
+    with _lock:
+        _registry[expr] = symmetry
+        _registry.move_to_end(expr)
+        while len(_registry) > _MAX_ENTRIES:
+            _registry.popitem(last=False)
+
+
+def declare_symmetry(expr, axes: Iterable[bool]):
+    """Record that *expr* is mirror-symmetric in the flagged axes; return *expr*.
+
+    Declared axes are combined with those `mirror_symmetry` detects.
+    """
+    declared = tuple(bool(a) for a in axes)
+    if len(declared) != 3:
+        raise ValueError(f"Expected one flag per axis, got {len(declared)}")
+    detected = _detect(expr)
+    combined = tuple(d or s for d, s in zip(declared, detected))
+    _remember(expr, combined)  # type: ignore[arg-type]
+    return expr
+
+
+def mirror_symmetry(expr) -> Symmetry:
+    """Whether *expr* is mirror-symmetric in ``x``, ``y`` and ``z``."""
+    with _lock:
+        symmetry = _registry.get(expr)
+        if symmetry is not None:
+            _registry.move_to_end(expr)
+            return symmetry
+    symmetry = _detect(expr)
+    _remember(expr, symmetry)
+    return symmetry
+
+
+def mirror_axes(expr, bbox, shape: Tuple[int, int, int]) -> Tuple[int, ...]:
+    """Grid axes along which sampling *expr* may reflect instead of evaluate.
+
+    An axis qualifies if *expr* is symmetric in it and *bbox* is centred on
+    its mirror plane, so that the samples pair up as ``i <-> n - 1 - i``.
+    """
+    axes = []
+    for axis, (symmetric, (lo, hi), n) in enumerate(
+        zip(mirror_symmetry(expr), bbox, shape)
+    ):
+        if symmetric and n > 1 and abs(lo + hi) <= _CENTRED_RTOL * abs(hi - lo):
+            axes.append(axis)
+    return tuple(axes)
+
+
+def _detect(expr) -> Symmetry:
+    if isinstance(expr, SDFNode):
+        return expr.symmetry
+    expr = sp.sympify(expr)
+    symmetry = tuple(_parity(expr, s) == _EVEN for s in (x, y, z))
+    return symmetry  # type: ignore[return-value]
+
+
+def _parity(expr: sp.Basic, symbol: sp.Symbol) -> int:
+    """Parity of *expr* under ``symbol -> -symbol``, bottom-up without recursion."""
+    parity: Dict[sp.Basic, int] = {}
+    stack = [expr]
+    while stack:
+        node = stack[-1]
+        if node in parity:
+            stack.pop()
+            continue
+        if not node.args:
+            # the coordinate itself; every other atom does not depend on it
+            parity[node] = _ODD if node == symbol else _EVEN
+            stack.pop()
+            continue
+        pending = [a for a in node.args if a not in parity]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        parity[node] = _combine(node, [parity[a] for a in node.args], symbol)
+    return parity[expr]
+
+
+def _combine(node: sp.Basic, args, symbol: sp.Symbol) -> int:
+    if _NEITHER in args:
+        if isinstance(node, _SYMMETRIC_OPS) and all(a != _ODD for a in args):
+            # e.g. the union of a part and its mirror image: the operands
+            # of no parity are swapped in pairs by the reflection
+            mixed = {_canonical(a) for a, p in zip(node.args, args) if p == _NEITHER}
+            if {_canonical(a.xreplace({symbol: -symbol})) for a in mixed} == mixed:
+                return _EVEN
+        return _NEITHER
+    if isinstance(node, sp.Add):
+        if all(a == _EVEN for a in args):
+            return _EVEN
+        return _ODD if all(a == _ODD for a in args) else _NEITHER
+    if isinstance(node, sp.Mul):
+        return int(np.prod(args))
+    if isinstance(node, sp.Pow):
+        exp = node.args[1]
+        if args == [_EVEN, _EVEN]:
+            return _EVEN
+        if args[0] == _ODD and exp.is_Integer:
+            return _EVEN if exp % 2 == 0 else _ODD
+        return _NEITHER
+    if isinstance(node, _EVEN_FUNCTIONS):
+        return _EVEN
+    if isinstance(node, _ODD_FUNCTIONS):
+        return args[0]
+    return _EVEN if all(a == _EVEN for a in args) else _NEITHER
+
+
+def _canonical(expr: sp.Basic) -> sp.Basic:
+    """Pull the sign out of even powers, so ``(-x - 1)**2`` matches ``(x + 1)**2``."""
+    return expr.replace(
+        lambda e: e.is_Pow and e.exp.is_even and e.base.could_extract_minus_sign(),
+        lambda e: sp.Pow(-e.base, e.exp),
+    )
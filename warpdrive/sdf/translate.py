@@ -1,4 +1,4 @@
-"""Utility to translate a signed-distance expression.
+r"""Utility to translate a signed-distance expression.
 
 For an original distance field *d(x, y, z)* and an offset *(ox, oy, oz)*,
 translation is performed by evaluating the original at shifted coordinates:
@@ -13,6 +13,8 @@ from __future__ import annotations
 
 import sympy as sp
 
+from .bounds import bounding_box, register_bounds, transform_bounds
+from .node import SDFNode
 from .symbols import x, y, z
 
 __all__ = ["translate"]
@@ -30,10 +32,15 @@ def translate(expr: sp.Expr, offset: tuple[float, float, float]):
         sympy.Expr: Translated distance expression.
     """
 
+    if isinstance(expr, SDFNode):
+        return expr.translate(offset)
     ox, oy, oz = offset
     subs_map = {
         x: x - float(ox),
         y: y - float(oy),
         z: z - float(oz),
     }
-    return expr.xreplace(subs_map) 
\ No newline at end of file
+    bbox = transform_bounds(
+        bounding_box(expr), offset=(float(ox), float(oy), float(oz))
+    )
+    return register_bounds(expr.xreplace(subs_map), bbox)
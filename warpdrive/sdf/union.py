@@ -9,6 +9,9 @@ from __future__ import annotations
 
 import sympy as sp
 
+from .bounds import bounding_box, hull_bounds, register_bounds
+from .node import SDFNode, as_node
+
 __all__ = ["union"]
 
 
@@ -20,4 +23,14 @@ def union(d1: sp.Expr, d2: sp.Expr) -> sp.Expr:  # noqa: D401
         d2: Second SDF expression.
     """
 
-    return sp.Min(d1, d2) 
\ No newline at end of file
+    if isinstance(d1, SDFNode) or isinstance(d2, SDFNode):
+        return as_node(d1) | as_node(d2)
+    # Flatten nested unions ourselves: SymPy's own Min simplification compares
+    # all operands pairwise, which makes building an n-part union cubic.
+    args = []
+    for d in (d1, d2):
+        args.extend(d.args if isinstance(d, sp.Min) else (sp.sympify(d),))
+    return register_bounds(
+        sp.Min(*args, evaluate=False),
+        hull_bounds(bounding_box(d1), bounding_box(d2)),
+    )
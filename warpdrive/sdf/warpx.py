@@ -0,0 +1,188 @@
+"""Export SDFs as WarpX (AMReX parser) expression strings.
+
+WarpX reads embedded-boundary implicit functions and spatially varying
+parameters as parser strings, re-evaluated per cell and step, so their cost
+scales with their length.  Printing an expression with ``str`` repeats every
+shared sub-term; here the expression is first lowered to the compiler's
+instruction list (`warpdrive.sdf.compiler`), which already folds constants
+and merges common subexpressions.  Every temporary used more than once
+becomes a parser local (``t3=...;``), everything else is inlined with the
+fewest parentheses the operator precedence allows.
+
+>>> from warpdrive.sdf import sphere
+>>> print(to_warpx(sphere(1.0, (0.5, 0.0, 0.0))))
+-1.0+sqrt(y^2+z^2+(-0.5+x)^2)
+>>> print(eb_implicit_function(sphere(1.0)))
+1.0-sqrt(x^2+y^2+z^2)
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import sympy as sp
+
+from .compiler import compile_sdf
+from .node import SDFNode
+
+__all__ = ["WarpXExpression", "eb_implicit_function", "to_warpx"]
+
+
+@dataclass(frozen=True)
+class WarpXExpression:
+    """Parser string with its size statistics.
+
+    ``n_ops`` counts the operators and function calls evaluated per point,
+    ``n_locals`` the hoisted local variables.
+    """
+
+    text: str
+    n_ops: int
+    n_locals: int
+
+    @property
+    def size(self) -> int:
+        return len(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+
+# precedence of the printed forms, higher binds tighter
+_SUM, _PRODUCT, _POWER, _ATOM = 1, 2, 3, 4
+
+_FUNCTIONS = {
+    "sqrt": "sqrt",
+    "absolute": "abs",
+    "minimum": "min",
+    "maximum": "max",
+    "sin": "sin",
+    "cos": "cos",
+    "tan": "tan",
+    "arcsin": "asin",
+    "arccos": "acos",
+    "arctan": "atan",
+    "arctan2": "atan2",
+    "sinh": "sinh",
+    "cosh": "cosh",
+    "tanh": "tanh",
+    "exp": "exp",
+    "log": "log",
+    "floor": "floor",
+    "ceil": "ceil",
+}
+
+
+def _number(value: float) -> Tuple[str, int]:
+    if not math.isfinite(value):
+        raise ValueError(f"WarpX parser strings cannot hold the constant {value}")
+    text = repr(value)
+    return text, _SUM if value < 0 else _ATOM
+
+
+def _wrap(form: Tuple[str, int], min_prec: int) -> str:
+    text, prec = form
+    return text if prec >= min_prec else f"({text})"
+
+
+class _Printer:
+    """Print one compiled kernel, hoisting temporaries used more than once."""
+
+    def __init__(self, expr, prefix: str):
+        if isinstance(expr, SDFNode):
+            expr = expr.to_sympy()
+        kernel = compile_sdf(sp.sympify(expr))
+        if kernel.has_fallbacks:
+            raise ValueError(
+                "Expression uses functions the WarpX parser does not support"
+            )
+        self.instructions = kernel.instructions
+        self.result = kernel.result
+        self.prefix = prefix
+        self.locals: List[str] = []
+        self.forms: Dict[str, Tuple[str, int]] = {c: (c, _ATOM) for c in "xyz"}
+
+        uses: Dict[str, int] = {}
+        for ins in self.instructions:
+            for a in ins.args:
+                if isinstance(a, str):
+                    uses[a] = uses.get(a, 0) + 1
+        for ins in self.instructions:
+            form = self._format(ins.op, [self._operand(a) for a in ins.args])
+            if uses.get(ins.target, 0) > 1 and ins.target != self.result:
+                name = f"{self.prefix}{ins.target[1:]}"
+                self.locals.append(f"{name}={form[0]};")
+                form = (name, _ATOM)
+            self.forms[ins.target] = form
+
+    @property
+    def n_ops(self) -> int:
+        return len(self.instructions)
+
+    def _operand(self, a) -> Tuple[str, int]:
+        return self.forms[a] if isinstance(a, str) else _number(a)
+
+    @staticmethod
+    def _format(op: str, args: List[Tuple[str, int]]) -> Tuple[str, int]:
+        if op in _FUNCTIONS:
+            return f"{_FUNCTIONS[op]}({','.join(a[0] for a in args)})", _ATOM
+        if op == "add":
+            return f"{_wrap(args[0], _SUM)}+{_wrap(args[1], _PRODUCT)}", _SUM
+        if op == "subtract":
+            return f"{_wrap(args[0], _SUM)}-{_wrap(args[1], _PRODUCT)}", _SUM
+        if op == "multiply":
+            return f"{_wrap(args[0], _PRODUCT)}*{_wrap(args[1], _POWER)}", _PRODUCT
+        if op == "divide":
+            return f"{_wrap(args[0], _PRODUCT)}/{_wrap(args[1], _POWER)}", _PRODUCT
+        if op == "negative":
+            return f"-{_wrap(args[0], _POWER)}", _SUM
+        if op == "square":
+            return f"{_wrap(args[0], _ATOM)}^2", _POWER
+        if op == "power":
+            return f"{_wrap(args[0], _ATOM)}^{_wrap(args[1], _ATOM)}", _POWER
+        raise ValueError(f"Operation {op!r} has no WarpX parser equivalent")
+
+    def value(self) -> Tuple[str, int]:
+        return self._operand(self.result)
+
+    def negated(self) -> Tuple[str, int]:
+        """``-value()``, folding the sign into a final sum where possible."""
+        last = self.instructions[-1] if self.instructions else None
+        if last is not None and last.target == self.result:
+            a, b = last.args if len(last.args) == 2 else (None, None)
+            if last.op == "subtract":
+                return self._format("subtract", [self._operand(b), self._operand(a)])
+            if last.op == "add" and isinstance(a, float):
+                return self._format("subtract", [_number(-a), self._operand(b)])
+            if last.op == "negative":
+                return self._operand(last.args[0])
+        return f"-{_wrap(self.value(), _POWER)}", _SUM
+
+
+def to_warpx(expr, *, negate: bool = False, prefix: str = "t") -> WarpXExpression:
+    """Return *expr* (SymPy expression or node) as a WarpX parser string.
+
+    Args:
+        expr: Function of ``x, y, z``.
+        negate: Export ``-expr`` instead.
+        prefix: Name prefix of the hoisted locals; use distinct prefixes
+            when concatenating several exports into one string.
+    """
+
+    printer = _Printer(expr, prefix)
+    text, _ = printer.negated() if negate else printer.value()
+    return WarpXExpression(
+        "".join(printer.locals) + text, printer.n_ops, len(printer.locals)
+    )
+
+
+def eb_implicit_function(expr) -> WarpXExpression:
+    """``warpx.eb_implicit_function`` of the solid ``{expr <= 0}``.
+
+    WarpX treats the region where the implicit function is positive as
+    covered by the embedded boundary, i.e. the negated SDF.
+    """
+
+    return to_warpx(expr, negate=True)
@@ -8,6 +8,9 @@ from __future__ import annotations
 
 import sympy as sp
 
+from .bounds import bounding_box, hull_bounds, register_bounds
+from .node import SDFNode, as_node
+
 __all__ = ["xor"]
 
 
@@ -19,4 +22,7 @@ def xor(d1: sp.Expr, d2: sp.Expr) -> sp.Expr:
         d2: Second SDF.
     """
 
-    return sp.Max(sp.Min(d1, d2), -sp.Max(d1, d2)) 
\ No newline at end of file
+    if isinstance(d1, SDFNode) or isinstance(d2, SDFNode):
+        return as_node(d1) ^ as_node(d2)
+    expr = sp.Max(sp.Min(d1, d2), -sp.Max(d1, d2))
+    return register_bounds(expr, hull_bounds(bounding_box(d1), bounding_box(d2)))
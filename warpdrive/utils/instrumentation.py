@@ -0,0 +1,226 @@
+"""Opt-in timing of the stages of the sampling and meshing pipeline.
+
+Library code wraps every expensive stage in `span`; with no collector
+active this costs a single flag check.  Wrap a call in `trace` to collect
+the spans it emits, or register a callback with `add_span_callback`::
+
+    >>> from warpdrive.sdf import sphere, sample_grid
+    >>> with trace() as t:
+    ...     _ = sample_grid(sphere(1.0), ((-1, 1),) * 3, 8)
+    >>> t.summary()["evaluate"]["points"]
+    512
+
+Every `Span` carries its wall time plus stage-specific counters such as
+``points`` (grid points evaluated) and ``bytes`` (size of the arrays it
+allocated).  With ``trace(memory=True)`` the net change of the memory
+traced by `tracemalloc` is recorded as ``allocated_bytes`` too.  A `Trace`
+exports to a plain dict or to the Chrome trace event format, viewable in
+``chrome://tracing`` or Perfetto.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+__all__ = [
+    "Span",
+    "Trace",
+    "add_span_callback",
+    "remove_span_callback",
+    "span",
+    "trace",
+]
+
+
+@dataclass
+class Span:
+    """One finished (or running) pipeline stage.
+
+    ``start`` is a `time.perf_counter` reading in seconds; ``parent`` is the
+    name of the enclosing span on the same thread, if any.
+    """
+
+    name: str
+    start: float
+    duration: float = 0.0
+    thread: int = 0
+    parent: Optional[str] = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attrs: Any) -> None:
+        """Attach counters, e.g. ``points=`` or ``bytes=``."""
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "start": self.start,
+            "duration": self.duration,
+            "thread": self.thread,
+            "parent": self.parent,
+            **self.attrs,
+        }
+
+
+class _NullSpan:
+    """Stand-in yielded by `span` while nothing is listening."""
+
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Trace:
+    """Spans collected by one `trace` block, in the order they finished."""
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def _add(self, s: Span) -> None:
+        with self._lock:
+            self.spans.append(s)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-name totals: ``count``, ``seconds`` and summed numeric counters."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for s in self.spans:
+            entry = totals.setdefault(s.name, {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += s.duration
+            for key, value in s.attrs.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    entry[key] = entry.get(key, 0) + value
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-data form: every span plus the per-name `summary`."""
+        return {"spans": [s.to_dict() for s in self.spans], "summary": self.summary()}
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome trace event format (complete ``"X"`` events, microseconds)."""
+        origin = min((s.start for s in self.spans), default=0.0)
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "ph": "X",
+                "ts": (s.start - origin) * 1e6,
+                "dur": s.duration * 1e6,
+                "pid": pid,
+                "tid": s.thread,
+                "args": s.attrs,
+            }
+            for s in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path: Union[str, os.PathLike]) -> None:
+        """Write `to_chrome_trace` as JSON to *path*."""
+        with open(path, "w") as fh:
+            json.dump(self.to_chrome_trace(), fh)
+
+
+_lock = threading.Lock()
+_traces: List[Trace] = []
+_callbacks: List[Callable[[Span], None]] = []
+_enabled = False
+_stack = threading.local()
+
+
+def _update_enabled() -> None:
+    global _enabled
+    _enabled = bool(_traces or _callbacks)
+
+
+def add_span_callback(callback: Callable[[Span], None]) -> None:
+    """Call *callback* with every span as it finishes, on the emitting thread."""
+    with _lock:
+        _callbacks.append(callback)
+        _update_enabled()
+
+
+def remove_span_callback(callback: Callable[[Span], None]) -> None:
+    """Unregister a callback added with `add_span_callback`."""
+    with _lock:
+        _callbacks.remove(callback)
+        _update_enabled()
+
+
+@contextmanager
+def trace(memory: bool = False) -> Iterator[Trace]:
+    """Collect the spans emitted (by any thread) inside the block.
+
+    Args:
+        memory: Also record ``allocated_bytes`` per span; starts
+            `tracemalloc` for the duration of the block if it is not
+            already running, which slows allocations down.
+    """
+
+    collector = Trace(memory)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    with _lock:
+        _traces.append(collector)
+        _update_enabled()
+    try:
+        yield collector
+    finally:
+        with _lock:
+            _traces.remove(collector)
+            _update_enabled()
+        if started:
+            tracemalloc.stop()
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Union[Span, _NullSpan]]:
+    """Time the enclosed stage under *name*.
+
+    The yielded object's ``set`` method attaches counters that are only
+    known inside the block.  Nothing is recorded unless a `trace` block or a
+    span callback is active.
+    """
+
+    if not _enabled:
+        yield _NULL_SPAN
+        return
+
+    stack = _stack.__dict__.setdefault("names", [])
+    s = Span(
+        name,
+        0.0,
+        thread=threading.get_ident(),
+        parent=stack[-1] if stack else None,
+        attrs=attrs,
+    )
+    memory = tracemalloc.is_tracing() and any(t.memory for t in _traces)
+    before = tracemalloc.get_traced_memory()[0] if memory else 0
+    stack.append(name)
+    s.start = time.perf_counter()
+    try:
+        yield s
+    finally:
+        s.duration = time.perf_counter() - s.start
+        stack.pop()
+        if memory:
+            s.attrs["allocated_bytes"] = tracemalloc.get_traced_memory()[0] - before
+        with _lock:
+            traces, callbacks = list(_traces), list(_callbacks)
+        for t in traces:
+            t._add(s)
+        for callback in callbacks:
+            callback(s)